@@ -0,0 +1,50 @@
+"""
+Microbenchmark do MessageDeduplicator.
+
+Enche a janela de dedup com mensagens unicas e mede o custo por mensagem em cada faixa,
+o custo tem que ficar plano conforme a janela enche (antes era O(n) por mensagem).
+
+Uso:
+    python benchmarks/bench_dedup.py [total] [faixa]
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from logger.message_deduplicator import MessageDeduplicator
+from logger.discord_record import DiscordRecord
+
+
+async def bench(total: int, step: int):
+    deduper = MessageDeduplicator(window_seconds=3600.0, max_entries=total)
+
+    print(f"=== DEDUP: {total} mensagens unicas, faixas de {step} ===")
+    print(f"{'janela':>10} | {'is_duplicate':>14} | {'filter_duplicates':>18}")
+
+    batch_deduper = MessageDeduplicator(window_seconds=3600.0, max_entries=total)
+
+    for start in range(0, total, step):
+        messages = [f"erro de conexao com banco {i}" for i in range(start, start + step)]
+
+        t0 = time.perf_counter()
+        for message in messages:
+            await deduper.is_duplicate(message, "ERROR")
+        single_ns = (time.perf_counter() - t0) / step * 1e9
+
+        items = [DiscordRecord(message, "ERROR", time.time()) for message in messages]
+        t0 = time.perf_counter()
+        await batch_deduper.filter_duplicates(items)
+        batch_ns = (time.perf_counter() - t0) / step * 1e9
+
+        print(f"{start + step:>10} | {single_ns:>11.0f} ns | {batch_ns:>15.0f} ns")
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    step = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+
+    # o is_duplicate imprime a cada duplicata, aqui todas sao unicas entao nao polui a saida
+    asyncio.run(bench(total, step))
@@ -0,0 +1,79 @@
+"""
+Benchmark dos sinks de arquivo: latencia do logger.debug na thread que loga.
+
+Compara o sink de arquivo do loguru como o _configure_loguru_only usa no modo classic (escrita
+sincrona, e com enqueue=True como no logs/error) com o BatchedFileSink (append num deque, a linha
+e montada e gravada em lote na thread de escrita), em texto e em JSON. Mede cada chamada com
+perf_counter_ns e o tempo total ate tudo estar no disco (logger.remove espera a escrita terminar).
+
+Uso:
+    python benchmarks/bench_file_sink.py [registros]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from loguru import logger
+
+from logger.file_sink import BatchedFileSink, raw_format
+
+FORMAT = "{time:YYYY-MM-DD HH:mm:ss} | {level} | {name}:{function}:{line} | {message}"
+MODES = ("antes", "enqueue", "depois", "depois json")
+
+
+def add_sink(mode: str, directory: str):
+    if mode == "antes":
+        logger.add(os.path.join(directory, "{time:YYYY-MM-DD}.log"), rotation="1 day", level="DEBUG", format=FORMAT)
+    elif mode == "enqueue":
+        logger.add(os.path.join(directory, "{time:YYYY-MM-DD}.log"), rotation="1 day", level="DEBUG", format=FORMAT, enqueue=True)
+    elif mode == "depois":
+        logger.add(BatchedFileSink(directory), level="DEBUG", format=raw_format, colorize=False)
+    else:
+        logger.add(BatchedFileSink(directory, json_lines=True), level="DEBUG", format=raw_format, colorize=False)
+
+
+def percentile(values, fraction: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run(mode: str, total: int):
+    directory = tempfile.mkdtemp(prefix="bench_file_sink_")
+    logger.remove()
+    add_sink(mode, directory)
+
+    # Aquecimento: abre o arquivo, compila o format
+    for i in range(100):
+        logger.debug("aquecimento {}", i)
+
+    latencies = []
+    record = latencies.append
+    clock = time.perf_counter_ns
+    start = time.perf_counter()
+    for i in range(total):
+        before = clock()
+        logger.debug("requisicao {} processada em {}ms status={}", i, i % 900, 200)
+        record(clock() - before)
+    logger.remove() # Espera a escrita terminar
+    elapsed = time.perf_counter() - start
+
+    size = sum(entry.stat().st_size for entry in os.scandir(directory))
+    shutil.rmtree(directory, ignore_errors=True)
+
+    latencies.sort()
+    mean = sum(latencies) / total / 1000
+    return mean, percentile(latencies, 0.5) / 1000, percentile(latencies, 0.99) / 1000, latencies[-1] / 1000, total / elapsed, size
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    print(f"=== SINK DE ARQUIVO: {total} logger.debug, latencia na thread que loga (us) ===")
+    print(f"{'modo':>12} | {'media':>7} | {'p50':>7} | {'p99':>7} | {'max':>9} | {'registros/s':>11} | {'arquivo':>9}")
+    for mode in MODES:
+        mean, p50, p99, worst, rate, size = run(mode, total)
+        print(f"{mode:>12} | {mean:>7.2f} | {p50:>7.2f} | {p99:>7.2f} | {worst:>9.1f} | {rate:>11.0f} | {size / 1024:>7.0f}KB")
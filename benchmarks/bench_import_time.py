@@ -0,0 +1,86 @@
+"""
+Custo de import do pacote, medido com python -X importtime num processo novo.
+
+Falha (exit 1) se o import carregar httpx/dotenv (so devem entrar no primeiro envio
+ou no load_env) ou se passar do budget.
+
+Uso:
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --budget-ms 50
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+from typing import Dict, Tuple
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+HEAVY_MODULES = ("httpx", "dotenv")
+
+STATEMENTS = {
+    "import logger": 20.0,
+    "from logger import LogConfig": 20.0,
+    "from logger import logger_manager": None, # loguru entra aqui de qualquer jeito, so confere os pesados
+}
+
+# import time: self [us] | cumulative | imported package
+LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure(statement: str) -> Tuple[float, Dict[str, int]]:
+    """
+    Retorna (ms cumulativos do pacote logger, {modulo de topo: us cumulativos}).
+    """
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT, env.get("PYTHONPATH")]))
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+
+    modules: Dict[str, int] = {}
+    for line in completed.stderr.splitlines():
+        match = LINE_RE.match(line)
+        if not match:
+            continue
+        cumulative, name = int(match.group(2)), match.group(4)
+        top = name.split(".")[0]
+        modules[top] = max(modules.get(top, 0), cumulative)
+
+    return modules.get("logger", 0) / 1000, modules
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Tempo de import do LogSentinel")
+    parser.add_argument("--budget-ms", type=float, help="Budget unico pra todos os imports (sobrescreve o padrao)")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for statement, budget in STATEMENTS.items():
+        if args.budget_ms is not None:
+            budget = args.budget_ms
+
+        total_ms, modules = measure(statement)
+        heavy = [name for name in HEAVY_MODULES if name in modules]
+
+        status = "✅"
+        if heavy or (budget is not None and total_ms > budget):
+            status = "❌"
+            failed = True
+
+        budget_text = f" (budget {budget:.0f}ms)" if budget is not None else ""
+        print(f"{status} {statement:<40} {total_ms:8.2f}ms{budget_text}")
+        if heavy:
+            print(f"   carregou no import: {', '.join(heavy)}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,88 @@
+"""
+Benchmark da redacao: custo por KB de texto conforme a quantidade de regras cresce.
+
+Compara um re.sub por regra (uma passada no texto pra cada regra, o jeito antigo de ir
+adicionando regras) com o Redactor (pre-filtro de literais + uma regex combinada).
+Roda em dois corpos: mensagens limpas (o caso comum) e mensagens com 1 segredo a cada 5.
+Acima das 9 regras padrao entram regras sinteticas (prefixo fixo + 8 caracteres).
+
+Uso:
+    python benchmarks/bench_redaction.py [mensagens]
+"""
+import os
+import random
+import re
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from logger.redactor import DEFAULT_RULES, RedactionRule, Redactor
+
+RULE_COUNTS = (1, 3, 9, 16, 32)
+
+CLEAN = [
+    "requisicao GET /api/v1/pedidos/{id} processada em {ms}ms status=200",
+    "worker {id} terminou o lote com {n} itens em {ms}ms",
+    "conexao com o banco reaberta depois de {ms}ms, pool com {n} conexoes",
+    "cache miss pra chave pedido:{id}, buscando no banco",
+]
+
+SECRETS = [
+    "login falhou pra password={id}abc e usuario {n}",
+    "chamada com Authorization: Bearer tok{id}.abc-def",
+    "cliente cliente{id}@example.com sem cadastro",
+    "pagamento recusado cartao 4111 1111 1111 1111 pedido {id}",
+    "webhook https://discord.com/api/webhooks/{id}/AbCdEf-{n} respondeu 404",
+]
+
+def make_rules(count: int):
+    rules = list(DEFAULT_RULES[:count])
+    for index in range(count - len(rules)):
+        rules.append(RedactionRule(f"extra{index}", rf"\bSK{index}X_[A-Z0-9]{{8}}\b", "<EXTRA>", (f"sk{index}x_",)))
+    return rules
+
+def make_corpus(total: int, dirty_every: int):
+    rng = random.Random(42)
+    lines = []
+    for i in range(total):
+        templates = SECRETS if dirty_every and i % dirty_every == 0 else CLEAN
+        lines.append(rng.choice(templates).format(id=rng.randint(1, 99999), n=rng.randint(1, 500), ms=rng.randint(1, 900)))
+    return lines
+
+def legacy(rules):
+    """Uma passada de re.sub por regra, sem pre-filtro."""
+    passes = []
+    for rule in rules:
+        flags = re.IGNORECASE if rule.ignore_case else 0
+        replacement = rule.replacement
+        if callable(replacement):
+            replacement = (lambda fn: lambda match: fn(match.group()))(replacement)
+        passes.append((rule.pattern, replacement, flags))
+
+    def redact(text):
+        for pattern, replacement, flags in passes:
+            text = re.sub(pattern, replacement, text, flags=flags)
+        return text
+    return redact
+
+def cost_per_kb(redact, lines) -> float:
+    size_kb = sum(len(line) for line in lines) / 1024
+    start = time.perf_counter()
+    for line in lines:
+        redact(line)
+    return (time.perf_counter() - start) * 1e6 / size_kb
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    corpora = {"limpas": make_corpus(total, 0), "1 em 5 sujas": make_corpus(total, 5)}
+
+    print(f"=== REDACAO: {total} mensagens, custo em us por KB ===")
+    print(f"{'regras':>7} | {'corpo':<13} | {'antes':>9} | {'depois':>9}")
+    for count in RULE_COUNTS:
+        rules = make_rules(count)
+        for label, lines in corpora.items():
+            before = cost_per_kb(legacy(rules), lines)
+            after = cost_per_kb(Redactor(rules).redact, lines)
+            print(f"{count:>7} | {label:<13} | {before:>9.1f} | {after:>9.1f}")
@@ -0,0 +1,141 @@
+"""
+Benchmark de ingestao: registros/s passando por logger.info com o discord_sink ligado.
+
+"antes" roda o codigo do commit baseline de verdade: o discord_sink do logs.py e o
+AsyncDiscordHandler de logs/DicordHandler.py (asyncio.create_task + print + dict com isoformat
+por registro, asyncio.Queue), extraidos do git num diretorio temporario. "depois" e o caminho
+atual (handler.enqueue_nowait sincrono com DiscordRecord), os dois sem o limite por linha de
+codigo, e "limitado" e o caminho atual com o limite ligado (a mesma linha logando sem parar,
+so o burst entra na fila e o resto e so contado).
+Nenhum webhook e configurado, entao nada sai pra rede.
+
+Uso:
+    python benchmarks/bench_sink_throughput.py [total]
+"""
+import ast
+import asyncio
+import contextlib
+import importlib
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from datetime import datetime
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+for var in ("ERROR_HOOK", "INFO_HOOK"):
+    os.environ.pop(var, None)
+
+from logger import logs
+from logger.logs import logger, LogConfig, AsyncDiscordHandler
+
+# Modulos do baseline, importados entre si pelo nome (from LogConfig import LogConfig)
+BASELINE_MODULES = ("LogConfig", "MessageDeduplicator", "IntelligentRateLimiter", "DicordHandler")
+
+
+def _git(*args: str) -> str:
+    return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+
+
+def load_baseline():
+    """
+    Extrai o handler e o discord_sink do primeiro commit do repo.
+    Retorna (AsyncDiscordHandler, LogConfig, namespace do sink) ou None fora de um checkout git.
+    """
+
+    try:
+        revision = _git("rev-list", "--max-parents=0", "HEAD").split()[0]
+        sources = {name: _git("show", f"{revision}:logs/{name}.py") for name in BASELINE_MODULES}
+        logs_source = _git("show", f"{revision}:logs.py")
+    except (OSError, subprocess.CalledProcessError, IndexError):
+        return None
+
+    directory = tempfile.mkdtemp(prefix="baseline_")
+    for name, source in sources.items():
+        with open(os.path.join(directory, f"{name}.py"), "w", encoding="utf-8") as f:
+            f.write(source)
+    sys.path.insert(0, directory)
+    handler_module = importlib.import_module("DicordHandler")
+    config_module = importlib.import_module("LogConfig")
+
+    # O logs.py do baseline nao importa (aponta pra logger.DiscordHandler), entao so o discord_sink e compilado,
+    # sem mudar nada, com o _handler global num namespace proprio
+    tree = ast.parse(logs_source)
+    sink = next(node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name == "discord_sink")
+    namespace = {"asyncio": asyncio, "os": os, "datetime": datetime, "_handler": None}
+    exec(compile(ast.Module([sink], type_ignores=[]), f"{revision}:logs.py", "exec"), namespace)
+
+    return handler_module.AsyncDiscordHandler, config_module.LogConfig, namespace
+
+
+async def run_baseline(baseline, total: int) -> float:
+    handler_class, config_class, namespace = baseline
+    config = config_class(error_webhook=None, info_webhook=None, max_queue_size=total, batch_interval=3600.0)
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        async with handler_class(config) as handler:
+            namespace["_handler"] = handler
+            logger.remove()
+            logger.add(namespace["discord_sink"], level="INFO", format="{message}")
+
+            queue = handler.queues["INFO"]
+            start = time.perf_counter()
+            for i in range(total):
+                logger.info("requisicao {} processada em {}ms", i, i % 500)
+
+            # O baseline so enfileira quando as tasks rodam, entao espera elas
+            while queue.qsize() < total:
+                await asyncio.sleep(0)
+            elapsed = time.perf_counter() - start
+
+            namespace["_handler"] = None
+            while not queue.empty(): # Esvazia antes do stop, senao ele tenta mandar tudo
+                queue.get_nowait()
+
+    return total / elapsed
+
+
+async def run(mode: str, total: int) -> float:
+    callsite_rate = 5.0 if mode == "limitado" else 0.0
+    config = LogConfig(max_queue_size=total, batch_interval=3600.0, shed_sample_threshold=1.0, callsite_rate=callsite_rate)
+
+    async with AsyncDiscordHandler(config) as handler:
+        logs._handler = handler
+        logger.remove()
+        logger.add(logs.discord_sink, level="INFO", format=logs._discord_format)
+
+        queue = handler.queues["INFO"]
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            start = time.perf_counter()
+            for i in range(total):
+                logger.info("requisicao {} processada em {}ms", i, i % 500)
+
+            expected = total if mode != "limitado" else total - handler.site_limiter.suppressed_total
+            while queue.qsize() < expected:
+                await asyncio.sleep(0)
+            elapsed = time.perf_counter() - start
+
+            logs._handler = None
+            queue.drain()
+
+    return total / elapsed
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+
+    print(f"=== INGESTAO: {total} x logger.info com discord_sink ===")
+    baseline = load_baseline()
+    if baseline is None:
+        print("   antes: baseline fora do git, pulando")
+    else:
+        rate = asyncio.run(run_baseline(baseline, total))
+        print(f"{'antes':>8}: {rate:>10.0f} registros/s")
+
+    for mode in ("depois", "limitado"):
+        rate = asyncio.run(run(mode, total))
+        print(f"{mode:>8}: {rate:>10.0f} registros/s")
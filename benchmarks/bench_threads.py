@@ -0,0 +1,104 @@
+"""
+Benchmark da passagem de registros entre threads: N threads produtoras mandando registros pro loop
+que roda numa thread propria (o caso da BackgroundEngine).
+
+Compara um call_soon_threadsafe por registro (um wakeup do loop pra cada um) com o RecordHandoff
+(append no deque e um wakeup por lote). Mede registros/s ate o ultimo chegar no sink do loop
+e quantas vezes o loop foi acordado. Nada sai pra rede, o sink so conta.
+
+Uso:
+    python benchmarks/bench_threads.py [threads] [registros_por_thread]
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from logger.background_engine import RecordHandoff
+from logger.discord_record import DiscordRecord
+
+
+class LoopThread:
+    """Loop asyncio numa thread propria, igual a engine."""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+    def run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
+def produce(threads: int, per_thread: int, submit) -> float:
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(index: int):
+        barrier.wait()
+        for i in range(per_thread):
+            submit(f"thread {index} requisicao {i}", "INFO")
+
+    workers = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    return start
+
+
+def run(mode: str, threads: int, per_thread: int):
+    total = threads * per_thread
+    runner = LoopThread()
+    received = [0]
+    done = threading.Event()
+
+    def sink(record: DiscordRecord):
+        received[0] += 1
+        if received[0] == total:
+            done.set()
+
+    wakeups = [0]
+    if mode == "antes":
+        loop = runner.loop
+
+        def on_loop(record: DiscordRecord):
+            wakeups[0] += 1
+            sink(record)
+
+        def submit(message: str, level: str):
+            loop.call_soon_threadsafe(on_loop, DiscordRecord(message, level, time.time()))
+    else:
+        handoff = RecordHandoff(sink, max_pending=total)
+        runner.run(handoff.start())
+        submit = handoff.submit
+
+    start = produce(threads, per_thread, submit)
+    done.wait()
+    elapsed = time.perf_counter() - start
+
+    if mode != "antes":
+        wakeups[0] = handoff.batches
+        runner.run(handoff.stop())
+    runner.close()
+    return total / elapsed, wakeups[0]
+
+
+if __name__ == "__main__":
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    per_thread = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+
+    print(f"=== ENTRE THREADS: {threads} threads x {per_thread} registros ===")
+    for mode in ("antes", "depois"):
+        rate, wakeups = run(mode, threads, per_thread)
+        print(f"{mode:>7}: {rate:>10.0f} registros/s | {wakeups:>7} wakeups do loop")
@@ -0,0 +1,213 @@
+"""
+Servidor local que imita a API de webhooks do discord, pra benchmark sem tocar em webhook real.
+
+Cada webhook (caminho da URL) tem seu bucket: limit requests a cada reset_after segundos.
+Toda resposta leva os headers X-RateLimit-*, quem passa do limite recebe 429 com retry-after
+(header e JSON, igual o discord). Da pra injetar latencia, erros 5xx aleatorios e uma queda
+total (outage) ou um status fixo por webhook (status_for, ex: 400/404), e o servidor guarda o que recebeu pra conferir no fim. Aceita JSON e multipart
+(payload_json + arquivos anexos, os arquivos ficam em payload["_files"] como (nome, bytes)).
+
+Uso sozinho:
+    python benchmarks/fake_discord.py [porta]
+    ERROR_HOOK=http://127.0.0.1:8765/api/webhooks/1/error
+"""
+import asyncio
+import json
+import random
+import sys
+import time
+
+from typing import Dict, List, Optional, Tuple
+
+
+class _Bucket:
+    __slots__ = ("remaining", "reset_at")
+
+    def __init__(self, limit: int, now: float, reset_after: float):
+        self.remaining = limit
+        self.reset_at = now + reset_after
+
+
+class FakeDiscordServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, limit: int = 5, reset_after: float = 2.0,
+                 latency: float = 0.0, latency_jitter: float = 0.0, error_rate: float = 0.0, seed: Optional[int] = None):
+        """
+            limit / reset_after: budget de cada webhook (o discord usa 5 a cada 2s)
+            latency / latency_jitter: atraso de cada resposta, latency + uniform(0, latency_jitter)
+            error_rate: fracao das requests que recebem 500
+        """
+
+        self.host = host
+        self.port = port
+        self.limit = limit
+        self.reset_after = reset_after
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.outage = False # Com True toda request recebe 503
+        self.status_for: Dict[str, int] = {} # Nome da webhook -> status fixo (400 payload ruim, 404 webhook apagada)
+
+        self._random = random.Random(seed)
+        self._buckets: Dict[str, _Bucket] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+
+        self.requests = 0
+        self.accepted = 0
+        self.rate_limited = 0
+        self.errors = 0
+        self.received: List[Tuple[float, str, dict]] = [] # (hora de chegada, caminho, payload) das aceitas
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def url(self, name: str) -> str:
+        return f"http://{self.host}:{self.port}/api/webhooks/{name}/token"
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "accepted": self.accepted,
+            "rate_limited": self.rate_limited,
+            "errors": self.errors,
+        }
+
+    def _bucket_headers(self, path: str, now: float) -> Tuple[bool, Dict[str, str]]:
+        """
+        Consome o budget da webhook, retorna se passou e os headers X-RateLimit-*.
+        """
+
+        bucket = self._buckets.get(path)
+        if bucket is None or now >= bucket.reset_at:
+            bucket = self._buckets[path] = _Bucket(self.limit, now, self.reset_after)
+
+        allowed = bucket.remaining > 0
+        if allowed:
+            bucket.remaining -= 1
+
+        reset_after = max(0.0, bucket.reset_at - now)
+        return allowed, {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(bucket.remaining),
+            "X-RateLimit-Reset-After": f"{reset_after:.3f}",
+            "X-RateLimit-Bucket": f"bucket-{path}",
+        }
+
+    @staticmethod
+    def _parse_multipart(body: bytes, content_type: str) -> dict:
+        """
+        Tira o payload_json e os arquivos de um corpo multipart/form-data.
+        """
+
+        boundary = content_type.split("boundary=", 1)[1].strip('"').encode("latin-1")
+        payload: dict = {}
+        files: List[Tuple[str, int]] = []
+        for part in body.split(b"--" + boundary):
+            head, sep, data = part.partition(b"\r\n\r\n")
+            if not sep:
+                continue
+            data = data[:-2] if data.endswith(b"\r\n") else data
+            head_text = head.decode("latin-1")
+            if 'name="payload_json"' in head_text:
+                payload.update(json.loads(data))
+            elif "filename=" in head_text:
+                filename = head_text.split('filename="', 1)[1].split('"', 1)[0]
+                files.append((filename, len(data)))
+        payload["_files"] = files
+        return payload
+
+    async def _respond(self, path: str, body: bytes, content_type: str = "") -> Tuple[int, Dict[str, str], bytes]:
+        self.requests += 1
+
+        delay = self.latency + (self._random.uniform(0, self.latency_jitter) if self.latency_jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if self.outage:
+            self.errors += 1
+            return 503, {}, b'{"message": "Service Unavailable"}'
+
+        status = self.status_for.get(path.rsplit("/", 2)[-2]) if self.status_for else None
+        if status is not None:
+            self.errors += 1
+            return status, {}, json.dumps({"message": f"Forced {status}", "code": 0}).encode()
+
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.errors += 1
+            return 500, {}, b'{"message": "Internal Server Error"}'
+
+        now = time.monotonic()
+        allowed, headers = self._bucket_headers(path, now)
+        if not allowed:
+            self.rate_limited += 1
+            retry_after = float(headers["X-RateLimit-Reset-After"])
+            headers["Retry-After"] = f"{retry_after:.3f}"
+            return 429, headers, json.dumps({"message": "You are being rate limited.", "retry_after": retry_after, "global": False}).encode()
+
+        try:
+            if content_type.startswith("multipart/form-data"):
+                payload = self._parse_multipart(body, content_type)
+            else:
+                payload = json.loads(body or b"{}")
+        except (ValueError, IndexError):
+            return 400, headers, b'{"message": "Cannot send an empty message"}'
+
+        self.accepted += 1
+        self.received.append((time.time(), path, payload))
+        return 204, headers, b""
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        # Mantem a conexao aberta entre requests (keep-alive), como o httpx espera
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+
+                lines = head.decode("latin-1").split("\r\n")
+                _, path, _ = lines[0].split(" ", 2)
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                status, response_headers, response_body = await self._respond(path.split("?")[0], body, headers.get("content-type", ""))
+
+                response_headers["Content-Length"] = str(len(response_body))
+                if response_body:
+                    response_headers["Content-Type"] = "application/json"
+                head_lines = [f"HTTP/1.1 {status} X"] + [f"{name}: {value}" for name, value in response_headers.items()]
+                writer.write(("\r\n".join(head_lines) + "\r\n\r\n").encode("latin-1") + response_body)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+if __name__ == "__main__":
+    async def main():
+        port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+        server = FakeDiscordServer(port=port)
+        await server.start()
+        print(f"Fake discord ouvindo, webhook de exemplo: {server.url('1')}")
+        try:
+            while True:
+                await asyncio.sleep(5)
+                print(server.stats())
+        finally:
+            await server.stop()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,301 @@
+"""
+Cenarios de carga contra o fake_discord, com resultado em JSON pra comparar entre versoes.
+
+Cada cenario roda num processo separado (pico de RSS isolado) dentro de um diretorio temporario
+(spool e arquivos do loguru nao sujam o repositorio) e reporta:
+    - ingest_per_second: registros/s no produtor (custo do enqueue/logger)
+    - delivery_p50_ms / delivery_p99_ms: do registro mais antigo do payload ate a entrega
+    - requests_per_message: requests que chegaram no servidor (429/5xx inclusos) por registro logado
+    - peak_rss_kb: pico de memoria do processo
+
+Uso:
+    python benchmarks/scenarios.py                      # todos, JSON no stdout
+    python benchmarks/scenarios.py error_storm outage_recovery --output resultado.json
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from typing import Awaitable, Callable, Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.join(BENCH_DIR, "..")
+
+
+def _percentile(samples: List[float], q: float):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _make_config(server, spool_dir: str, **overrides):
+    from logger.log_config import LogConfig
+
+    options = dict(
+        error_webhook=server.url("error"),
+        info_webhook=server.url("info"),
+        batch_interval=0.5,
+        max_retries=2,
+        spool_dir=spool_dir,
+        spool_replay=False,
+    )
+    options.update(overrides)
+    return LogConfig(**options)
+
+
+def _watch_delivery(handler, samples: List[float]):
+    """
+    Guarda cada latencia de entrega crua (o histograma do handler so tem os buckets).
+    """
+
+    original = handler._on_delivered
+
+    def on_delivered(queue_type, created_at):
+        if created_at is not None:
+            samples.append(time.time() - created_at)
+        original(queue_type, created_at)
+
+    handler._on_delivered = on_delivered
+
+
+async def _produce(handler, records, rate: float = 0.0) -> float:
+    """
+    Enfileira (message, level, stack_trace) e retorna o tempo gasto so no enqueue.
+    Com rate > 0 espaca os registros em lotes de 100 pra ficar perto de rate registros/s.
+    """
+
+    spent = 0.0
+    for idx, (message, level, stack_trace) in enumerate(records):
+        start = time.perf_counter()
+        handler.enqueue_nowait(message, level, stack_trace=stack_trace)
+        spent += time.perf_counter() - start
+        if rate and idx % 100 == 99:
+            await asyncio.sleep(100 / rate)
+    return spent
+
+
+async def _run_handler(server, spool_dir: str, records, rate: float = 0.0, during=None, **overrides) -> dict:
+    from logger.discord_handler import AsyncDiscordHandler
+
+    config = _make_config(server, spool_dir, **overrides)
+    samples: List[float] = []
+
+    start = time.perf_counter()
+    async with AsyncDiscordHandler(config) as handler:
+        _watch_delivery(handler, samples)
+        producer = _produce(handler, records, rate)
+        if during:
+            ingest_seconds, _ = await asyncio.gather(producer, during(handler))
+        else:
+            ingest_seconds = await producer
+    total_seconds = time.perf_counter() - start
+
+    snapshot = handler.metrics.snapshot()
+    return {
+        "target": "AsyncDiscordHandler",
+        "records": len(records),
+        "ingest_seconds": ingest_seconds,
+        "total_seconds": total_seconds,
+        "delivery_samples": samples,
+        "fallback_payloads": snapshot.get("logsentinel_payloads_fallback_total", 0),
+        "shed": sum(value for name, value in snapshot.items() if name.startswith("logsentinel_shed_total")),
+    }
+
+
+async def steady_info(server, spool_dir: str) -> dict:
+    records = [(f"usuario {i} fez login de 10.0.{i % 256}.{i % 7}", "INFO", None) for i in range(5000)]
+    return await _run_handler(server, spool_dir, records, rate=1000)
+
+
+async def error_storm(server, spool_dir: str) -> dict:
+    records = [
+        (f"falha no servico {i % 50}: timeout apos {1000 + i % 997}ms no pedido {i}", "ERROR", None)
+        for i in range(20000)
+    ]
+    return await _run_handler(server, spool_dir, records, max_queue_size=50000)
+
+
+async def critical_burst(server, spool_dir: str) -> dict:
+    trace = "Traceback (most recent call last):\n  File \"/srv/app/worker.py\", line 42, in run\nRuntimeError: {}"
+    records = [(f"worker {i} morreu", "CRITICAL", trace.format(i)) for i in range(300)]
+    return await _run_handler(server, spool_dir, records, flush_critical_delay=0.1)
+
+
+async def outage_recovery(server, spool_dir: str) -> dict:
+    """
+    3s de 5xx: o circuito abre, os payloads esperam o probe na memoria e tem que sair quando o discord volta,
+    sem esperar reiniciar (falha o cenario se nada for entregue depois da queda).
+    """
+
+    from logger.circuit_breaker import CLOSED
+
+    records = [(f"erro ao gravar pedido {i}", "ERROR", None) for i in range(2000)]
+    recovery = {}
+
+    async def outage(handler):
+        server.outage = True
+        await asyncio.sleep(3.0)
+        server.outage = False
+        accepted_before = server.accepted
+
+        # Espera o probe fechar o circuito e o agendador de retry esvaziar
+        until = time.monotonic() + 30.0
+        while time.monotonic() < until:
+            closed = all(breaker.state == CLOSED for breaker in handler.breakers.values())
+            if closed and not handler.retry_scheduler.pending:
+                break
+            await asyncio.sleep(0.2)
+        recovery["delivered_after_outage"] = server.accepted - accepted_before
+
+    result = await _run_handler(server, spool_dir, records, rate=500, during=outage)
+    result.update(recovery)
+    assert result["delivered_after_outage"] > 0, "nada entregue depois da queda: payloads presos no spool ate reiniciar"
+    return result
+
+
+async def logger_manager_steady(server, spool_dir: str) -> dict:
+    from logger import logs
+
+    config = _make_config(server, spool_dir)
+    samples: List[float] = []
+    total = 5000
+
+    start = time.perf_counter()
+    async with logs.logger_manager(config) as log:
+        _watch_delivery(logs._handler, samples)
+        handler = logs._handler
+
+        ingest_start = time.perf_counter()
+        for i in range(total):
+            log.info("requisicao {} processada em {}ms", i, i % 500)
+            if i % 100 == 99:
+                await asyncio.sleep(0)
+        ingest_seconds = time.perf_counter() - ingest_start
+    total_seconds = time.perf_counter() - start
+
+    snapshot = handler.metrics.snapshot()
+    return {
+        "target": "logger_manager",
+        "records": total,
+        "ingest_seconds": ingest_seconds,
+        "total_seconds": total_seconds,
+        "delivery_samples": samples,
+        "fallback_payloads": snapshot.get("logsentinel_payloads_fallback_total", 0),
+        "shed": sum(value for name, value in snapshot.items() if name.startswith("logsentinel_shed_total")),
+    }
+
+
+SCENARIOS: Dict[str, Callable[..., Awaitable[dict]]] = {
+    "steady_info": steady_info,
+    "error_storm": error_storm,
+    "critical_burst": critical_burst,
+    "outage_recovery": outage_recovery,
+    "logger_manager_steady": logger_manager_steady,
+}
+
+
+async def run_scenario(name: str) -> dict:
+    from fake_discord import FakeDiscordServer
+
+    server = FakeDiscordServer(latency=0.02, latency_jitter=0.03, seed=1)
+    await server.start()
+    try:
+        # Prints do sistema nao entram no resultado
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = await SCENARIOS[name](server, os.path.join(os.getcwd(), "spool"))
+    finally:
+        await server.stop()
+
+    samples = result.pop("delivery_samples")
+    p50 = _percentile(samples, 0.5)
+    p99 = _percentile(samples, 0.99)
+    stats = server.stats()
+
+    result.update({
+        "scenario": name,
+        "ingest_per_second": result["records"] / result["ingest_seconds"] if result["ingest_seconds"] else None,
+        "delivery_p50_ms": p50 * 1000 if p50 is not None else None,
+        "delivery_p99_ms": p99 * 1000 if p99 is not None else None,
+        "delivered_payloads": stats["accepted"],
+        "server": stats,
+        "requests_per_message": stats["requests"] / result["records"],
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    })
+    return result
+
+
+def _run_isolated(name: str) -> dict:
+    """
+    Roda o cenario num processo novo e num diretorio temporario.
+    """
+
+    env = dict(os.environ)
+    for var in ("ERROR_HOOK", "INFO_HOOK", "COLLECTOR_SOCKET", "METRICS_PORT"):
+        env.pop(var, None)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.path.abspath(ROOT), BENCH_DIR, env.get("PYTHONPATH")]))
+
+    with tempfile.TemporaryDirectory(prefix="logsentinel-bench-") as workdir:
+        completed = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--single", name],
+            cwd=workdir, env=env, capture_output=True, text=True
+        )
+
+    if completed.returncode != 0:
+        return {"scenario": name, "error": completed.stderr.strip().splitlines()[-1:] or ["falhou"]}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def _version() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return "desconhecida"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Cenarios de carga do LogSentinel contra um discord falso")
+    parser.add_argument("scenarios", nargs="*", help=f"Cenarios (padrao: todos): {', '.join(SCENARIOS)}")
+    parser.add_argument("--output", help="Arquivo JSON de saida (padrao: stdout)")
+    parser.add_argument("--single", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.single:
+        print(json.dumps(asyncio.run(run_scenario(args.single))))
+        return 0
+
+    names = args.scenarios or list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"cenario desconhecido: {', '.join(unknown)}")
+
+    report = {
+        "version": _version(),
+        "python": platform.python_version(),
+        "timestamp": time.time(),
+        "results": [],
+    }
+    for name in names:
+        print(f"▶ {name}", file=sys.stderr)
+        report["results"].append(_run_isolated(name))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
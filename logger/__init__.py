@@ -0,0 +1,56 @@
+"""
+LogSentinel: logs do loguru entregues no discord.
+
+Importar o pacote nao carrega nada alem disso: os nomes abaixo sao resolvidos na primeira vez
+que sao usados (loguru, handler, httpx...) e o .env so e lido por load_env / logger_manager.
+"""
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+_EXPORTS = {
+    "logger": ".logs",
+    "logger_manager": ".logs",
+    "start_background_logging": ".logs",
+    "stop_background_logging": ".logs",
+    "create_config_for_environment": ".logs",
+    "metrics_snapshot": ".logs",
+    "circuit_states": ".logs",
+    "discord_sink": ".logs",
+    "LogConfig": ".log_config",
+    "load_env": ".log_config",
+    "AsyncDiscordHandler": ".discord_handler",
+    "DiscordRecord": ".discord_record",
+    "LogCollector": ".log_collector",
+    "CollectorClient": ".collector_client",
+    "LogReplayer": ".log_replayer",
+    "MetricsRegistry": ".metrics",
+    "BackgroundEngine": ".background_engine",
+    "BatchedFileSink": ".file_sink",
+}
+
+__all__ = list(_EXPORTS)
+
+if TYPE_CHECKING:
+    from .logs import logger, logger_manager, start_background_logging, stop_background_logging
+    from .logs import create_config_for_environment, metrics_snapshot, circuit_states, discord_sink
+    from .log_config import LogConfig, load_env
+    from .discord_handler import AsyncDiscordHandler
+    from .discord_record import DiscordRecord
+    from .log_collector import LogCollector
+    from .collector_client import CollectorClient
+    from .log_replayer import LogReplayer
+    from .metrics import MetricsRegistry
+    from .background_engine import BackgroundEngine
+    from .file_sink import BatchedFileSink
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value # Proximo acesso nao passa mais por aqui
+    return value
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
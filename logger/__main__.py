@@ -0,0 +1,3 @@
+from .logs import main
+
+raise SystemExit(main())
@@ -0,0 +1,239 @@
+import asyncio
+import atexit
+import threading
+import time
+
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+from .log_config import LogConfig
+from .discord_record import DiscordRecord
+from .discord_handler import AsyncDiscordHandler
+from .metrics import MetricsRegistry
+
+class RecordHandoff:
+    """
+    Passagem de registros de qualquer thread pro loop do handler.
+
+    O submit so faz append num deque (thread safe no CPython, sem lock) e acorda o loop uma vez por
+    lote: so o primeiro registro depois de uma drenagem agenda o call_soon_threadsafe, o resto so entra
+    no deque. No loop uma task drena tudo que tiver pro sink (enqueue_record do handler ou do coletor).
+    """
+
+    DRAIN_CHUNK = 1000 # Registros por vez antes de devolver o loop pros outros
+
+    def __init__(self, sink: Callable[[DiscordRecord], None], max_pending: int = 50000, metrics: Optional[MetricsRegistry] = None):
+        """
+            sink: chamada no loop com cada DiscordRecord
+            max_pending: registros esperando no deque, passou disso o registro e descartado e contado
+            metrics: registra handoff_pending / handoff_dropped se passado
+        """
+
+        self.sink = sink
+        self.max_pending = max_pending
+
+        self._pending: Deque[DiscordRecord] = deque()
+        self._scheduled = False # Ja tem um wakeup agendado pro lote atual
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self.accepting = False
+        self.dropped = 0
+        self.batches = 0 # Quantas vezes o loop foi acordado
+
+        if metrics is not None:
+            metrics.gauge("handoff_pending", "Registros de outras threads esperando o loop", fn=lambda: len(self._pending))
+            metrics.gauge("handoff_dropped", "Registros de outras threads descartados com o deque cheio", fn=lambda: self.dropped)
+
+    async def start(self):
+        """
+        Tem que ser chamado no loop que vai receber os registros.
+        """
+
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        self.accepting = True
+
+    def submit(self, message: str, level: str, exception: Any = None, name: Optional[str] = None,
+               tags: Optional[Dict[str, Any]] = None, timestamp: Optional[float] = None) -> bool:
+        """
+        Entrega um registro de qualquer thread, nunca bloqueia. Retorna False se o registro nao foi aceito.
+        """
+
+        if not self.accepting:
+            return False
+        if len(self._pending) >= self.max_pending:
+            self.dropped += 1
+            return False
+
+        self._pending.append(DiscordRecord(message, level, timestamp or time.time(), exception, name=name, tags=tags))
+        if not self._scheduled:
+            self._scheduled = True
+            try:
+                self._loop.call_soon_threadsafe(self._wakeup.set)
+            except RuntimeError: # Loop fechado
+                self.accepting = False
+        return True
+
+    async def _drain(self):
+        pending = self._pending
+        sink = self.sink
+        while pending:
+            for _ in range(min(len(pending), self.DRAIN_CHUNK)):
+                sink(pending.popleft())
+            await asyncio.sleep(0)
+
+    async def _run(self):
+        while True:
+            try:
+                await self._wakeup.wait()
+                # Limpa a flag antes de drenar: quem fizer append daqui pra frente agenda outro wakeup
+                self._wakeup.clear()
+                self._scheduled = False
+                self.batches += 1
+                await self._drain()
+            except asyncio.CancelledError:
+                break
+            except Exception as er:
+                print(f"❌ Erro na passagem de registros entre threads: {er}")
+
+    async def stop(self):
+        """
+        Para de aceitar e entrega o que ja tava no deque.
+        """
+
+        self.accepting = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._drain()
+
+class BackgroundEngine:
+    """
+    AsyncDiscordHandler rodando numa thread propria com seu proprio loop, pra apps sincronas
+    (Flask, Celery, scripts) e threads de worker usarem o discord_sink.
+
+    start() e shutdown(timeout) sao sincronos, os registros chegam pelo RecordHandoff e um atexit
+    drena o que sobrou quando o processo termina sem chamar o shutdown.
+    """
+
+    JOIN_MARGIN = 0.5 # Segundos do timeout do shutdown pra fechar a sessao e terminar a thread depois do handler.stop
+
+    def __init__(self, config: Optional[LogConfig] = None, start_timeout: float = 10.0):
+        self.config = config or LogConfig()
+        self.start_timeout = start_timeout
+        self.report: Optional[dict] = None # Relatorio do handler.stop (entregues / salvos no spool)
+
+        self.handler: Optional[AsyncDiscordHandler] = None
+        self.handoff: Optional[RecordHandoff] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self._thread: Optional[threading.Thread] = None
+        self._started = threading.Event()
+        self._stop_event: Optional[asyncio.Event] = None
+        self._error: Optional[BaseException] = None
+        self._deadline: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and self.handoff is not None and self.handoff.accepting
+
+    def start(self) -> "BackgroundEngine":
+        """
+        Sobe a thread do loop e espera o handler ficar pronto.
+        """
+
+        if self._thread is not None:
+            return self
+
+        self._thread = threading.Thread(target=self._thread_main, name="logsentinel-engine", daemon=True)
+        self._thread.start()
+
+        if not self._started.wait(self.start_timeout):
+            raise RuntimeError(f"Engine de logs nao iniciou em {self.start_timeout}s")
+        if self._error is not None:
+            self._thread = None
+            raise RuntimeError(f"Engine de logs falhou ao iniciar: {self._error}") from self._error
+
+        self._register_atexit()
+        return self
+
+    def _register_atexit(self):
+        # threading._register_atexit roda antes do atexit normal e antes dos executors fecharem (as chamadas
+        # rodam na ordem inversa e o concurrent.futures registra o dele no import), entao o spool ainda grava.
+        # No atexit normal o run_in_executor do spool ja daria "cannot schedule new futures after shutdown"
+        register = getattr(threading, "_register_atexit", None)
+        if register is None:
+            atexit.register(self._atexit)
+            return
+        try:
+            register(self._atexit)
+        except RuntimeError: # Interpretador ja ta fechando
+            atexit.register(self._atexit)
+
+    def _thread_main(self):
+        try:
+            asyncio.run(self._main())
+        except BaseException as er:
+            self._error = er
+            if self._started.is_set():
+                print(f"❌ Engine de logs parou com erro: {er!r}")
+            self._started.set()
+
+    async def _main(self):
+        self.loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+
+        async with AsyncDiscordHandler(self.config) as handler:
+            self.handler = handler
+            self.handoff = RecordHandoff(handler.enqueue_record, self.config.handoff_max_pending, handler.metrics)
+            await self.handoff.start()
+            self._started.set()
+
+            await self._stop_event.wait()
+            await self.handoff.stop()
+            self.report = await handler.stop(self._deadline)
+
+    def submit(self, message: str, level: str, exception: Any = None, name: Optional[str] = None,
+               tags: Optional[Dict[str, Any]] = None) -> bool:
+        handoff = self.handoff
+        return handoff.submit(message, level, exception, name, tags) if handoff else False
+
+    def shutdown(self, timeout: Optional[float] = None) -> bool:
+        """
+        Para de aceitar registros, entrega o que ta pendente e para o handler.
+        Retorna False se a thread nao terminou dentro do timeout (padrao: config.shutdown_timeout).
+        """
+
+        thread = self._thread
+        if thread is None:
+            return True
+
+        if timeout is None:
+            timeout = self.config.shutdown_timeout
+        self._deadline = max(0.0, timeout - self.JOIN_MARGIN)
+
+        if self.handoff is not None:
+            self.handoff.accepting = False
+        try:
+            self.loop.call_soon_threadsafe(self._stop_event.set)
+        except RuntimeError:
+            pass # Loop ja fechou
+
+        thread.join(timeout)
+        finished = not thread.is_alive()
+        if finished:
+            self._thread = None
+            atexit.unregister(self._atexit) # No threading._register_atexit nao tem unregister, o _atexit vira no-op
+        else:
+            print(f"⚠️ Engine de logs nao terminou em {timeout}s, registros pendentes podem ser perdidos")
+        return finished
+
+    def _atexit(self):
+        self.shutdown()
@@ -0,0 +1,129 @@
+import threading
+import time
+
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+class CallSite:
+    """
+    Token bucket de uma linha de codigo ({name}:{function}:{line} do loguru).
+    """
+
+    __slots__ = ("name", "function", "line", "level", "message", "tokens", "updated", "suppressed", "noted", "queue_type")
+
+    def __init__(self, name: str, function: str, line: int, level: str, message: str, tokens: float, now: float):
+        self.name = name
+        self.function = function
+        self.line = line
+        self.level = level # Level do primeiro registro, escolhe a rota do resumo
+        self.message = message # Mensagem do primeiro registro, chave do site no Digest
+        self.tokens = tokens
+        self.updated = now
+        self.suppressed = 0 # Registros barrados desde o ultimo resumo
+        self.noted = False # Ja avisou o handler que tem resumo pendente
+        self.queue_type: Optional[str] = None
+
+    @property
+    def label(self) -> str:
+        return f"{self.name}:{self.function}:{self.line}"
+
+class CallSiteLimiter:
+    """
+    Limite de registros por linha de codigo, aplicado no discord_sink antes de enfileirar.
+
+    Cada call site tem um token bucket (rate por segundo, ate burst acumulados). Passou disso o registro
+    so e contado, nao entra na fila, e o handler manda "local X suprimiu N registros" no proximo flush.
+    Os sites ficam num dict aninhado name -> function -> line (sem montar tupla/string de chave por registro)
+    e num LRU limitado a max_sites, o menos usado sai quando chega um novo.
+
+    O discord_sink e chamado de qualquer thread que loga, entao a atualizacao do bucket e dos contadores
+    fica num lock (o on_suppressed e chamado fora dele).
+    """
+
+    def __init__(self, rate: float = 5.0, burst: int = 20, max_sites: int = 10000,
+                 on_suppressed: Optional[Callable[[CallSite], None]] = None):
+        """
+            rate: registros por segundo liberados por site
+            burst: registros seguidos que um site pode mandar antes de comecar a ser limitado
+            max_sites: sites guardados no LRU
+            on_suppressed: chamada com o site no primeiro registro barrado desde o ultimo resumo
+        """
+
+        self.rate = rate
+        self.burst = float(burst)
+        self.max_sites = max_sites
+        self.on_suppressed = on_suppressed
+
+        self._sites: Dict[str, Dict[str, Dict[int, CallSite]]] = {}
+        self._lru: "OrderedDict[CallSite, None]" = OrderedDict() # O proprio site e a chave (hash por identidade)
+
+        self.suppressed_total = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    def allow(self, name: str, function: str, line: int, level: str, message: str = "") -> bool:
+        with self._lock:
+            now = time.monotonic()
+
+            site = None
+            functions = self._sites.get(name)
+            if functions is not None:
+                lines = functions.get(function)
+                if lines is not None:
+                    site = lines.get(line)
+
+            if site is None:
+                site = self._add(name, function, line, level, message, now)
+            else:
+                self._lru.move_to_end(site)
+
+            tokens = site.tokens + (now - site.updated) * self.rate
+            if tokens > self.burst:
+                tokens = self.burst
+            site.updated = now
+
+            if tokens >= 1.0:
+                site.tokens = tokens - 1.0
+                return True
+
+            site.tokens = tokens
+            site.suppressed += 1
+            self.suppressed_total += 1
+            if site.noted:
+                return False
+            site.noted = True
+
+        if self.on_suppressed is not None:
+            self.on_suppressed(site)
+        return False
+
+    def _add(self, name: str, function: str, line: int, level: str, message: str, now: float) -> CallSite:
+        if len(self._lru) >= self.max_sites:
+            self._evict(self._lru.popitem(last=False)[0])
+
+        site = CallSite(name, function, line, level, message, self.burst, now)
+        self._sites.setdefault(name, {}).setdefault(function, {})[line] = site
+        self._lru[site] = None
+        return site
+
+    def _evict(self, site: CallSite):
+        functions = self._sites[site.name]
+        lines = functions[site.function]
+        del lines[site.line]
+        if not lines:
+            del functions[site.function]
+            if not functions:
+                del self._sites[site.name]
+
+    def take(self, site: CallSite) -> int:
+        """
+        Quantos registros o site barrou desde o ultimo resumo, zerando o contador.
+        """
+
+        with self._lock:
+            suppressed = site.suppressed
+            site.suppressed = 0
+            site.noted = False
+        return suppressed
@@ -0,0 +1,153 @@
+import time
+
+from collections import deque
+from typing import Deque, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Status que dizem que a webhook nao existe mais ou o token nao vale, nao adianta tentar de novo
+PERMANENT_STATUS = (401, 403, 404)
+
+class CircuitBreaker:
+    """
+    Circuit breaker de uma webhook.
+
+    Fechado: tudo passa e os resultados entram numa janela dos ultimos window_size envios.
+    Abre na hora com erro permanente (401/403/404) ou quando a taxa de falha passageira (5xx, timeout)
+    da janela passa de failure_threshold. Aberto: nada passa ate o proximo probe (aberto por erro passageiro
+    o handler segura o payload no agendador de retry ate o probe, por erro permanente vai pro spool, sem I/O), que sai com backoff exponencial de open_seconds ate max_open_seconds.
+    Meio aberto: um unico envio (o probe) passa, se der certo fecha, se falhar abre de novo com backoff maior.
+    """
+
+    def __init__(self, failure_threshold: float = 0.5, window_size: int = 20, min_requests: int = 5,
+                 open_seconds: float = 5.0, max_open_seconds: float = 300.0):
+        """
+            failure_threshold: fracao de falhas na janela que abre o circuito
+            window_size: quantos envios recentes entram na conta
+            min_requests: minimo de envios na janela antes de abrir por taxa
+            open_seconds / max_open_seconds: espera ate o primeiro probe e o maximo depois de varios probes falhando
+        """
+
+        self.failure_threshold = failure_threshold
+        self.window_size = window_size
+        self.min_requests = min_requests
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+
+        self.state = CLOSED
+        self._window: Deque[bool] = deque() # True = falha
+        self._failures = 0
+        self._opens = 0 # Aberturas seguidas sem um envio bem sucedido, base do backoff
+        self._probe_at = 0.0 # time.monotonic() do proximo probe
+        self._probe_in_flight = False
+        self.permanent = False # Aberto por 401/403/404, nao adianta esperar o probe com o payload na memoria
+
+        self.last_status: Optional[int] = None # Ultimo status HTTP de erro (None = timeout/conexao)
+        self.last_error: Optional[str] = None
+
+    def rejecting(self, now: Optional[float] = None) -> bool:
+        """
+        Se um envio agora seria recusado, sem mudar o estado. Usado pra nem colocar o payload na fila da webhook.
+        """
+
+        if self.state == CLOSED:
+            return False
+        if self.state == HALF_OPEN:
+            return self._probe_in_flight
+        return (now if now is not None else time.monotonic()) < self._probe_at
+
+    def probe_in(self, now: Optional[float] = None) -> float:
+        """
+        Segundos ate o proximo probe (0 fechado ou meio aberto).
+        """
+
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self._probe_at - (now if now is not None else time.monotonic()))
+
+    def allow(self) -> bool:
+        """
+        Pede pra enviar. Aberto e na hora do probe vira meio aberto e libera so esse envio.
+        """
+
+        if self.state == CLOSED:
+            return True
+
+        if self.state == OPEN:
+            if time.monotonic() < self._probe_at:
+                return False
+            self.state = HALF_OPEN
+            self._probe_in_flight = False
+
+        if self._probe_in_flight:
+            return False
+        self._probe_in_flight = True
+        return True
+
+    def record_success(self):
+        if self.state != CLOSED:
+            self.state = CLOSED
+            self._window.clear()
+            self._failures = 0
+        self._opens = 0
+        self.permanent = False
+        self._probe_in_flight = False
+        self._push(False)
+
+    def record_neutral(self):
+        """
+        Resposta que nao diz nada da saude da webhook (429): libera o probe sem mudar o estado.
+        """
+
+        self._probe_in_flight = False
+
+    def record_failure(self, status: Optional[int] = None, error: Optional[str] = None):
+        """
+            status: status HTTP (None pra timeout/erro de conexao), 401/403/404 abrem na hora
+        """
+
+        self.last_status = status
+        self.last_error = error
+        self._probe_in_flight = False
+
+        if status in PERMANENT_STATUS or self.state == HALF_OPEN:
+            self._open(status in PERMANENT_STATUS)
+            return
+
+        if self.state == OPEN:
+            return
+
+        self._push(True)
+        total = len(self._window)
+        if total >= self.min_requests and self._failures / total >= self.failure_threshold:
+            self._open()
+
+    def _push(self, failed: bool):
+        self._window.append(failed)
+        self._failures += failed
+        if len(self._window) > self.window_size:
+            self._failures -= self._window.popleft()
+
+    def _open(self, permanent: bool = False):
+        self._opens += 1
+        self.permanent = permanent
+        delay = min(self.max_open_seconds, self.open_seconds * (2 ** (self._opens - 1)))
+        self.state = OPEN
+        self._probe_at = time.monotonic() + delay
+        self._window.clear()
+        self._failures = 0
+
+    def snapshot(self) -> dict:
+        """
+        Estado pra quem quiser mostrar (handler.circuit_states()).
+        """
+
+        return {
+            "state": self.state,
+            "failure_rate": self._failures / len(self._window) if self._window else 0.0,
+            "next_probe_in": max(0.0, self._probe_at - time.monotonic()) if self.state == OPEN else None,
+            "last_status": self.last_status,
+            "last_error": self.last_error,
+        }
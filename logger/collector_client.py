@@ -0,0 +1,179 @@
+import asyncio
+import time
+
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from .discord_record import DiscordRecord
+from .discord_handler import AsyncDiscordHandler
+from .log_collector import encode_frame
+
+def _frame_tags(tags: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    So as tags que viram JSON (o extra do loguru pode ter qualquer objeto), usadas no roteamento do coletor.
+    """
+
+    if not tags:
+        return None
+    return {key: value for key, value in tags.items() if isinstance(value, (str, int, float, bool))}
+
+class CollectorClient:
+    """
+    Lado do worker no modo coletor.
+
+    O submit e sincrono e nunca bloqueia: so coloca o registro num deque. Uma task em segundo plano
+    junta os registros em lotes e manda pro coletor pelo unix socket. Se o socket nao existe ou cai,
+    os registros vao pro AsyncDiscordHandler local (fallback) ate conseguir reconectar.
+    """
+
+    def __init__(self, socket_path: str, fallback: AsyncDiscordHandler, batch_size: int = 200,
+                 flush_interval: float = 0.2, max_pending: int = 10000, reconnect_delay: float = 5.0):
+        self.socket_path = socket_path
+        self.fallback = fallback
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.reconnect_delay = reconnect_delay
+
+        self.connected = False
+        self.running = False
+        self.sent = 0
+
+        self._pending: Deque[DiscordRecord] = deque()
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._reachable = True # So avisa no print quando muda de estado
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+
+    async def start(self):
+        self._wakeup = asyncio.Event()
+        self.running = True
+        await self._connect()
+        self._task = asyncio.create_task(self._run())
+
+    def submit(self, message: str, level: str, exception: Any = None, name: Optional[str] = None, tags: Optional[Dict[str, Any]] = None):
+        """
+        Entrega um registro, tem que ser chamado na thread do loop. Sem conexao ou com muita coisa
+        pendente o registro vai direto pro handler local.
+        """
+
+        self.submit_record(DiscordRecord(message, level, time.time(), exception, name=name, tags=tags))
+
+    def submit_record(self, record: DiscordRecord):
+        """
+        Mesmo que o submit com o registro ja montado (usado pela passagem entre threads).
+        """
+
+        if not self.connected or len(self._pending) >= self.max_pending:
+            self.fallback.enqueue_record(record)
+            return
+
+        self._pending.append(record)
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    async def _connect(self) -> bool:
+        try:
+            self._reader, self._writer = await asyncio.open_unix_connection(self.socket_path)
+        except OSError as er:
+            if self._reachable:
+                print(f"⚠️ Coletor indisponivel em {self.socket_path} ({er}), usando envio local")
+            self._reachable = False
+            self._writer = None
+            self.connected = False
+            return False
+
+        self._reachable = True
+        self.connected = True
+        print(f"📡 Conectado ao coletor em {self.socket_path}")
+        return True
+
+    def _fallback_pending(self):
+        while self._pending:
+            self.fallback.enqueue_record(self._pending.popleft())
+
+    def _disconnect(self):
+        if self._writer:
+            self._writer.close()
+        self._reader = None
+        self._writer = None
+        self.connected = False
+        self._fallback_pending()
+
+    async def _ship(self):
+        """
+        Manda tudo que ta pendente em frames de ate batch_size registros.
+        """
+
+        while self._pending and self._writer:
+            # O coletor nunca escreve nada, EOF no reader quer dizer que ele fechou a conexao
+            if self._reader.at_eof() or self._writer.is_closing():
+                print(f"⚠️ Coletor fechou a conexao, usando envio local")
+                self._disconnect()
+                return
+
+            batch = []
+            while self._pending and len(batch) < self.batch_size:
+                batch.append(self._pending.popleft())
+
+            frame = encode_frame([
+                (record.message, record.level, record.timestamp, record.stack_trace, record.name, _frame_tags(record.tags))
+                for record in batch
+            ])
+
+            try:
+                self._writer.write(frame)
+                await self._writer.drain()
+                self.sent += len(batch)
+            except asyncio.CancelledError:
+                # stop() cancelou no meio do drain: o lote volta pro inicio do deque pro _ship final ou pro
+                # fallback local. O frame pode ja ter saido pelo socket, entao pode duplicar (melhor que sumir)
+                self._pending.extendleft(reversed(batch))
+                raise
+            except (ConnectionError, OSError) as er:
+                print(f"⚠️ Conexao com coletor perdida ({er}), usando envio local")
+                for record in batch:
+                    self.fallback.enqueue_record(record)
+                self._disconnect()
+
+    async def _run(self):
+        while self.running:
+            try:
+                if not self.connected:
+                    await asyncio.sleep(self.reconnect_delay)
+                    await self._connect()
+                    continue
+
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+
+                await self._ship()
+            except asyncio.CancelledError:
+                break
+            except Exception as er:
+                print(f"❌ Erro no cliente do coletor: {er}")
+                self._disconnect()
+
+    async def stop(self):
+        self.running = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+        if self.connected:
+            await self._ship()
+        self._disconnect()
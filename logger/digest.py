@@ -0,0 +1,152 @@
+import time
+
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .discord_record import DiscordRecord
+from .template_miner import MASK_RE
+
+DIGEST_COLOR = 0x3498DB
+
+@lru_cache(maxsize=4096)
+def _template(message: str) -> str:
+    # Mesma mascara do TemplateMiner (<NUM>, <IP>...), com cache: rajada da mesma mensagem mascara uma vez so
+    return MASK_RE.sub(lambda match: f"<{match.lastgroup}>", message)
+
+class HeavyHitters:
+    """
+    Top-K aproximado com memoria fixa: count-min sketch pra contagem e uma tabela de K candidatos.
+
+    O sketch tem depth linhas de width contadores, cada chave soma num contador por linha e a estimativa
+    e o menor deles (nunca menos que o valor real). A tabela segue o space-saving: cheia, uma chave nova so
+    entra no lugar da menor se a estimativa dela passar a contagem da menor, entao as chaves frequentes
+    ficam e as raras nao rodam a tabela. Memoria: width * depth contadores + k chaves, qualquer que seja o trafego.
+    """
+
+    def __init__(self, k: int = 10, width: int = 2048, depth: int = 4):
+        self.k = k
+        self.width = width
+        self.depth = depth
+
+        self._rows: List[List[int]] = [[0] * width for _ in range(depth)]
+        self._top: Dict[str, int] = {} # chave -> estimativa
+        self._min_key: Optional[str] = None
+        self._min = 0
+
+        self.total = 0
+
+    def _indexes(self, key: str):
+        # Double hashing: depth posicoes a partir de um hash so (o hash da str fica em cache no objeto)
+        h1 = hash(key)
+        h2 = (h1 >> 16) | 1
+        width = self.width
+        return [(h1 + i * h2) % width for i in range(self.depth)]
+
+    def add(self, key: str, count: int = 1):
+        self.total += count
+
+        estimate = None
+        for row, index in zip(self._rows, self._indexes(key)):
+            row[index] += count
+            if estimate is None or row[index] < estimate:
+                estimate = row[index]
+
+        top = self._top
+        if key in top:
+            top[key] = estimate
+            if key == self._min_key:
+                self._refresh_min()
+        elif len(top) < self.k:
+            top[key] = estimate
+            if self._min_key is None or estimate < self._min:
+                self._min_key = key
+                self._min = estimate
+        elif estimate > self._min:
+            del top[self._min_key]
+            top[key] = estimate
+            self._refresh_min()
+
+    def _refresh_min(self):
+        top = self._top
+        self._min_key = min(top, key=top.__getitem__)
+        self._min = top[self._min_key]
+
+    def estimate(self, key: str) -> int:
+        return min(row[index] for row, index in zip(self._rows, self._indexes(key)))
+
+    def top(self, n: Optional[int] = None) -> List[Tuple[str, int]]:
+        items = sorted(self._top.items(), key=lambda item: item[1], reverse=True)
+        return items[:n] if n else items
+
+class Digest:
+    """
+    Resumo de tudo que passou pelas filas numa janela longa (ex: 1 hora), com memoria fixa.
+
+    Cada registro enfileirado no handler (duplicados, descartados por sobrecarga e de rota sem webhook
+    inclusive) entra no top-K do level dele pela chave "logger | template da mensagem", e o logger entra
+    no top-K de loggers. Os barrados pelo limite por linha entram em lote na mesma chave (observe_count),
+    e os descartes por sobrecarga tambem aparecem no total por level. No fim da janela vira um embed e zera.
+    """
+
+    def __init__(self, top_k: int = 10, width: int = 2048, depth: int = 4):
+        self.top_k = top_k
+        self.width = width
+        self.depth = depth
+        self.reset()
+
+    def reset(self):
+        self.levels: Dict[str, HeavyHitters] = {}
+        self.loggers = HeavyHitters(self.top_k, self.width, self.depth)
+        self.dropped: Dict[str, int] = {}
+        self.started = time.time()
+
+    @property
+    def total(self) -> int:
+        return sum(hitters.total for hitters in self.levels.values())
+
+    def observe(self, record: DiscordRecord):
+        self.observe_count(record.level, record.name, record.message)
+
+    def observe_count(self, level: str, name: Optional[str], message: str, count: int = 1):
+        hitters = self.levels.get(level)
+        if hitters is None:
+            hitters = self.levels[level] = HeavyHitters(self.top_k, self.width, self.depth)
+
+        name = name or "-"
+        hitters.add(f"{name} | {_template(message)}", count)
+        self.loggers.add(name, count)
+
+    def observe_dropped(self, dropped: Dict[str, int]):
+        for level, count in dropped.items():
+            self.dropped[level] = self.dropped.get(level, 0) + count
+
+    def embed(self, sanitize: Callable[[str], str] = lambda text: text, limit: int = 4096) -> Optional[dict]:
+        """
+        Embed com os totais por level, o top-K de cada level e os loggers que mais logaram. None se a janela ta vazia.
+            sanitize: aplicada em cada template antes de entrar no texto (redacao)
+        """
+
+        if not self.total and not self.dropped:
+            return None
+
+        elapsed = time.time() - self.started
+        hours, rest = divmod(int(elapsed), 3600)
+        window = f"{hours}h{rest // 60:02d}" if hours else f"{rest // 60}min"
+
+        totals = " | ".join(f"{level}: {hitters.total}" for level, hitters in sorted(self.levels.items()))
+        parts = [f"**Total:** {totals or 0}"]
+        if self.dropped:
+            parts.append("**Descartados por sobrecarga:** " + ", ".join(f"{level}: {count}" for level, count in sorted(self.dropped.items())))
+
+        for level in sorted(self.levels, key=lambda level: -{"CRITICAL": 2, "ERROR": 1}.get(level, 0)):
+            lines = [f"`{count:>6}x` {sanitize(key)[:200]}" for key, count in self.levels[level].top(self.top_k)]
+            parts.append(f"\n**Top {level}**\n" + "\n".join(lines))
+
+        loggers = ", ".join(f"{name} ({count})" for name, count in self.loggers.top(5))
+        parts.append(f"\n**Loggers:** {loggers}")
+
+        return {
+            "title": f"📊 Resumo das últimas {window}",
+            "description": "\n".join(parts)[:limit],
+            "color": DIGEST_COLOR,
+        }
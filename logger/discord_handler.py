@@ -0,0 +1,1153 @@
+import asyncio
+import importlib.util
+import re
+import os
+import random
+import time
+
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from datetime import datetime, timedelta
+from time import strftime
+
+# httpx so e importado no primeiro envio, quem so loga em arquivo (ou nunca envia) nao paga por eles
+if TYPE_CHECKING:
+    import httpx
+
+#Modulos propios
+from .log_config import LogConfig
+from .message_deduplicator import MessageDeduplicator
+from .intelligent_rate_limiter import IntelligentRateLimiter
+from .discord_record import DiscordRecord
+from .disk_spool import DiskSpool, DEAD_LETTER_DIR
+from .payload_packer import PayloadPacker
+from .payload_attachment import PayloadAttachment, ATTACHMENT_KEY, release
+from .webhook_sender import WebhookSender
+from .priority_buffer import PriorityBuffer
+from .template_miner import TemplateMiner
+from .webhook_router import WebhookRouter
+from .retry_scheduler import RetryScheduler, RetryEntry, SENT, RETRY, RATE_LIMITED, FAILED, CIRCUIT_OPEN
+from .circuit_breaker import CircuitBreaker, OPEN, PERMANENT_STATUS
+from .trace_cache import TraceCache
+from .redactor import Redactor, build_rules
+from .callsite_limiter import CallSiteLimiter, CallSite
+from .digest import Digest
+from .metrics import MetricsRegistry
+#from ..logs import logger
+
+# "/home/usuario/projeto/app/worker.py" -> "/.../app/worker.py" no stack trace
+STACK_PATH_RE = re.compile(r'/[^/\s]+/([^/\s]+/[^/\s]+)')
+
+class AsyncDiscordHandler:
+    SPILL_RESERVE = 1.0 # Segundos do prazo do shutdown guardados pra parar os workers e gravar o spool
+    CRASH_MESSAGES = 5 # Mensagens diferentes mostradas no embed de um crash repetido no lote, o resto so e contado
+
+    def __init__(self, config: LogConfig):
+
+        self.config = config
+
+        # Tabela de rotas: rotas configuradas primeiro, depois as padrao ERROR e INFO
+        self.router = WebhookRouter(config.routes, config.error_webhook, config.info_webhook)
+
+        # Uma fila por rota, limitada e com descarte por prioridade (INFO antes de ERROR antes de CRITICAL)
+        self.queues: Dict[str, PriorityBuffer] = {
+            route.name: PriorityBuffer(config.max_queue_size, config.shed_sample_threshold, config.shed_info_sample_rate)
+            for route in self.router.routes
+        }
+
+        # Primeira webhook de cada rota, usada por quem envia direto (replay)
+        self.webhooks = {
+            route.name: route.webhooks[0] if route.webhooks else None
+            for route in self.router.routes
+        }
+
+        self.session: Optional["httpx.AsyncClient"] = None # Criada no primeiro envio
+        self.senders: Dict[str, WebhookSender] = {} # Um worker de entrega por webhook, criado sob demanda
+        self.breakers: Dict[str, CircuitBreaker] = {} # Um circuit breaker por webhook, criado sob demanda
+        self.running = False
+        self.flush_task = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None # Loop onde as filas vivem, setado no __aenter__
+        self.replay_task = None
+        self.digest_task = None
+        self.shutdown_report: Optional[dict] = None
+
+        # Agendador de flush: acorda por tamanho, idade do item mais antigo ou CRITICAL
+        self._flush_event = asyncio.Event()
+        self._oldest: Dict[str, Optional[float]] = {queue_type: None for queue_type in self.queues}
+        self._critical_due: Dict[str, Optional[float]] = {queue_type: None for queue_type in self.queues}
+
+        # Tudo que nao conseguiu ser entregue vai pro spool e e reenviado na proxima inicializacao
+        self.spool = DiskSpool(config.spool_dir, config.spool_segment_size, config.spool_flush_interval)
+        # O que o discord recusou de vez (400/413, webhook 401/403/404) nao volta pro spool: reenviar so daria o mesmo erro
+        # a cada inicializacao. Fica em {spool_dir}/dead pra olhar e reenviar na mao (python -m logger replay)
+        self.dead_letter = DiskSpool(os.path.join(config.spool_dir, DEAD_LETTER_DIR), config.spool_segment_size, config.spool_flush_interval)
+
+        self.packer = PayloadPacker()
+        self.requests_saved = 0 # Quantas requests o empacotamento economizou desde o inicio
+
+        self.deduplicator = MessageDeduplicator(config.dedup_window, config.dedup_max_entries, config.verbose)
+
+        # Mensagens que so mudam nos valores (ids, tempos, IPs) viram uma linha por template
+        self.template_miner = TemplateMiner(
+            config.dedup_window,
+            config.template_similarity,
+            config.template_max_clusters,
+            config.template_cache_size
+        )
+
+        # Redacao de segredos: regras compiladas numa regex so, mensagem limpa nem passa por regex
+        self.redactor = Redactor(build_rules(config.redaction_rules, config.redaction_custom_rules))
+
+        # Limite por linha de codigo aplicado pelo discord_sink (0 desliga), o resumo do que foi barrado sai no flush
+        self.site_limiter: Optional[CallSiteLimiter] = None
+        if config.callsite_rate > 0:
+            self.site_limiter = CallSiteLimiter(config.callsite_rate, config.callsite_burst, config.callsite_max_sites, self._on_site_suppressed)
+        self._suppressed_sites: Dict[str, List[CallSite]] = {} # fila -> sites com resumo pendente
+
+        # Resumo periodico (top-K por level e logger) de tudo que passou pelas filas, memoria fixa
+        self.digest: Optional[Digest] = None
+        if config.digest_interval > 0:
+            self.digest = Digest(config.digest_top_k, config.digest_sketch_width, config.digest_sketch_depth)
+
+        # Stack traces formatados/sanitizados pelo fingerprint da exception, cada crash diferente e formatado uma vez
+        self.trace_cache = TraceCache(config.trace_cache_size)
+
+        self.rate_limiting = IntelligentRateLimiter(
+            config.max_requests_per_window, 
+            config.rate_limit_window,
+            config.emergency_cooldown,
+            config.rate_limit_mode,
+            config.verbose
+        )
+
+        # Payloads que falharam esperam a proxima tentativa num heap de timers, fora do caminho dos workers
+        self.retry_scheduler = RetryScheduler(
+            self._resubmit,
+            config.max_retries,
+            config.retry_base_delay,
+            config.retry_max_delay,
+            config.retry_max_age,
+            config.retry_max_pending
+        )
+
+        self.metrics = MetricsRegistry()
+        self._setup_metrics()
+
+    def _setup_metrics(self):
+        """
+        Registra as metricas e guarda as referencias usadas no caminho quente (sem lookup por registro).
+        """
+
+        metrics = self.metrics
+        self._m_enqueued = {
+            level: metrics.counter("enqueued_total", "Registros enfileirados", level=level)
+            for level in ('INFO', 'ERROR', 'CRITICAL')
+        }
+        self._m_deduped = {queue_type: metrics.counter("deduped_total", "Registros suprimidos pela deduplicacao", queue=queue_type) for queue_type in self.queues}
+        self._m_sent = metrics.counter("payloads_sent_total", "Payloads entregues no discord")
+        self._m_failed = metrics.counter("payloads_failed_total", "Payloads que falharam no envio")
+        self._m_fallback = metrics.counter("payloads_fallback_total", "Payloads salvos no spool")
+        self._m_dead_letter = metrics.counter("payloads_dead_letter_total", "Payloads recusados de vez pelo discord (dead letter)")
+        self._m_attachments = metrics.counter("attachments_total", "Lotes grandes mandados como arquivo anexo")
+        self._m_retried = {
+            outcome: metrics.counter("retries_scheduled_total", "Payloads agendados pra nova tentativa", reason=outcome)
+            for outcome in (RETRY, RATE_LIMITED, CIRCUIT_OPEN)
+        }
+        self._m_retry_exhausted = metrics.counter("retries_exhausted_total", "Payloads que desistiram de tentar (tentativas ou idade esgotadas)")
+        self._m_post_latency = metrics.histogram("post_seconds", "Duracao de cada POST no discord")
+        self._m_delivery_latency = metrics.histogram("delivery_latency_seconds", "Do enqueue do registro mais antigo do lote ate a entrega")
+
+        for queue_type, queue in self.queues.items():
+            metrics.gauge("queue_depth", "Registros esperando na fila", fn=queue.qsize, queue=queue_type)
+        metrics.gauge("webhooks_in_cooldown", "Webhooks em cooldown de rate limit", fn=self._webhooks_in_cooldown)
+        metrics.gauge("sender_pending", "Payloads esperando nos workers de entrega", fn=lambda: sum(sender.pending for sender in self.senders.values()))
+        metrics.gauge("spool_pending", "Registros no buffer do spool ainda nao gravados", fn=lambda: self.spool.pending)
+        metrics.gauge("retry_pending", "Payloads esperando nova tentativa", fn=lambda: self.retry_scheduler.pending)
+        metrics.gauge("trace_cache_hits", "Stack traces reaproveitados do cache", fn=lambda: self.trace_cache.hits)
+        metrics.gauge("trace_cache_misses", "Stack traces formatados (crash novo)", fn=lambda: self.trace_cache.misses)
+        metrics.gauge("redaction_skipped", "Mensagens liberadas pelo pre-filtro da redacao sem regex", fn=lambda: self.redactor.skipped)
+        metrics.gauge("redaction_scanned", "Mensagens que passaram pelo scanner da redacao", fn=lambda: self.redactor.scanned)
+        if self.site_limiter is not None:
+            limiter = self.site_limiter
+            metrics.gauge("callsite_suppressed", "Registros barrados pelo limite por linha de codigo", fn=lambda: limiter.suppressed_total)
+            metrics.gauge("callsite_tracked", "Linhas de codigo no LRU do limite", fn=lambda: len(limiter))
+        self._m_circuit_rejected = metrics.counter("circuit_rejected_total", "Payloads mandados pro spool com o circuito aberto")
+        if self.digest is not None:
+            metrics.gauge("digest_window_records", "Registros contados na janela atual do resumo", fn=lambda: self.digest.total)
+        metrics.gauge("webhooks_circuit_open", "Webhooks com o circuit breaker aberto", fn=lambda: sum(1 for breaker in self.breakers.values() if breaker.state == OPEN))
+
+    def _webhooks_in_cooldown(self) -> int:
+        now = time.monotonic()
+        return sum(1 for until in self.rate_limiting.webhook_cooldowns.values() if until > now)
+
+    def _log(self, message: str):
+        """
+        Mensagens informativas do dia a dia, so aparecem com verbose (o resto ta nas metricas). Erros continuam com print.
+        """
+
+        if self.config.verbose:
+            print(message)
+
+    async def __aenter__(self):
+
+        self.running = True
+        self.loop = asyncio.get_running_loop()
+
+        self._log(f"🚀 Iniciando sistema de logs.")
+
+        previous_segments = await self.loop.run_in_executor(None, self.spool.open)
+        self.spool.start()
+        await self.loop.run_in_executor(None, self.dead_letter.open, False)
+        self.dead_letter.start()
+
+        self.flush_task = asyncio.create_task(self._periodic_flush())
+        self.retry_scheduler.start()
+
+        if self.digest is not None:
+            self.digest_task = asyncio.create_task(self._digest_loop())
+
+        if previous_segments and self.config.spool_replay:
+            self.replay_task = asyncio.create_task(self._replay_spool(previous_segments))
+
+        if self.config.metrics_port:
+            await self.metrics.start_server(self.config.metrics_host, self.config.metrics_port)
+
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+            self._log("🛑 Parando sistema de logs...")
+            await self.stop()
+            await self.metrics.stop_server()
+
+            if self.session: # Fecha sessao httpx
+                await self.session.aclose()           
+    
+    def _create_session(self) -> "httpx.AsyncClient":
+        """
+        Cria o cliente httpx com pool de conexoes/keep-alive ajustado pros workers de entrega.
+        """
+
+        import httpx
+
+        http2 = self.config.http2
+        if http2 and importlib.util.find_spec("h2") is None:
+            print("⚠️ HTTP/2 pedido mas o pacote h2 nao ta instalado (pip install httpx[http2]), usando HTTP/1.1")
+            http2 = False
+
+        limits = httpx.Limits(
+            max_connections=self.config.http_max_connections,
+            max_keepalive_connections=self.config.http_max_keepalive,
+            keepalive_expiry=self.config.http_keepalive_expiry
+        )
+        return httpx.AsyncClient(timeout=30.0, limits=limits, http2=http2)
+
+    def _sender_for(self, webhook_url: str) -> WebhookSender:
+        sender = self.senders.get(webhook_url)
+        if sender is None:
+            sender = WebhookSender(
+                webhook_url,
+                self._send_discord_payload,
+                self._fallback_to_file,
+                self.config.max_in_flight_per_webhook,
+                self.config.sender_queue_size,
+                self._on_delivered,
+                self._schedule_retry
+            )
+            sender.start()
+            self.senders[webhook_url] = sender
+        return sender
+
+    @staticmethod
+    def _webhook_label(webhook_url: str) -> str:
+        """
+        Id da webhook pra mostrar (metricas, circuit_states), a URL tem o token.
+        """
+
+        match = re.search(r'/webhooks/([^/]+)/', webhook_url)
+        return match.group(1) if match else webhook_url.rsplit("/", 1)[-1][:8]
+
+    def _breaker_for(self, webhook_url: str) -> CircuitBreaker:
+        breaker = self.breakers.get(webhook_url)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                self.config.circuit_failure_threshold,
+                self.config.circuit_window_size,
+                self.config.circuit_min_requests,
+                self.config.circuit_open_seconds,
+                self.config.circuit_max_open_seconds
+            )
+            self.breakers[webhook_url] = breaker
+            self.metrics.gauge("circuit_open", "1 com o circuit breaker da webhook aberto", fn=lambda: float(breaker.state == OPEN),
+                               webhook=self._webhook_label(webhook_url))
+        return breaker
+
+    def circuit_states(self) -> Dict[str, dict]:
+        """
+        Estado do circuit breaker de cada webhook ja usada, pelo id da webhook.
+        """
+
+        return {self._webhook_label(url): breaker.snapshot() for url, breaker in self.breakers.items()}
+
+    def _webhook_load(self, webhook_url: str) -> float:
+        """
+        Carga de uma webhook pro least_loaded: payloads esperando no worker menos o budget livre no rate limiter.
+        Webhook com o circuito aberto so e escolhida se todas da rota estiverem.
+        """
+
+        breaker = self.breakers.get(webhook_url)
+        if breaker is not None and breaker.rejecting():
+            return float("inf")
+
+        sender = self.senders.get(webhook_url)
+        pending = sender.pending if sender else 0
+        return pending - self.rate_limiting.available(webhook_url)
+
+    def _webhook_for(self, queue_type: str) -> Optional[str]:
+        route = self.router.by_name.get(queue_type)
+        if route is None:
+            return None
+        return self.router.least_loaded(route, self._webhook_load)
+
+    def _on_delivered(self, queue_type: str, created_at: Optional[float]):
+        if created_at is not None:
+            self._m_delivery_latency.observe(time.time() - created_at)
+
+    async def _schedule_retry(self, webhook_url: str, payload: dict, queue_type: str, created_at: Optional[float],
+                              retry: Optional[RetryEntry], outcome: str) -> bool:
+        """
+        Chamada pelo worker quando um envio falha. Agenda a proxima tentativa (429 so depois do cooldown
+        da webhook, circuito aberto so depois do probe), retorna False quando o payload deve ir pro spool.
+        Recusa definitiva (FAILED: 400/413, ou circuito aberto por 401/403/404) vai pro dead letter e conta como
+        tratada (True), nao pro spool. Circuito aberto por falha passageira espera o probe na memoria
+        (ate RETRY_MAX_AGE / RETRY_MAX_PENDING) e sai assim que a webhook volta, sem esperar reiniciar.
+        """
+
+        if outcome == FAILED:
+            self._dead_letter(payload, queue_type, "failed")
+            return True
+
+        not_before = self.rate_limiting.cooldown_remaining(webhook_url)
+        if outcome == CIRCUIT_OPEN:
+            breaker = self._breaker_for(webhook_url)
+            if breaker.permanent:
+                self._dead_letter(payload, queue_type, f"circuit_open: {breaker.last_error or 'erro permanente'}")
+                return True
+            # Meio aberto com o probe no ar: volta logo pra ver se ele fechou o circuito
+            not_before = max(not_before, breaker.probe_in())
+
+        if retry is None:
+            retry = RetryEntry(webhook_url, payload, queue_type, created_at, time.monotonic())
+
+        if self.retry_scheduler.schedule(retry, outcome, not_before):
+            self._m_retried[outcome].inc()
+            return True
+
+        if outcome in (RETRY, RATE_LIMITED, CIRCUIT_OPEN) and self.retry_scheduler.running:
+            self._m_retry_exhausted.inc()
+            print(f"❌ Payload de {queue_type} desistiu apos {retry.attempts + 1} tentativa(s), salvo no spool")
+        return False
+
+    async def _resubmit(self, retry: RetryEntry):
+        """
+        Hora da nova tentativa: devolve o payload pro worker da webhook, que envia junto com os outros.
+        """
+
+        if self._breaker_for(retry.webhook_url).rejecting():
+            if not await self._schedule_retry(retry.webhook_url, retry.payload, retry.queue_type, retry.created_at, retry, CIRCUIT_OPEN):
+                self._m_circuit_rejected.inc()
+                await self._fallback_to_file(retry.payload, retry.queue_type)
+            return
+
+        if not self._sender_for(retry.webhook_url).submit(retry.payload, retry.queue_type, retry.created_at, retry):
+            await self._fallback_to_file(retry.payload, retry.queue_type)
+
+    async def _dispatch(self, webhook_url: str, payload: dict, queue_type: str, created_at: Optional[float] = None):
+        """
+        Entrega o payload pro worker da webhook sem esperar o envio, se a fila do worker ta cheia vai pro spool.
+        Com o circuito aberto espera o probe no agendador de retry (ou vai pro spool, ver _schedule_retry).
+        created_at: timestamp do registro mais antigo do payload, pra medir a latencia de entrega
+        """
+
+        if self._breaker_for(webhook_url).rejecting():
+            if not await self._schedule_retry(webhook_url, payload, queue_type, created_at, None, CIRCUIT_OPEN):
+                self._m_circuit_rejected.inc()
+                await self._fallback_to_file(payload, queue_type)
+            return
+
+        if not self._sender_for(webhook_url).submit(payload, queue_type, created_at):
+            print(f"⚠️ Fila de envio da webhook {queue_type} cheia, payload salvo no spool")
+            await self._fallback_to_file(payload, queue_type)
+
+    def _sanitize_message(self, message: str, max_length: Optional[int] = None) -> str:
+        """
+        limpa mensagem tirando informacoes importantes como senhas key, tokens, emails, cartoes etc...
+        (regras do Redactor numa passada so) e corta em max_length (padrao: config.max_message_length)
+        """
+        return self.redactor.redact(message, max_length or self.config.max_message_length)
+
+    def _format_stack_trace(self, stack_trace: str) -> str:
+            """
+            Formata stack trace removendo patch completos
+            """
+
+            if not stack_trace:
+                return "N/A"
+
+            return STACK_PATH_RE.sub(r'/.../\1', stack_trace)
+  
+    def _split_message(self, content: str, max_length: int = 1900) -> list[str]:
+        """
+        Divide mensagem em ate 1900 caracteres, tamanho maximo do dc.
+        Junta as linhas com join no fim de cada chunk (custo linear, sem += de string).
+        """
+
+        if max_length > 1900: 
+            print(f"Tamanho maximo atingido")
+
+        chunks = []
+        current_lines = []
+        current_length = 0
+
+        for line in content.split('\n'):
+            # verifica se a chunk atual ja bateu limite
+            if current_length + len(line) + 1 > max_length:
+                if current_lines:
+                    chunks.append("\n".join(current_lines).strip())
+                    current_lines = []
+                    current_length = 0
+
+                while len(line) > max_length:
+                    chunks.append(line[:max_length])
+                    line = line[max_length:]
+
+            current_length += len(line) + (1 if current_lines else 0)
+            current_lines.append(line)
+
+        if current_lines:
+            chunk = "\n".join(current_lines).strip()
+            if chunk:
+                chunks.append(chunk)
+
+        return chunks
+
+    @staticmethod
+    def _spool_payload(spool: DiskSpool, payload: dict, queue_type: str, reason: Optional[str] = None):
+        attachment = payload.get(ATTACHMENT_KEY)
+        if attachment is not None:
+            # O arquivo temporario nao vai pro JSON, o texto do anexo vai no lugar
+            payload = {key: value for key, value in payload.items() if key != ATTACHMENT_KEY}
+            payload["attachment"] = attachment.to_spool()
+            attachment.close()
+
+        spool.append_payload(queue_type, payload, time.time(), reason)
+
+    async def _fallback_to_file(self, payload: dict, queue_type: str):
+        """Salva o payload no spool em disco em caso de erro extremo, e reenviado na proxima inicializacao"""
+
+        try:
+            self._spool_payload(self.spool, payload, queue_type)
+            self._m_fallback.inc()
+            self._log(f"💾 Fallback salvo no spool: {queue_type}")
+        except Exception as er:
+            print(f"🔥 CRÍTICO - Falha no fallback: {er}")
+
+    def _dead_letter(self, payload: dict, queue_type: str, reason: str):
+        """
+        Payload que o discord recusou de vez: vai pro dead letter, que nao e reenviado na inicializacao.
+        """
+
+        try:
+            self._spool_payload(self.dead_letter, payload, queue_type, reason)
+            self._m_dead_letter.inc()
+            print(f"☠️ Payload de {queue_type} recusado ({reason}), salvo em {self.dead_letter.directory}")
+        except Exception as er:
+            print(f"🔥 CRÍTICO - Falha no dead letter: {er}")
+
+    def _render_trace(self, record: DiscordRecord, fingerprint: Optional[str]) -> Optional[str]:
+        """
+        Stack trace do registro formatado e sanitizado, os frames vem do cache quando o crash ja foi visto.
+        A linha "Tipo: mensagem" e sempre a deste registro, o cache guarda so os frames.
+        """
+
+        frames = self.trace_cache.get(fingerprint) if fingerprint is not None else None
+        if frames is not None:
+            line = record.exception_line()
+            record.exception = None # Nao vai precisar formatar, libera os frames
+        else:
+            line, stack_frames = record.split_trace()
+            if not line and not stack_frames:
+                return None
+
+            frames = self._sanitize_message(self._format_stack_trace(stack_frames), self.config.max_stack_trace_length)
+            if fingerprint is not None:
+                self.trace_cache.put(fingerprint, frames)
+
+        if not line:
+            return frames
+        return f"{self._sanitize_message(line, self.config.max_stack_trace_length)}\n{frames}"
+
+    def _on_site_suppressed(self, site: CallSite):
+        """
+        Chamada pelo CallSiteLimiter no primeiro registro barrado de um site, de qualquer thread.
+        """
+
+        if self.loop is None:
+            return
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if running_loop is self.loop:
+            self._note_suppressed(site)
+        else:
+            try:
+                self.loop.call_soon_threadsafe(self._note_suppressed, site)
+            except RuntimeError: # Loop fechado
+                pass
+
+    def _note_suppressed(self, site: CallSite):
+        """
+        Guarda o site pro resumo e arma o flush da fila dele, mesmo que nada mais chegue nela.
+        """
+
+        if site.queue_type is None:
+            # Mesma rota que os registros do site teriam (level e logger)
+            site.queue_type = self.router.route_for(DiscordRecord("", site.level, 0.0, name=site.name)).name
+
+        self._suppressed_sites.setdefault(site.queue_type, []).append(site)
+        if self._oldest[site.queue_type] is None:
+            self._oldest[site.queue_type] = time.monotonic()
+            self._flush_event.set()
+
+    def _site_summaries(self, queue_type: str) -> List[str]:
+        """
+        Uma linha por call site que foi limitado desde o ultimo flush dessa fila.
+        """
+
+        sites = self._suppressed_sites.pop(queue_type, None)
+        if not sites:
+            return []
+
+        lines = []
+        for site in sites:
+            suppressed = self.site_limiter.take(site)
+            if suppressed and self.digest is not None:
+                self.digest.observe_count(site.level, site.name, site.message, suppressed)
+            if suppressed:
+                lines.append(f"🔇 {site.label} suprimiu {suppressed} registro(s) acima do limite por linha")
+        return lines
+
+    def _dropped_summary(self, dropped: Dict[str, int]) -> str:
+        """
+        Uma linha so com tudo que foi descartado por sobrecarga desde o ultimo flush.
+        """
+
+        total = sum(dropped.values())
+        per_level = ", ".join(f"{level}: {count}" for level, count in sorted(dropped.items()))
+        return f"⚠️ {total} mensagem(ns) descartada(s) por sobrecarga ({per_level})"
+
+    def _group_lines(self, level_lines: List[tuple]) -> List[str]:
+        """
+        Agrupa as linhas do lote por template, recebe (level, timestamp, mensagem ja sanitizada).
+        Template com uma mensagem so sai como a linha original, com mais sai uma linha com o total e alguns valores.
+        """
+
+        if not self.config.template_grouping:
+            return [f"[{time.strftime('%H:%M:%S', time.localtime(ts))}] {message}" for _, ts, message in level_lines]
+
+        now = time.monotonic()
+        self.template_miner.expire(now)
+
+        groups: Dict[int, list] = {} # id do template -> [template, timestamp, primeira mensagem, total, amostras]
+        for level, ts, message in level_lines:
+            cluster, values = self.template_miner.add(message, level, now)
+            group = groups.get(cluster.id)
+            if group is None:
+                groups[cluster.id] = [cluster, ts, message, 1, [values]]
+                continue
+
+            group[3] += 1
+            if len(group[4]) < self.config.template_samples:
+                group[4].append(values)
+
+        lines = []
+        for cluster, ts, message, count, samples in groups.values():
+            timestamp = time.strftime('%H:%M:%S', time.localtime(ts))
+            if count == 1:
+                lines.append(f"[{timestamp}] {message}")
+                continue
+
+            examples = " | ".join(", ".join(values) for values in samples if values)
+            line = f"[{timestamp}] {cluster.template} (x{count})"
+            lines.append(f"{line} ex: {examples}" if examples else line)
+        return lines
+
+    async def _replay_spool(self, segments: List[str]):
+        """
+        Reenvia o que ficou no spool de execucoes anteriores. Registros voltam pra fila normal,
+        payloads ja montados sao enviados direto. O segmento nao e apagado aqui: as entradas ainda tao nas
+        filas/workers, nao entregues. Ele fica travado ate o stop, que grava no spool atual o que nao foi
+        entregue e so depois apaga os segmentos reenviados inteiros. Se o processo cair antes disso o segmento
+        e reenviado de novo na proxima inicializacao (pelo menos uma vez, pode duplicar).
+        """
+
+        replayed = 0
+        for path in segments:
+            try:
+                entries = await self.loop.run_in_executor(None, DiskSpool.load_segment, path)
+            except OSError as er:
+                print(f"❌ Erro lendo segmento {path}: {er}")
+                continue
+
+            for entry in entries:
+                if entry.get("kind") == "record":
+                    self.enqueue_nowait(entry["message"], entry["level"], stack_trace=entry.get("stack_trace"),
+                                        timestamp=entry["timestamp"], name=entry.get("name"))
+                else:
+                    queue_type = entry.get("queue_type", "ERROR")
+                    payload = entry["payload"]
+                    if "attachment" in payload:
+                        payload[ATTACHMENT_KEY] = PayloadAttachment.from_spool(payload.pop("attachment"), self.config.attachment_memory_limit)
+                    webhook_url = self._webhook_for(queue_type)
+
+                    if webhook_url:
+                        await self._dispatch(webhook_url, payload, queue_type)
+                    else:
+                        await self._fallback_to_file(payload, queue_type)
+                replayed += 1
+
+            self.spool.mark_replayed(path)
+
+        if replayed:
+            self._log(f"♻️ {replayed} entradas do spool reenviadas")
+
+    async def _send_discord_payload(self, webhook_url: str, payload: dict) -> str:
+        """
+        Funcao que envia para o discord os payloads, integrada com rate limite inteligente.
+        Faz uma tentativa so e retorna o resultado (SENT, RETRY, RATE_LIMITED, FAILED ou CIRCUIT_OPEN), quem chama decide
+        se tenta de novo (os workers usam o agendador de retry, sem segurar o resto da fila esperando backoff).
+        Com o circuit breaker da webhook aberto retorna CIRCUIT_OPEN sem nenhum I/O.
+        """
+
+        breaker = self._breaker_for(webhook_url)
+        if not breaker.allow():
+            self._m_circuit_rejected.inc()
+            return CIRCUIT_OPEN
+
+        try:
+            # Espera o tempo exato que o limiter pede em vez de desistir na hora
+            allowed = await self.rate_limiting.wait_until_allowed(webhook_url, self.config.max_rate_limit_wait)
+            if not allowed:
+                self._log(f"Rate limite ativo por mais de {self.config.max_rate_limit_wait:.1f}s")
+                breaker.record_neutral()
+                self._m_failed.inc()
+                return RATE_LIMITED
+
+            if self.session is None: # Sessao httpx compartilhada por todos os workers, aberta so quando precisa
+                self.session = self._create_session()
+
+            started = time.perf_counter()
+            attachment = payload.get(ATTACHMENT_KEY)
+            if attachment is None:
+                response = await self.session.post(webhook_url, json=payload)
+            else:
+                # Multipart: o httpx le o arquivo em pedacos, o lote nao vira uma string so
+                response = await self.session.post(webhook_url, **attachment.request_kwargs(payload))
+            self._m_post_latency.observe(time.perf_counter() - started)
+            await self.rate_limiting.update_from_headers(webhook_url, response.headers)
+
+            if response.status_code == 429:
+                retry_after = response.headers.get('retry-after')
+                if retry_after:
+                    await self.rate_limiting.apply_cooldown(webhook_url, retry_after)
+                else:
+                    await self.rate_limiting.apply_cooldown(webhook_url)
+
+                breaker.record_neutral()
+                self._m_failed.inc()
+                return RATE_LIMITED
+
+            if response.status_code >= 500:
+                self._log(f"Discord respondeu {response.status_code}, nova tentativa agendada")
+                breaker.record_failure(response.status_code)
+                self._m_failed.inc()
+                return RETRY
+
+            if response.status_code >= 400:
+                print(f"Erro no envio discord: {response.status_code} {response.text[:200]}")
+                if response.status_code in PERMANENT_STATUS:
+                    # Webhook apagada ou token invalido: abre o circuito, o resto vai pro spool sem I/O
+                    breaker.record_failure(response.status_code, response.text[:200])
+                    print(f"🔌 Circuito da webhook {self._webhook_label(webhook_url)} aberto ({response.status_code})")
+                else:
+                    breaker.record_neutral() # Payload ruim (400/413), a webhook ta bem
+                self._m_failed.inc()
+                return FAILED
+
+            await self.rate_limiting.record_request(webhook_url)
+            breaker.record_success()
+            release(payload)
+
+            self._m_sent.inc()
+            return SENT
+        except Exception as er:
+            # Timeout e erro de conexao do httpx, passageiros
+            self._log(f"Erro no envio discord: {er!r}")
+            breaker.record_failure(None, repr(er))
+
+        self._m_failed.inc()
+        return RETRY
+
+    async def _flush_queue(self, queue_type: str):
+        """
+        Processsa todos os itens de uma fila especifica.
+        Basicamente e o coracao de toda classe aqui e onde o sistema coleta todas as mensagens aplica deduplicacao, agrupa as mensagem, envia criticas individualmente e divide chunks muito longas
+        """
+
+        # Desarma os prazos do agendador antes de tudo, senao uma fila sem webhook ficaria sempre "pronta"
+        self._oldest[queue_type] = None
+        self._critical_due[queue_type] = None
+
+        route = self.router.by_name[queue_type]
+
+        # Antes do teste da webhook: os sites limitados entram no resumo periodico mesmo sem webhook na rota
+        site_lines = self._site_summaries(queue_type)
+
+        if not route.webhooks: # Se nao tiver webhook pra essa rota
+            return
+        
+        queue = self.queues[queue_type]
+        messages = queue.drain() # CRITICAL primeiro, depois ERROR/INFO, cada level em ordem de chegada
+        dropped = queue.take_dropped()
+
+        if self.digest is not None and dropped:
+            self.digest.observe_dropped(dropped)
+
+        if not messages and not dropped and not site_lines:
+            return # Nao tem nd pra processar
+
+        # Registro mais antigo do lote, base da latencia de entrega
+        created_at = min(record.timestamp for record in messages) if messages else None
+
+        # Deduplica o lote inteiro de uma vez so
+        with self.metrics.timer("flush_stage_seconds", stage="dedup"):
+            unique_messages = await self.deduplicator.filter_duplicates(messages)
+        suppressed = len(messages) - len(unique_messages)
+        if suppressed:
+            self._m_deduped[queue_type].inc(suppressed)
+            self._log(f" - {suppressed} mensagem(ns) duplicada(s) suprimida(s) em {queue_type}")
+
+        # Rota com hash divide o lote por webhook antes de montar os payloads, o resumo de descarte vai na primeira parte
+        for idx, (webhook_url, records) in enumerate(self.router.partition(route, unique_messages)):
+            payloads = self._build_payloads(queue_type, records, dropped if idx == 0 else None, site_lines if idx == 0 else None)
+
+            # Os workers da webhook enviam em paralelo com as outras webhooks, sem sleeps fixos (o rate limiter que dita o ritmo)
+            with self.metrics.timer("flush_stage_seconds", stage="send"):
+                for payload in payloads:
+                    # Webhook do hash com o circuito aberto: usa outra da rota se tiver
+                    target = webhook_url
+                    if target is None or (len(route.webhooks) > 1 and self._breaker_for(target).rejecting()):
+                        target = self.router.least_loaded(route, self._webhook_load)
+                    await self._dispatch(target, payload, queue_type, created_at)
+
+    def _build_payloads(self, queue_type: str, records: List[DiscordRecord], dropped: Optional[Dict[str, int]],
+                        site_lines: Optional[List[str]] = None) -> List[dict]:
+        """
+        Sanitiza, agrupa por template e empacota os registros (ja deduplicados) de uma parte do lote.
+        site_lines: resumos do limite por linha de codigo, vao no topo junto com o de descarte
+        """
+
+        line_records = [] # Mensagens normais, info etc... agrupadas por template depois
+        # Messagens criticas, viram embeds: [mensagens (cruas), stack trace, fingerprint, vezes no lote, registros com outras mensagens]
+        criticals = []
+        crashes: Dict[str, list] = {} # fingerprint -> item de criticals, o mesmo crash vira um embed so
+
+        with self.metrics.timer("flush_stage_seconds", stage="sanitize"):
+            for record in records:
+                level = record.level
+
+                if level == "CRITICAL":
+                    fingerprint = record.fingerprint
+                    crash = crashes.get(fingerprint) if fingerprint is not None else None
+                    if crash is not None:
+                        # Mesmo crash, mas a mensagem pode ser outra (pedido, usuario): guarda as primeiras diferentes
+                        crash[3] += 1
+                        messages = crash[0]
+                        if record.message not in messages:
+                            if len(messages) < self.CRASH_MESSAGES:
+                                messages.append(record.message)
+                            else:
+                                crash[4] += 1
+                        record.exception = None
+                        continue
+
+                    # Stack trace so e formatado aqui, na hora do envio, e uma vez por crash diferente
+                    crash = [[record.message], self._render_trace(record, fingerprint), fingerprint, 1, 0]
+                    criticals.append(crash)
+                    if fingerprint is not None:
+                        crashes[fingerprint] = crash
+                else:
+                    line_records.append((level, record.timestamp, self._sanitize_message(record.message)))
+
+            critical_embeds = []
+            for messages, safe_stack, fingerprint, seen, others in criticals:
+                safe_message = "\n".join(self._sanitize_message(message) for message in messages)
+                if others:
+                    safe_message += f"\n(+{others} registro(s) com outras mensagens)"
+                total = self.trace_cache.seen(fingerprint, seen) if fingerprint is not None else 0
+                critical_embeds.append(self.packer.critical_embed(safe_message, safe_stack, seen, total))
+
+        with self.metrics.timer("flush_stage_seconds", stage="group"):
+            grouped_messages = self._group_lines(line_records)
+        if len(grouped_messages) < len(line_records):
+            self._log(f" - {len(line_records)} linhas agrupadas em {len(grouped_messages)} template(s) em {queue_type}")
+
+        # O que foi descartado vira uma linha de resumo no topo, fora da deduplicacao
+        if dropped:
+            for level, count in dropped.items():
+                self.metrics.counter("shed_total", "Registros descartados por sobrecarga", level=level).inc(count)
+            summary = self._dropped_summary(dropped)
+            self._log(f" - {summary} em {queue_type}")
+            grouped_messages.insert(0, summary)
+        if site_lines:
+            self._log(f" - {len(site_lines)} linha(s) de codigo limitada(s) em {queue_type}")
+            grouped_messages[0:0] = site_lines
+
+        if queue_type == "INFO":
+            content_header = "**ATUALIZACAO DO SISTEMA:**"
+        elif queue_type == "ERROR":
+            content_header = "**LOGS DE ERRO:**"
+        else:
+            content_header = f"**LOGS {queue_type.upper()}:**"
+
+        # Criticos e linhas empacotados juntos no menor numero de requests, lote que viraria muitos
+        # chunks de continuacao vai inteiro num arquivo anexo (os criticos continuam como embeds)
+        with self.metrics.timer("flush_stage_seconds", stage="split"):
+            if self._needs_attachment(grouped_messages):
+                payloads = self.packer.pack(critical_embeds, [], content_header)
+                payloads.append(self._attachment_payload(queue_type, grouped_messages, len(line_records), content_header))
+            else:
+                payloads = self.packer.pack(critical_embeds, grouped_messages, content_header)
+
+        # Quantas requests o jeito antigo faria: uma por critico + um chunk de 1900 por vez (linhas sem agrupar,
+        # "[HH:MM:SS] " + mensagem + quebra de linha)
+        naive_requests = sum(crash[3] for crash in criticals)
+        if line_records:
+            naive_chars = sum(len(message) + 12 for _, _, message in line_records)
+            naive_requests += -(-naive_chars // 1900)
+        saved = naive_requests - len(payloads)
+        self.requests_saved += saved
+
+        self._log(f"📦 Enviando {len(critical_embeds) + len(grouped_messages)} mensagens em {len(payloads)} request(s), economizou {saved}")
+        return payloads
+
+    def _needs_attachment(self, lines: List[str]) -> bool:
+        """
+        Se as linhas precisariam de mais de attachment_min_chunks chunks de 1900 caracteres.
+        """
+
+        limit = self.config.attachment_min_chunks
+        if not limit or not lines:
+            return False
+
+        budget = limit * PayloadPacker.LINE_LIMIT
+        used = 0
+        for line in lines:
+            used += len(line) + 1
+            if used > budget:
+                return True
+        return False
+
+    def _attachment_payload(self, queue_type: str, lines: List[str], records: int, content_header: str) -> dict:
+        """
+        Payload com as linhas num arquivo anexo e um resumo curto (total e as primeiras linhas) no content.
+        """
+
+        attachment = PayloadAttachment(
+            f"{queue_type.lower()}-{time.strftime('%Y%m%d-%H%M%S')}",
+            self.config.attachment_gzip,
+            self.config.attachment_memory_limit
+        )
+        attachment.write_lines(lines)
+        self._m_attachments.inc()
+
+        summary = f"{content_header}\n📎 {len(lines)} linha(s) de {records} registro(s) em anexo ({attachment.filename}, {attachment.raw_size / 1024:.1f} KB)"
+        preview = []
+        budget = PayloadPacker.LINE_LIMIT - len(summary) - 16
+        for line in lines[:5]:
+            line = line if len(line) <= 300 else line[:297] + "..."
+            budget -= len(line) + 1
+            if budget < 0:
+                break
+            preview.append(line)
+
+        content = f"{summary}\n```\n" + "\n".join(preview) + "\n```" if preview else summary
+        self._log(f" - {len(lines)} linhas de {queue_type} mandadas como anexo ({attachment.size} bytes)")
+        return {"content": content, ATTACHMENT_KEY: attachment}
+
+    async def _send_digest(self):
+        """
+        Manda o resumo da janela atual num embed so (DIGEST_HOOK ou a webhook de INFO) e comeca outra janela.
+        """
+
+        embed = self.digest.embed(lambda text: self._sanitize_message(text, 200), PayloadPacker.EMBED_DESCRIPTION_LIMIT)
+        self.digest.reset()
+        if embed is None:
+            return
+
+        webhook_url = self.config.digest_webhook or self._webhook_for("INFO") or self._webhook_for("ERROR")
+        if not webhook_url:
+            return
+        self._log("📊 Enviando resumo periodico")
+        await self._dispatch(webhook_url, {"embeds": [embed]}, "INFO")
+
+    async def _digest_loop(self):
+        while self.running:
+            try:
+                await asyncio.sleep(self.config.digest_interval)
+                await self._send_digest()
+            except asyncio.CancelledError:
+                break
+            except Exception as er:
+                print(f"❌ Erro no resumo periodico: {er}")
+
+    def _flush_due(self, queue_type: str, now: float) -> bool:
+        """
+        Uma fila deve ser processada quando chega no tamanho limite, quando o item mais antigo
+        passa da idade maxima ou quando tem um CRITICAL esperando.
+        """
+
+        oldest = self._oldest[queue_type]
+        if oldest is None:
+            return False
+
+        if self.queues[queue_type].qsize() >= self.config.flush_size_threshold:
+            return True
+
+        critical_due = self._critical_due[queue_type]
+        if critical_due is not None and now >= critical_due:
+            return True
+
+        return now - oldest >= self.config.flush_max_age
+
+    def _next_deadline(self) -> Optional[float]:
+        deadlines = []
+        for queue_type, oldest in self._oldest.items():
+            if oldest is None:
+                continue
+            deadlines.append(oldest + self.config.flush_max_age)
+            if self._critical_due[queue_type] is not None:
+                deadlines.append(self._critical_due[queue_type])
+        return min(deadlines) if deadlines else None
+
+    async def _periodic_flush(self):
+        """
+            Roda em segundo plano e processa as filas quando alguma fica pronta (tamanho, idade ou CRITICAL).
+            Com as filas vazias fica dormindo ate chegar mensagem, sem acordar a cada batch_interval.
+        """
+        self._log(f" - Flush adaptativo iniciado (idade maxima: {self.config.flush_max_age}s, tamanho: {self.config.flush_size_threshold})")
+
+        while self.running:
+            try:
+                now = time.monotonic()
+
+                due = [queue_type for queue_type in self.queues if self._flush_due(queue_type, now)]
+                if due:
+                    total_processed = 0
+                    for queue_type in due:
+                        queue_size = self.queues[queue_type].qsize()
+                        self._log(f"🔄 Processando fila {queue_type}: {queue_size} mensagens")
+                        total_processed += queue_size
+
+                    await asyncio.gather(*(self._flush_queue(queue_type) for queue_type in due))
+                    self._log(f"✅ Flush completo: {total_processed} mensagens processadas")
+                    continue
+
+                # Nada pronto: dorme ate o proximo prazo ou ate o enqueue acordar (None = sem prazo, fila vazia)
+                deadline = self._next_deadline()
+                timeout = None if deadline is None else max(0.0, deadline - now)
+
+                self._flush_event.clear()
+                try:
+                    await asyncio.wait_for(self._flush_event.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+
+            except asyncio.CancelledError:
+                break
+            except Exception as er:
+                print(f"❌ Erro no flush periódico: {er}")
+                #logger.error(f"Erro no flush periódico: {er}", extra={"discord_fallback": True})
+                await asyncio.sleep(1)
+
+    def enqueue_nowait(self, message: str, level: str, exception: Any = None, stack_trace: Optional[str] = None,
+                       timestamp: Optional[float] = None, name: Optional[str] = None, tags: Optional[Dict[str, Any]] = None):
+        """
+        Caminho sincrono de enfileiramento, usado direto pelo discord_sink sem criar task por registro.
+        Tem que ser chamado na thread do loop do handler. name e tags (logger e extra do loguru) escolhem a rota.
+        """
+
+        if timestamp is None:
+            timestamp = time.time()
+        self.enqueue_record(DiscordRecord(message, level, timestamp, exception, stack_trace, name, tags))
+
+    def enqueue_record(self, item: DiscordRecord):
+        """
+        Enfileira um DiscordRecord ja montado na fila da rota dele (level, logger, tags). Com a fila cheia o PriorityBuffer
+        decide o que descartar, sem I/O nem log por item (os descartes sao contados e resumidos no flush).
+        """
+
+        queue_type = self.router.route_for(item).name
+        queue = self.queues[queue_type]
+
+        # Conta antes do descarte e da deduplicacao, o resumo ve tudo que chegou (o template fica em cache)
+        if self.digest is not None:
+            self.digest.observe(item)
+
+        counter = self._m_enqueued.get(item.level)
+        if counter is None:
+            counter = self._m_enqueued[item.level] = self.metrics.counter("enqueued_total", "Registros enfileirados", level=item.level)
+        counter.inc()
+
+        if not queue.put(item) and self._oldest[queue_type] is not None:
+            return # Descartado, o prazo do flush ja ta armado
+
+        # Acorda o agendador so quando muda alguma coisa pra ele: primeiro item (arma o prazo), tamanho ou CRITICAL
+        if self._oldest[queue_type] is None:
+            self._oldest[queue_type] = time.monotonic()
+            self._flush_event.set()
+        elif queue.qsize() >= self.config.flush_size_threshold:
+            self._flush_event.set()
+
+        if item.level == 'CRITICAL' and self._critical_due[queue_type] is None:
+            self._critical_due[queue_type] = time.monotonic() + self.config.flush_critical_delay
+            self._flush_event.set()
+
+    async def enqueue_message(self, message: str, level: str, stack_trace: str = None):
+        """
+        Adiciona mensagens na fila, versao async mantida por compatibilidade (ver enqueue_nowait).
+        """
+
+        self.enqueue_nowait(message, level, stack_trace=stack_trace)
+
+    async def stop(self, deadline: Optional[float] = None) -> dict:
+        """
+        Shutdown com tempo limitado. Filas com CRITICAL/ERROR sao processadas primeiro (juntas) e as de INFO
+        depois, os workers de todas as webhooks entregam em paralelo ate deadline - SPILL_RESERVE segundos.
+        Passou disso o envio para e tudo que sobrou (filas dos workers, envios no meio, retries) vai pro spool
+        numa escrita so. Retries pendentes nao esperam o backoff, vao direto pro spool.
+            deadline: segundos pra terminar tudo, padrao config.shutdown_timeout
+        Retorna o relatorio {"delivered", "spilled", "elapsed", "deadline_hit"} (payloads), chamadas seguintes
+        retornam o mesmo relatorio.
+        """
+
+        if self.shutdown_report is not None:
+            return self.shutdown_report
+
+        started = time.monotonic()
+        if deadline is None:
+            deadline = self.config.shutdown_timeout
+        send_until = started + max(0.0, deadline - self.SPILL_RESERVE)
+
+        sent_before = self._m_sent.value
+        spilled_before = self._m_fallback.value
+
+        self.running = False
+        for task in (self.replay_task, self.flush_task, self.digest_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+
+        # Daqui pra frente nada e gravado aos poucos nem reagendado: falhou vai pro buffer do spool
+        await self.spool.pause()
+        for retry in await self.retry_scheduler.stop():
+            await self._fallback_to_file(retry.payload, retry.queue_type)
+
+        self._log("📤 Processando mensagens restantes...")
+
+        # CRITICAL/ERROR entram nas filas dos workers antes dos INFO
+        by_priority: Dict[int, List[str]] = {}
+        for queue_type, queue in self.queues.items():
+            if queue.qsize() or queue.dropped or self._suppressed_sites.get(queue_type):
+                by_priority.setdefault(queue.top_priority(), []).append(queue_type)
+        for priority in sorted(by_priority, reverse=True):
+            await asyncio.gather(*(self._flush_queue(queue_type) for queue_type in by_priority[priority]))
+
+        # Resumo parcial da janela, depois de tudo (prioridade mais baixa)
+        if self.digest is not None:
+            await self._send_digest()
+
+        # Espera os workers entregarem ate o prazo
+        deadline_hit = False
+        busy = [sender for sender in self.senders.values() if sender.pending or sender.in_flight]
+        if busy:
+            remaining = send_until - time.monotonic()
+            try:
+                if remaining <= 0:
+                    raise asyncio.TimeoutError
+                await asyncio.wait_for(asyncio.gather(*(sender.join() for sender in busy)), remaining)
+            except asyncio.TimeoutError:
+                deadline_hit = True
+
+        # Para os workers: o que tava na fila ou no meio do envio vai pro spool
+        for sender in self.senders.values():
+            await sender.stop()
+
+        # Grava o que sobrou no spool numa escrita so
+        await self.spool.stop()
+        await self.dead_letter.stop()
+
+        report = {
+            "delivered": int(self._m_sent.value - sent_before),
+            "spilled": int(self._m_fallback.value - spilled_before),
+            "elapsed": time.monotonic() - started,
+            "deadline_hit": deadline_hit,
+        }
+        self.shutdown_report = report
+
+        summary = f"{report['delivered']} payload(s) entregue(s), {report['spilled']} salvo(s) no spool em {report['elapsed']:.1f}s"
+        if report["spilled"]:
+            print(f"⚠️ Shutdown: {summary}" + (f" (prazo de {deadline:.1f}s atingido)" if deadline_hit else ""))
+        else:
+            self._log(f"✅ Shutdown: {summary}")
+        return report
+
+
+if __name__ == "__main__":
+    async def stress_test():
+        """Teste de carga pesado no sistema"""
+        from .log_config import LogConfig, load_env
+        import random
+
+        load_env()
+        config = LogConfig()
+        total_messages = 2000   
+        concurrency = 20        #
+
+        async with AsyncDiscordHandler(config) as handler:
+            print(f"=== TESTE DE CARGA: {total_messages} mensagens com {concurrency} tarefas ===")
+
+            async def worker(worker_id: int):
+                for i in range(total_messages // concurrency):
+                    level = random.choice(["INFO", "ERROR", "CRITICAL"])
+                    msg = f"[W{worker_id}] Mensagem {i} nível {level}"
+                    stack = None
+                    if level == "CRITICAL":
+                        stack = "Traceback (most recent call last):\n  File 'test.py', line 42\nException: Stress test"
+                    await handler.enqueue_message(msg, level, stack)
+                    # simula burst com pequenas pausas
+                    await asyncio.sleep(random.uniform(0.001, 0.02))
+
+            # dispara os workers
+            tasks = [asyncio.create_task(worker(i)) for i in range(concurrency)]
+            await asyncio.gather(*tasks)
+
+            print("⏳ Esperando flush final...")
+            await asyncio.sleep(config.batch_interval * 2)
+
+        print("=== TESTE COMPLETO ===")
+
+    asyncio.run(stress_test())
@@ -0,0 +1,91 @@
+import traceback
+
+from typing import Any, Dict, Optional, Tuple
+
+from .trace_cache import fingerprint_exception, fingerprint_text, split_exception_line
+
+class DiscordRecord:
+    """
+    Registro compacto que fica na fila do AsyncDiscordHandler.
+
+    Usa __slots__ pra nao ter um dict por registro, o timestamp fica como float (time.time())
+    e o stack trace so e formatado quando alguem pede (na hora do envio), nao na hora do log.
+    """
+    __slots__ = ("message", "level", "timestamp", "exception", "_stack_trace", "name", "tags", "_fingerprint")
+
+    def __init__(self, message: str, level: str, timestamp: float, exception: Any = None, stack_trace: Optional[str] = None,
+                 name: Optional[str] = None, tags: Optional[Dict[str, Any]] = None):
+        """
+            exception: tupla (type, value, traceback) do loguru (record["exception"]) ou None
+            stack_trace: stack trace ja formatado, usado quando nao tem a exception original
+            name: nome do logger/modulo (record["name"] do loguru), usado no roteamento
+            tags: extra do loguru (record["extra"]), usado no roteamento
+        """
+        self.message = message
+        self.level = level
+        self.timestamp = timestamp
+        self.exception = exception
+        self._stack_trace = stack_trace
+        self.name = name
+        self.tags = tags
+        self._fingerprint = None # None = ainda nao calculado, "" = sem exception
+
+    @property
+    def fingerprint(self) -> Optional[str]:
+        """
+        Fingerprint da exception (tipo + frames), pela exception original se ainda tiver ou pelo texto do stack trace.
+        """
+
+        if self._fingerprint is None:
+            if self.exception:
+                self._fingerprint = fingerprint_exception(self.exception)
+            elif self._stack_trace:
+                self._fingerprint = fingerprint_text(self._stack_trace) or ""
+            else:
+                self._fingerprint = ""
+        return self._fingerprint or None
+
+    @property
+    def stack_trace(self) -> Optional[str]:
+        """
+        Formata o stack trace na primeira vez que e pedido e guarda o resultado.
+        """
+
+        if self._stack_trace is None and self.exception:
+            exc_type, exc_value, exc_traceback = self.exception
+            type_name = exc_type.__name__ if exc_type else "Exception"
+            self._stack_trace = f"{type_name}: {exc_value}\n{''.join(traceback.format_tb(exc_traceback))}"
+            self.exception = None # Libera os frames do traceback
+        return self._stack_trace
+
+    def split_trace(self) -> Tuple[Optional[str], Optional[str]]:
+        """
+        (linha "Tipo: mensagem", frames) do stack trace, a linha da propria ocorrencia e os frames que o TraceCache guarda.
+        """
+
+        if self.exception:
+            exc_type, exc_value, _ = self.exception
+            type_name = exc_type.__name__ if exc_type else "Exception"
+            line = f"{type_name}: {exc_value}"
+            stack_trace = self.stack_trace
+            return line, stack_trace[len(line) + 1:]
+
+        if not self._stack_trace:
+            return None, None
+        return split_exception_line(self._stack_trace)
+
+    def exception_line(self) -> Optional[str]:
+        """
+        So a linha "Tipo: mensagem", sem formatar os frames (usado quando os frames vem do cache).
+        """
+
+        if self.exception:
+            exc_type, exc_value, _ = self.exception
+            type_name = exc_type.__name__ if exc_type else "Exception"
+            return f"{type_name}: {exc_value}"
+        if self._stack_trace:
+            return split_exception_line(self._stack_trace)[0]
+        return None
+
+    def __repr__(self) -> str:
+        return f"DiscordRecord(level={self.level!r}, timestamp={self.timestamp!r}, message={self.message!r})"
@@ -0,0 +1,310 @@
+import asyncio
+import json
+import os
+import struct
+import threading
+import uuid
+import zlib
+
+from collections import deque
+from typing import Deque, Dict, Iterator, List, Optional, Set, Tuple
+
+try:
+    import fcntl
+except ImportError: # Windows: sem lock, um spool por processo
+    fcntl = None
+
+# Cada registro no segmento: 4 bytes de tamanho + 4 bytes de crc32 (big endian) + JSON
+RECORD_HEADER = struct.Struct("!II")
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".spool"
+DEAD_LETTER_DIR = "dead" # Subdiretorio do spool com o que o discord recusou de vez, nunca reenviado sozinho
+
+class DiskSpool:
+    """
+    Spool em disco para o que nao conseguiu ser entregue no discord.
+
+    Os registros ficam em arquivos de segmento append-only com checksum, o append so coloca
+    no buffer em memoria (pode ser chamado de qualquer thread) e a escrita acontece em lote
+    fora do event loop. Quando o segmento passa de segment_size ele e fechado e um novo e aberto.
+    Segmentos que sobraram de uma execucao anterior sao devolvidos pelo open() pra serem reenviados.
+
+    Varios processos podem dividir o mesmo diretorio (workers do gunicorn + coletor): cada um escreve nos
+    seus segmentos (segment-{pid}-{id}-{indice}.spool) com flock no que ta aberto, e o open() so pega os
+    segmentos que ninguem ta segurando, travando cada um ate o close. Sem fcntl (Windows) nao tem lock.
+    """
+
+    def __init__(self, directory: str = "logs/spool", segment_size: int = 4 * 1024 * 1024, flush_interval: float = 1.0):
+        self.directory = directory
+        self.segment_size = segment_size
+        self.flush_interval = flush_interval
+
+        self._buffer: Deque[bytes] = deque()
+        self._write_lock = threading.Lock() # Protege o arquivo, o deque ja e thread safe
+        self._owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._segment_index = 0
+        self._segment_path: Optional[str] = None
+        self._segment_file = None
+        self._segment_bytes = 0
+
+        self._claimed: Dict[str, object] = {} # Segmentos antigos travados por esse processo -> arquivo com o lock
+        self._replayed: Set[str] = set() # Claimed ja reenviados, apagados no close
+
+        self.running = False
+        self.flush_task: Optional[asyncio.Task] = None
+
+    def _segment_name(self, index: int) -> str:
+        return os.path.join(self.directory, f"{SEGMENT_PREFIX}{self._owner}-{index:08d}{SEGMENT_SUFFIX}")
+
+    @staticmethod
+    def _try_lock(f) -> bool:
+        if fcntl is None:
+            return True
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError: # BlockingIOError: outro processo segura
+            return False
+
+    @staticmethod
+    def is_locked(path: str) -> bool:
+        """
+        True se algum processo ta escrevendo ou reenviando o segmento.
+        """
+
+        if fcntl is None:
+            return False
+        try:
+            with open(path, "rb") as f:
+                if not DiskSpool._try_lock(f):
+                    return True
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                return False
+        except FileNotFoundError:
+            return True
+
+    def _list_segments(self) -> List[str]:
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+
+        segments = [
+            name for name in names
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)
+        ]
+        return [os.path.join(self.directory, name) for name in sorted(segments)]
+
+    def _claim_segments(self) -> List[str]:
+        """
+        Trava os segmentos que ninguem ta segurando (sobras de processos que ja terminaram), mais antigos primeiro.
+        """
+
+        claimed = []
+        for path in self._list_segments():
+            try:
+                f = open(path, "rb")
+            except FileNotFoundError:
+                continue
+            try:
+                # Travou mas o arquivo foi apagado/trocado por quem reenviou antes: nao e mais spool de ninguem
+                if not self._try_lock(f) or os.fstat(f.fileno()).st_ino != os.stat(path).st_ino:
+                    f.close()
+                    continue
+            except FileNotFoundError:
+                f.close()
+                continue
+            self._claimed[path] = f
+            claimed.append(path)
+
+        claimed.sort(key=lambda path: os.fstat(self._claimed[path].fileno()).st_mtime)
+        return claimed
+
+    def _open_segment(self):
+        self._segment_index += 1
+        self._segment_path = self._segment_name(self._segment_index)
+        self._segment_file = open(self._segment_path, "ab")
+        self._try_lock(self._segment_file) # Nome unico do processo, o lock so avisa os outros que ta em uso
+        self._segment_bytes = self._segment_file.tell()
+
+    def open(self, claim: bool = True) -> List[str]:
+        """
+        Abre um segmento novo pra essa execucao e retorna os segmentos antigos (ainda nao entregues) que
+        esse processo travou. Eles continuam travados e no disco ate o close, quem reenvia chama mark_replayed.
+        Faz I/O, quem ta no loop deve chamar via executor.
+            claim: False so abre o segmento novo, os antigos ficam como estao (dead letter, que nao e reenviado)
+        """
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        previous = self._claim_segments() if claim else []
+
+        with self._write_lock:
+            self._open_segment()
+        return previous
+
+    def mark_replayed(self, path: str):
+        """
+        Segmento antigo todo reenviado: e apagado no close, depois do que nao foi entregue ter sido gravado de
+        novo no segmento atual. Se o processo cair antes disso ele continua no disco e e reenviado de novo
+        (pelo menos uma vez, pode duplicar).
+        """
+
+        self._replayed.add(path)
+
+    def append(self, entry: dict):
+        """
+        Coloca uma entrada no buffer, nao faz I/O. Pode ser chamado de qualquer thread.
+        """
+
+        body = json.dumps(entry, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self._buffer.append(RECORD_HEADER.pack(len(body), zlib.crc32(body)) + body)
+
+    def append_payload(self, queue_type: str, payload: dict, timestamp: float, reason: Optional[str] = None):
+        entry = {"kind": "payload", "queue_type": queue_type, "payload": payload, "timestamp": timestamp}
+        if reason:
+            entry["reason"] = reason # Dead letter: por que o discord recusou
+        self.append(entry)
+
+    def append_record(self, message: str, level: str, timestamp: float, stack_trace: Optional[str] = None, name: Optional[str] = None):
+        self.append({"kind": "record", "message": message, "level": level, "timestamp": timestamp, "stack_trace": stack_trace, "name": name})
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def flush(self):
+        """
+        Escreve tudo que ta no buffer de uma vez so e roda o segmento se passou do tamanho.
+        Faz I/O bloqueante, quem ta no loop deve usar o flush_async.
+        """
+
+        with self._write_lock:
+            if self._segment_file is None:
+                return
+
+            while self._buffer:
+                chunk = []
+                size = 0
+                while self._buffer and self._segment_bytes + size < self.segment_size:
+                    data = self._buffer.popleft()
+                    chunk.append(data)
+                    size += len(data)
+
+                if chunk:
+                    self._segment_file.write(b"".join(chunk))
+                    self._segment_file.flush()
+                    self._segment_bytes += size
+
+                if self._segment_bytes >= self.segment_size:
+                    self._segment_file.close()
+                    self._open_segment()
+
+    async def flush_async(self):
+        if not self._buffer:
+            return
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self.flush)
+        except RuntimeError: # Executor ja fechado
+            self.flush()
+
+    async def _periodic_flush(self):
+        while self.running:
+            try:
+                await asyncio.sleep(self.flush_interval)
+                await self.flush_async()
+            except asyncio.CancelledError:
+                break
+            except Exception as er:
+                print(f"🔥 CRÍTICO - Falha ao gravar spool: {er}")
+
+    def start(self):
+        self.running = True
+        self.flush_task = asyncio.create_task(self._periodic_flush())
+
+    async def pause(self):
+        """
+        Para a gravacao periodica: o que entrar no buffer daqui pra frente so e gravado no stop, numa escrita so.
+        """
+
+        self.running = False
+        if self.flush_task:
+            self.flush_task.cancel()
+            try:
+                await self.flush_task
+            except asyncio.CancelledError:
+                pass
+            self.flush_task = None
+
+    async def stop(self):
+        self.running = False
+        if self.flush_task:
+            self.flush_task.cancel()
+            try:
+                await self.flush_task
+            except asyncio.CancelledError:
+                pass
+
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self.close)
+        except RuntimeError:
+            # Executor ja fechado (interpretador terminando): grava aqui mesmo, bloquear o loop e melhor que perder o spool
+            self.close()
+
+    def close(self):
+        self.flush()
+        with self._write_lock:
+            if self._segment_file is None:
+                return
+
+            self._segment_file.close()
+            self._segment_file = None
+            # Segmento vazio nao precisa ficar pra proxima execucao
+            if self._segment_bytes == 0:
+                os.unlink(self._segment_path)
+
+            # Reenviados sao apagados ainda com o lock, o resto volta a ficar livre pra proxima execucao
+            for path, f in self._claimed.items():
+                if path in self._replayed:
+                    self.remove_segment(path)
+                f.close()
+            self._claimed.clear()
+            self._replayed.clear()
+
+    @staticmethod
+    def iter_segment(path: str, offset: int = 0) -> Iterator[Tuple[dict, int]]:
+        """
+        Le as entradas de um segmento a partir de offset, junto com o offset logo depois de cada uma.
+        Para no primeiro registro incompleto ou com checksum errado (escrita cortada no meio por um crash).
+        """
+
+        with open(path, "rb") as f:
+            f.seek(offset)
+            while True:
+                header = f.read(RECORD_HEADER.size)
+                if len(header) < RECORD_HEADER.size:
+                    return
+
+                length, checksum = RECORD_HEADER.unpack(header)
+                body = f.read(length)
+                if len(body) < length or zlib.crc32(body) != checksum:
+                    print(f"⚠️ Registro corrompido em {path}, resto do segmento ignorado")
+                    return
+
+                yield json.loads(body), f.tell()
+
+    @staticmethod
+    def read_segment(path: str) -> Iterator[dict]:
+        for entry, _ in DiskSpool.iter_segment(path):
+            yield entry
+
+    @staticmethod
+    def load_segment(path: str) -> List[dict]:
+        return list(DiskSpool.read_segment(path))
+
+    @staticmethod
+    def remove_segment(path: str):
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,227 @@
+import datetime
+import gzip
+import json
+import os
+import queue
+import shutil
+import threading
+import time
+import traceback
+
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+def _exception_text(record: Dict[str, Any]) -> str:
+    exception = record["exception"]
+    return "".join(traceback.format_exception(exception.type, exception.value, exception.traceback))
+
+def _text_line(record: Dict[str, Any], with_extra: bool) -> str:
+    # Mesmo texto do format do sink classic ("{time:YYYY-MM-DD HH:mm:ss} | {level} | {name}:{function}:{line} | {message}")
+    # str() do datetime ja sai "YYYY-MM-DD HH:MM:SS.ffffff+TZ", bem mais barato que o strftime
+    line = f"{str(record['time'])[:19]} | {record['level'].name} | {record['name']}:{record['function']}:{record['line']} | {record['message']}"
+    if with_extra:
+        line += f" | {record['extra']}"
+    if record["exception"]:
+        line += "\n" + _exception_text(record).rstrip("\n")
+    return line + "\n"
+
+def _json_line(record: Dict[str, Any]) -> str:
+    data = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "name": record["name"],
+        "function": record["function"],
+        "line": record["line"],
+        "message": record["message"],
+    }
+    if record["extra"]:
+        data["extra"] = record["extra"]
+    if record["exception"]:
+        data["exception"] = _exception_text(record)
+    return json.dumps(data, ensure_ascii=False, default=str) + "\n"
+
+def raw_format(record: Dict[str, Any]) -> str:
+    """
+    Format do loguru pro BatchedFileSink: nada pra renderizar na thread que loga, a linha e montada do record na thread de escrita.
+    """
+
+    return ""
+
+class BatchedFileSink:
+    """
+    Sink de arquivo do loguru que escreve numa thread propria, em lote.
+
+    O write (chamado pelo loguru na thread que loga) so faz append num deque, sem lock e sem tocar no disco,
+    e com format=raw_format o loguru nem renderiza a format string: a linha (texto ou JSON) e montada do
+    record na thread de escrita. A thread de escrita acorda a cada flush_interval ou quando o deque chega em batch_size e grava o lote
+    inteiro num write so (arquivo aberto com buffer de buffer_size). Um arquivo por dia em directory,
+    {YYYY-MM-DD}.log ou .jsonl, escolhido pela hora do registro. Arquivo do dia anterior e comprimido
+    pra .gz numa terceira thread, a escrita do dia novo nao espera o gzip, e os mais velhos que
+    retention_days sao apagados. O loguru chama stop() no logger.remove() (e no atexit): grava o que tiver.
+    """
+
+    def __init__(self, directory: str, json_lines: bool = False, with_extra: bool = False, retention_days: int = 7, compress: bool = True,
+                 flush_interval: float = 0.5, batch_size: int = 1000, buffer_size: int = 1024 * 1024,
+                 max_pending: int = 100000):
+        """
+            json_lines: uma linha JSON por registro, senao o texto do sink classic
+            with_extra: texto com " | {extra}" no fim (o JSON leva o extra sempre que tiver)
+            flush_interval / batch_size: o que vier primeiro acorda a thread de escrita
+            buffer_size: buffer do arquivo aberto
+            max_pending: registros esperando a thread de escrita, passou disso e descartado e contado em dropped
+        dropped e incrementado sem lock: com write chamado de varias threads ao mesmo tempo alguns incrementos
+        podem se perder, o contador e uma aproximacao (written e batches sao so da thread de escrita, esses sao exatos).
+        """
+
+        self.directory = directory
+        self.json_lines = json_lines
+        self.with_extra = with_extra
+        self.suffix = ".jsonl" if json_lines else ".log"
+        self.retention_days = retention_days
+        self.compress = compress
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.buffer_size = buffer_size
+        self.max_pending = max_pending
+
+        self._pending: Deque[Any] = deque()
+        self._wakeup = threading.Event()
+        self._closing = False
+
+        self._file = None
+        self._path: Optional[str] = None
+        self._rotate_at = 0.0 # Meia noite (epoch) do dia do arquivo aberto
+
+        self._compress_queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._compressor: Optional[threading.Thread] = None
+
+        self.dropped = 0
+        self.written = 0
+        self.batches = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._cleanup(time.time())
+
+        self._writer = threading.Thread(target=self._run, name=f"log-writer:{directory}", daemon=True)
+        self._writer.start()
+
+    def write(self, message):
+        pending = self._pending
+        if len(pending) >= self.max_pending:
+            self.dropped += 1
+            return
+
+        pending.append(message)
+        if len(pending) >= self.batch_size and not self._wakeup.is_set():
+            self._wakeup.set()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self._write_pending()
+            except Exception as er:
+                print(f"❌ Erro gravando logs em {self.directory}: {er}")
+            if self._closing and not self._pending:
+                break
+
+    def _write_pending(self):
+        pending = self._pending
+        if not pending:
+            return
+
+        json_lines = self.json_lines
+        with_extra = self.with_extra
+        # O loguru continua fazendo append enquanto o lote e gravado: o lote sao os n primeiros, o resto fica pro proximo
+        n = len(pending)
+        # Lote todo antes da meia noite (o caso comum): nao precisa olhar a hora registro por registro
+        same_day = pending[n - 1].record["time"].timestamp() < self._rotate_at
+
+        lines = []
+        for _ in range(n):
+            record = pending.popleft().record
+            if not same_day:
+                timestamp = record["time"].timestamp()
+                if timestamp >= self._rotate_at:
+                    if lines:
+                        self._file.write("".join(lines))
+                        lines = []
+                    self._open(timestamp)
+            lines.append(_json_line(record) if json_lines else _text_line(record, with_extra))
+
+        self._file.write("".join(lines))
+        self._file.flush()
+        self.written += len(lines)
+        self.batches += 1
+
+    def _open(self, timestamp: float):
+        day = datetime.date.fromtimestamp(timestamp)
+        path = os.path.join(self.directory, f"{day:%Y-%m-%d}{self.suffix}")
+        if path == self._path:
+            return
+
+        rotated = self._file is not None
+        if rotated:
+            self._file.close()
+        self._file = open(path, "a", encoding="utf-8", buffering=self.buffer_size)
+        self._path = path
+        self._rotate_at = time.mktime((day + datetime.timedelta(days=1)).timetuple())
+        if rotated: # O primeiro arquivo ja foi limpo no __init__
+            self._cleanup(timestamp)
+
+    def _cleanup(self, now: float):
+        """
+        Apaga o que passou de retention_days e manda pro gzip os arquivos de dias anteriores (inclusive os que sobraram de outra execucao).
+        """
+
+        today = f"{datetime.date.fromtimestamp(now):%Y-%m-%d}{self.suffix}"
+        limit = now - self.retention_days * 86400
+        for entry in os.scandir(self.directory):
+            if not entry.is_file() or not entry.name[:1].isdigit():
+                continue
+            if entry.stat().st_mtime < limit:
+                os.remove(entry.path)
+            elif self.compress and entry.name.endswith(self.suffix) and entry.name != today:
+                self._compress_later(entry.path)
+
+    def _compress_later(self, path: str):
+        if self._compressor is None:
+            self._compressor = threading.Thread(target=self._compress_loop, name=f"log-gzip:{self.directory}", daemon=True)
+            self._compressor.start()
+        self._compress_queue.put(path)
+
+    def _compress_loop(self):
+        while True:
+            path = self._compress_queue.get()
+            if path is None or self._closing:
+                break
+            try:
+                partial = path + ".gz.tmp"
+                with open(path, "rb") as source, gzip.open(partial, "wb") as target:
+                    shutil.copyfileobj(source, target, 1024 * 1024)
+                os.replace(partial, path + ".gz")
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except Exception as er:
+                print(f"❌ Erro comprimindo {path}: {er}")
+
+    def stop(self, timeout: float = 5.0):
+        """
+        Grava o que ta no deque e fecha o arquivo. Compressao pendente fica pra proxima execucao (o _cleanup pega).
+        """
+
+        if self._closing:
+            return
+        self._closing = True
+        self._wakeup.set()
+        self._writer.join(timeout)
+
+        if self._file is not None and not self._writer.is_alive():
+            self._file.close()
+            self._file = None
+        if self._compressor is not None:
+            self._compress_queue.put(None)
+        if self.dropped:
+            print(f"⚠️  {self.dropped} registro(s) descartados com a fila de {self.directory} cheia")
@@ -0,0 +1,310 @@
+import asyncio
+import random
+import time
+
+from collections import defaultdict, deque
+from typing import Deque, Dict, Mapping, Optional, Tuple, Union
+from datetime import datetime, timedelta
+
+class _BucketState:
+    """
+    Estado de um bucket no modo "bucket": token bucket local + o que o discord informou nos headers.
+    """
+    __slots__ = ("tokens", "updated_at", "server_limit", "server_remaining", "server_reset_at")
+
+    def __init__(self, capacity: float, now: float):
+        self.tokens = capacity
+        self.updated_at = now
+
+        self.server_limit: Optional[int] = None
+        self.server_remaining: Optional[int] = None # None = sem informacao valida do servidor
+        self.server_reset_at: Optional[float] = None
+
+class IntelligentRateLimiter:
+    """
+    Rate limite inteligente com cooldown para webhook
+
+    Tem dois modos:
+        - "window": janela deslizante local (deque de timestamps), budget vem do max_requests
+        - "bucket": token bucket O(1) que usa os headers X-RateLimit-* do discord quando existem
+    """
+    MODES = ("window", "bucket")
+
+    def __init__(self, max_requests: int = 50, window_seconds: int = 60, emergency_cooldown: float = 300.0, mode: str = "window", verbose: bool = False):
+        """
+            max_requests: Máximo de requests por janela
+            window_seconds: Tamanho da janela em segundos
+            emergency_cooldown: Máximo de cooldown em segundos
+            mode: "window" ou "bucket"
+            verbose: imprime cada cooldown aplicado
+        """
+
+        if mode not in self.MODES:
+            raise ValueError(f"Modo de rate limit invalido: {mode} (use {', '.join(self.MODES)})")
+
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self.emergency_cooldown = emergency_cooldown
+        self.mode = mode
+        self.verbose = verbose
+
+        self.request_history: Dict[str, Deque[float]] = defaultdict(deque) # Guarda o historico de requisao em um dicionario
+
+        self.webhook_cooldowns: Dict[str, float] = {} # Guarda quais webhooks estao bloqueadas (time.monotonic)
+
+        # Modo bucket: estado por bucket, webhooks que o discord diz que dividem o bucket compartilham o estado
+        self.refill_rate = max_requests / window_seconds
+        self._buckets: Dict[str, _BucketState] = {}
+        self._bucket_keys: Dict[str, str] = {}
+
+        self._lock = asyncio.Lock()
+
+    def _bucket_for(self, webhook_url: str, now: float) -> _BucketState:
+        key = self._bucket_keys.get(webhook_url, webhook_url)
+        state = self._buckets.get(key)
+        if state is None:
+            state = self._buckets[key] = _BucketState(self.max_requests, now)
+        return state
+
+    def _check_cooldown(self, webhook_url: str, now: float) -> Optional[float]:
+        """
+        Retorna quanto falta do cooldown ou None se nao tiver cooldown ativo.
+        """
+
+        cooldown_until = self.webhook_cooldowns.get(webhook_url)
+        if cooldown_until is None:
+            return None
+
+        if now < cooldown_until:
+            return cooldown_until - now
+
+        del self.webhook_cooldowns[webhook_url]
+        return None
+
+    def _check_window(self, webhook_url: str, now: float) -> Optional[float]:
+        # Limpa historico antigo do inicio do deque, os timestamps ja estao em ordem
+        history = self.request_history[webhook_url]
+        cutoff = now - self.window_seconds
+        while history and history[0] <= cutoff:
+            history.popleft()
+
+        if len(history) >= self.max_requests:
+            return max(1.0, self.window_seconds - (now - history[0]))
+        return None
+
+    def _check_bucket(self, webhook_url: str, now: float) -> Optional[float]:
+        state = self._bucket_for(webhook_url, now)
+
+        if state.server_remaining is not None:
+            if state.server_reset_at is not None and now >= state.server_reset_at:
+                # Bucket do servidor ja resetou, fica sem informacao ate a proxima resposta
+                state.server_remaining = state.server_limit
+                state.server_reset_at = None
+
+            if state.server_remaining is not None:
+                if state.server_remaining > 0:
+                    return None
+                if state.server_reset_at is not None:
+                    return state.server_reset_at - now
+
+        # Sem numeros do servidor: token bucket local
+        elapsed = now - state.updated_at
+        state.tokens = min(self.max_requests, state.tokens + elapsed * self.refill_rate)
+        state.updated_at = now
+
+        if state.tokens >= 1:
+            return None
+        return (1 - state.tokens) / self.refill_rate
+
+    def available(self, webhook_url: str) -> float:
+        """
+        Estimativa de quantas requests a webhook ainda pode fazer agora (0 em cooldown), sem lock.
+        Usada pra escolher a webhook menos carregada de uma rota, nao pra liberar envio.
+        """
+
+        now = time.monotonic()
+        if self._check_cooldown(webhook_url, now) is not None:
+            return 0.0
+
+        if self.mode == "bucket":
+            state = self._bucket_for(webhook_url, now)
+            if state.server_remaining is not None and (state.server_reset_at is None or now < state.server_reset_at):
+                return float(state.server_remaining)
+            return min(self.max_requests, state.tokens + (now - state.updated_at) * self.refill_rate)
+
+        history = self.request_history.get(webhook_url)
+        if not history:
+            return float(self.max_requests)
+        cutoff = now - self.window_seconds
+        return float(self.max_requests - sum(1 for timestamp in history if timestamp > cutoff))
+
+    def cooldown_remaining(self, webhook_url: str) -> float:
+        """
+        Segundos que faltam do cooldown da webhook (0 sem cooldown), sem lock.
+        Usada pelo agendador de retry pra marcar a proxima tentativa de um payload que tomou 429.
+        """
+
+        cooldown_until = self.webhook_cooldowns.get(webhook_url)
+        if cooldown_until is None:
+            return 0.0
+        return max(0.0, cooldown_until - time.monotonic())
+
+    async def can_send(self, webhook_url: str, reserve: bool = False) -> Tuple[bool, Optional[float]]:
+        """
+        Verifica se e possivel enviar mensagem em caso de retricao, recebe como argumento a webhook e retorna true or false
+            reserve: liberado, ja ocupa o slot (_reserve) dentro do mesmo lock, pra dois envios em paralelo nao
+                     passarem juntos pelo ultimo slot (usado pelo wait_until_allowed)
+        """
+
+        async with self._lock:
+            now = time.monotonic()
+
+            wait_seconds = self._check_cooldown(webhook_url, now)
+            if wait_seconds is not None:
+                return False, wait_seconds
+
+            if self.mode == "bucket":
+                wait_seconds = self._check_bucket(webhook_url, now)
+            else:
+                wait_seconds = self._check_window(webhook_url, now)
+
+            if wait_seconds is not None:
+                return False, wait_seconds
+
+            if reserve:
+                self._reserve(webhook_url, now)
+            return True, None
+
+    async def wait_until_allowed(self, webhook_url: str, max_wait: Optional[float] = None) -> bool:
+        """
+        Espera exatamente o tempo necessario ate poder enviar.
+        Retorna False se a espera passar de max_wait (None espera o quanto for preciso).
+        """
+
+        deadline = None if max_wait is None else time.monotonic() + max_wait
+
+        while True:
+            can_send, wait_seconds = await self.can_send(webhook_url, reserve=True)
+            if can_send:
+                return True
+
+            if deadline is not None and time.monotonic() + wait_seconds > deadline:
+                return False
+
+            await asyncio.sleep(wait_seconds)
+
+    def _reserve(self, webhook_url: str, now: float):
+        """
+        Ocupa o slot da request assim que ela e liberada (chamado com o lock), pra varios envios em paralelo
+        na mesma webhook nao passarem juntos pelo ultimo slot. No modo bucket desconta do budget do servidor
+        (a proxima resposta corrige com os headers), no modo window o timestamp ja entra na janela: a request
+        conta mesmo se falhar, como no discord.
+        """
+
+        if self.mode != "bucket":
+            self.request_history[webhook_url].append(now)
+            return
+
+        state = self._bucket_for(webhook_url, now)
+        if state.server_remaining is not None and state.server_remaining > 0:
+            state.server_remaining -= 1
+
+    async def record_request(self, webhook_url: str):
+        """
+        Registra uma requisicao enviada com sucesso. No modo window ela ja entrou na janela quando foi
+        liberada (wait_until_allowed), aqui nao conta de novo.
+        """
+
+        if self.mode != "bucket":
+            return
+
+        async with self._lock:
+            now = time.monotonic()
+
+            state = self._bucket_for(webhook_url, now)
+            # Com headers do servidor o update_from_headers ja contabilizou essa request
+            if state.server_remaining is None:
+                state.tokens = max(0.0, state.tokens - 1)
+
+    async def update_from_headers(self, webhook_url: str, headers: Mapping[str, str]):
+        """
+        Atualiza o budget com os headers X-RateLimit-* que o discord devolve em toda resposta.
+        So tem efeito no modo "bucket".
+        """
+
+        if self.mode != "bucket":
+            return
+
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset_after = headers.get("X-RateLimit-Reset-After")
+        if remaining is None or reset_after is None:
+            return
+
+        async with self._lock:
+            now = time.monotonic()
+
+            bucket_id = headers.get("X-RateLimit-Bucket")
+            if bucket_id and self._bucket_keys.get(webhook_url) != bucket_id:
+                self._bucket_keys[webhook_url] = bucket_id
+
+            state = self._bucket_for(webhook_url, now)
+            try:
+                state.server_remaining = int(remaining)
+                state.server_reset_at = now + float(reset_after)
+                limit = headers.get("X-RateLimit-Limit")
+                if limit is not None:
+                    state.server_limit = int(limit)
+            except ValueError:
+                state.server_remaining = None
+                state.server_reset_at = None
+
+    async def apply_cooldown(self, webhook_url: str, retry_after: Optional[Union[float, str]] = None):
+        """
+        Aplica cooldown baseado no retry afeter ou usa backoff exponecional
+        """
+
+        async with self._lock:
+            now = time.monotonic()
+
+            if retry_after:
+                retry_after = float(retry_after)
+                cooldown_seconds = min(retry_after, self.emergency_cooldown)
+                if self.verbose:
+                    print(f"⏰ cooldown aplicado Discord: {cooldown_seconds}s (Retry_afer {retry_after})")
+            else:
+                # Se nao for passado retry ele calcula com base no historico
+                recent_cooldowns = sum(
+                    1 for cd_time in self.webhook_cooldowns.values()
+                    if now - 600 < cd_time
+                )
+                cooldown_seconds = min(5 * (2 ** recent_cooldowns), self.emergency_cooldown)
+                if self.verbose:
+                    print(f"⏰ Aplicado backoff exponencial: {cooldown_seconds}s, (cooldowns {recent_cooldowns})")
+
+            self.webhook_cooldowns[webhook_url] = now + cooldown_seconds
+            if self.verbose:
+                cooldown_until = datetime.now() + timedelta(seconds=cooldown_seconds)
+                print(f"❄️ Webhook em cooldown ate: {cooldown_until.strftime('%H:%M:%S')}")
+
+if __name__ == "__main__":
+    async def main():
+        limiter = IntelligentRateLimiter(max_requests=10, window_seconds=5, emergency_cooldown=30, mode="bucket", verbose=True)
+
+        webhook_fake = "https://discordapp.com/api/webhooks/fake" # Nao funciona so pra testar msm
+
+        for i in range(1, 30):
+            await limiter.wait_until_allowed(webhook_fake)
+            print(f"Request liberada {i}")
+            await limiter.record_request(webhook_fake)
+
+            # Simula os headers que o discord devolveria, budget de 5 requests a cada 2s
+            await limiter.update_from_headers(webhook_fake, {
+                "X-RateLimit-Limit": "5",
+                "X-RateLimit-Remaining": str(4 - (i - 1) % 5),
+                "X-RateLimit-Reset-After": "2.0",
+                "X-RateLimit-Bucket": "fake-bucket",
+            })
+
+            await asyncio.sleep(random.uniform(0.01, 0.2))
+
+    asyncio.run(main())
@@ -0,0 +1,142 @@
+import asyncio
+import json
+import os
+import signal
+import socket
+import struct
+
+from typing import List, Optional, Set
+
+from .log_config import LogConfig, load_env
+from .discord_handler import AsyncDiscordHandler
+
+# Cada frame no socket: 4 bytes (tamanho, big endian) + JSON com uma lista de [message, level, timestamp, stack_trace]
+FRAME_HEADER = struct.Struct("!I")
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+DEFAULT_SOCKET = "/tmp/logsentinel.sock"
+
+def encode_frame(records: List[tuple]) -> bytes:
+    """
+    Monta um frame com um lote de registros (message, level, timestamp, stack_trace, name, tags).
+    """
+
+    body = json.dumps(records, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return FRAME_HEADER.pack(len(body)) + body
+
+class LogCollector:
+    """
+    Daemon local que recebe os registros de todos os workers por um unix socket.
+
+    Roda um unico AsyncDiscordHandler, entao fila, deduplicacao e rate limit sao compartilhados
+    por todos os processos em vez de cada worker ter o seu contra a mesma webhook.
+    """
+
+    def __init__(self, config: LogConfig, socket_path: Optional[str] = None):
+        self.config = config
+        self.socket_path = socket_path or config.collector_socket or DEFAULT_SOCKET
+
+        self.handler = AsyncDiscordHandler(config)
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.received = 0
+        self._clients: Set[asyncio.StreamWriter] = set()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+
+    def _remove_stale_socket(self):
+        """
+        Remove o arquivo do socket se sobrou de um coletor que morreu, mas nao derruba um coletor vivo.
+        """
+
+        if not os.path.exists(self.socket_path):
+            return
+
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            os.unlink(self.socket_path)
+        else:
+            raise RuntimeError(f"Ja existe um coletor ouvindo em {self.socket_path}")
+        finally:
+            probe.close()
+
+    async def start(self):
+        self._remove_stale_socket()
+
+        await self.handler.__aenter__()
+        self.server = await asyncio.start_unix_server(self._handle_client, path=self.socket_path)
+
+        print(f"📡 Coletor ouvindo em {self.socket_path}")
+
+    async def serve_forever(self):
+        await self.server.serve_forever()
+
+    async def stop(self):
+        if self.server:
+            self.server.close()
+            # Fecha as conexoes abertas pros workers perceberem e irem pro envio local
+            for writer in list(self._clients):
+                writer.close()
+            await self.server.wait_closed()
+            self.server = None
+
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+        await self.handler.__aexit__(None, None, None)
+        print(f"📡 Coletor parado, {self.received} registros recebidos")
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Le frames de um worker ate ele desconectar e joga os registros na fila do handler.
+        """
+
+        self._clients.add(writer)
+        try:
+            while True:
+                header = await reader.readexactly(FRAME_HEADER.size)
+                (length,) = FRAME_HEADER.unpack(header)
+
+                if length > MAX_FRAME_SIZE:
+                    print(f"⚠️ Frame de {length} bytes descartado, conexao fechada")
+                    break
+
+                body = await reader.readexactly(length)
+                for entry in json.loads(body):
+                    # Clientes antigos mandam so os 4 primeiros campos
+                    message, level, timestamp, stack_trace = entry[:4]
+                    name, tags = (entry[4], entry[5]) if len(entry) >= 6 else (None, None)
+                    self.handler.enqueue_nowait(message, level, stack_trace=stack_trace, timestamp=timestamp, name=name, tags=tags)
+                    self.received += 1
+        except asyncio.IncompleteReadError:
+            pass # Worker desconectou
+        except (ValueError, TypeError) as er:
+            print(f"❌ Frame invalido recebido no coletor: {er}")
+        finally:
+            self._clients.discard(writer)
+            writer.close()
+
+if __name__ == "__main__":
+    async def main():
+        load_env()
+        collector = LogCollector(LogConfig())
+
+        async with collector:
+            loop = asyncio.get_running_loop()
+            serve_task = asyncio.ensure_future(collector.serve_forever())
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(sig, serve_task.cancel)
+
+            try:
+                await serve_task
+            except asyncio.CancelledError:
+                pass
+
+    asyncio.run(main())
@@ -0,0 +1,261 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import json
+import os
+
+_env_loaded = False
+
+def load_env(path: Optional[str] = None, override: bool = False) -> bool:
+    """
+    Carrega o .env pro os.environ uma vez so, chamado pelo logger_manager / create_config_for_environment / CLI.
+    Importar o pacote nao le nada, quem monta o LogConfig na mao chama isso antes se quiser o .env.
+    """
+
+    global _env_loaded
+    if _env_loaded and path is None:
+        return False
+
+    from dotenv import load_dotenv
+
+    load_dotenv(path, override=override)
+    _env_loaded = True
+    return True
+
+@dataclass 
+class LogConfig:
+    error_webhook: Optional[str] = None # Aceita varias separadas por virgula (mesmo canal, divide o budget)
+    info_webhook: Optional[str] = None
+    digest_webhook: Optional[str] = None # Resumo periodico, padrao a webhook de INFO
+
+    # Tabela de rotas, testadas em ordem antes das rotas padrao ERROR/INFO. Cada rota:
+    # {"name": "pagamentos", "webhooks": [...], "levels": [...], "loggers": ["app.payments"],
+    #  "tags": {"subsystem": "payments"}, "strategy": "hash" | "least_loaded"}
+    routes: Optional[List[Dict[str, Any]]] = None
+
+    max_queue_size: int = 2000
+    # Descarte por prioridade: acima de shed_sample_threshold da fila so uma fracao dos INFO entra
+    shed_sample_threshold: float = 0.8
+    shed_info_sample_rate: float = 0.1
+    batch_interval: float = 5.0 
+    max_retries: int = 3 # Tentativas no total por payload (falhas passageiras, 429 nao conta)
+
+    # Retry fora do caminho de envio: backoff exponencial com jitter ate retry_max_delay, payload que
+    # passa de retry_max_age segundos desde a primeira falha (ou das tentativas) vai pro spool
+    retry_base_delay: float = 2.0
+    retry_max_delay: float = 60.0
+    retry_max_age: float = 300.0
+    retry_max_pending: int = 1000
+
+    # Circuit breaker por webhook: abre com 401/403/404 ou com circuit_failure_threshold de falhas nos
+    # ultimos circuit_window_size envios, aberto manda direto pro spool e testa de novo com backoff
+    circuit_failure_threshold: float = 0.5
+    circuit_window_size: int = 20
+    circuit_min_requests: int = 5
+    circuit_open_seconds: float = 5.0
+    circuit_max_open_seconds: float = 300.0
+
+    # Agendador de flush: processa a fila quando ela chega no tamanho, quando o item mais antigo
+    # passa da idade maxima (padrao = batch_interval) ou logo depois de um CRITICAL
+    flush_size_threshold: int = 500
+    flush_max_age: Optional[float] = None
+    flush_critical_delay: float = 0.0
+
+    max_requests_per_window: int = 50
+    rate_limit_window: int = 60
+    emergency_cooldown: float = 300.0
+    rate_limit_mode: str = "bucket" # "bucket" usa os headers X-RateLimit-* do discord, "window" so a janela local
+    max_rate_limit_wait: float = 30.0
+
+    dedup_window: float = 30.0
+    dedup_max_entries: int = 10000
+    trace_cache_size: int = 1000 # Stack traces formatados guardados pelo fingerprint da exception
+
+    # Agrupamento por template (mensagens que so mudam nos valores viram uma linha com o total). Desligado por
+    # padrao: ligado muda o que aparece no canal, e com similarity baixa junta mensagens diferentes
+    # ("user alice logged in" e "user bob logged out" tem 50% dos tokens iguais)
+    template_grouping: bool = False
+    template_similarity: float = 0.7
+    template_max_clusters: int = 1000
+    template_cache_size: int = 10000
+    template_samples: int = 3
+    max_message_length: int = 1500
+    max_stack_trace_length: int = 200
+
+    # Redacao de segredos: regras padrao pelo nome (None = todas: discord_webhook, discord_token, jwt,
+    # aws_access_key, aws_secret_key, bearer, email, card, credentials) e regras extras:
+    # {"name": "cpf", "pattern": "\\d{3}\\.\\d{3}\\.\\d{3}-\\d{2}", "replacement": "<CPF>", "literals": ["-"]}
+    redaction_rules: Optional[List[str]] = None
+    redaction_custom_rules: Optional[List[Dict[str, Any]]] = None
+
+    # Lote que precisaria de mais de attachment_min_chunks chunks de 1900 caracteres vai como arquivo .log
+    # anexo numa request so (0 desliga), com gzip opcional
+    attachment_min_chunks: int = 5
+    attachment_gzip: bool = False
+    attachment_memory_limit: int = 1024 * 1024
+
+    # Entrega: um worker por webhook, cliente httpx compartilhado
+    max_in_flight_per_webhook: int = 2
+    sender_queue_size: int = 1000
+    http_max_connections: int = 20
+    http_max_keepalive: int = 10
+    http_keepalive_expiry: float = 30.0
+    http2: bool = False
+
+    # Spool em disco pro que nao foi entregue
+    spool_dir: str = "logs/spool"
+    spool_segment_size: int = 4 * 1024 * 1024
+    spool_flush_interval: float = 1.0
+    spool_replay: bool = True
+
+    # Limite por linha de codigo ({name}:{function}:{line}) no discord_sink: callsite_burst registros seguidos e
+    # depois callsite_rate por segundo, o resto so e contado e resumido no flush. Desligado por padrao (0):
+    # ligado ele barra qualquer linha que loga mais que callsite_rate por segundo, inclusive log normal de trafego
+    callsite_rate: float = 0.0
+    callsite_burst: int = 20
+    callsite_max_sites: int = 10000
+
+    # Resumo a cada digest_interval segundos (0 desliga): top digest_top_k mensagens por level e loggers,
+    # contados num count-min sketch de digest_sketch_width x digest_sketch_depth (memoria fixa)
+    digest_interval: float = 0.0
+    digest_top_k: int = 10
+    digest_sketch_width: int = 2048
+    digest_sketch_depth: int = 4
+
+    # Registros de outras threads (sem loop) esperando o loop do handler
+    handoff_max_pending: int = 50000
+    # Prazo total do shutdown (handler.stop, logger_manager, atexit): entrega o que der e o resto vai pro spool,
+    # tem que ficar abaixo do terminationGracePeriodSeconds do kubernetes (10s padrao), senao o SIGKILL chega no meio do spool
+    shutdown_timeout: float = 8.0
+
+    # Arquivos de logs/app e logs/error: "classic" e o sink de arquivo do loguru (escrita na thread que loga),
+    # "batched" grava numa thread propria em lote (file_batch_size registros ou file_flush_interval segundos)
+    # com file_format "text" ou "json" (uma linha JSON por registro, sem format string) e gzip do dia anterior
+    file_sink_mode: str = "classic"
+    file_format: str = "text"
+    file_flush_interval: float = 0.5
+    file_batch_size: int = 1000
+    file_buffer_size: int = 1024 * 1024
+    file_max_pending: int = 100000
+    file_compress: bool = True
+
+    # Metricas: prints so com verbose, o resto sai pelo snapshot ou pelo endpoint do Prometheus
+    verbose: bool = False
+    metrics_port: Optional[int] = None
+    metrics_host: str = "127.0.0.1"
+
+    # Modo coletor: os workers mandam os registros pra um processo so via unix socket
+    collector_socket: Optional[str] = None
+    collector_batch_size: int = 200
+    collector_flush_interval: float = 0.2
+    collector_max_pending: int = 10000
+
+    def __post_init__(self):
+        self.error_webhook = os.getenv("ERROR_HOOK", self.error_webhook)
+        self.info_webhook = os.getenv("INFO_HOOK", self.info_webhook)
+        self.digest_webhook = os.getenv("DIGEST_HOOK", self.digest_webhook)
+
+        # Rotas: JSON direto em LOG_ROUTES ou arquivo em LOG_ROUTES_FILE
+        routes_file = os.getenv("LOG_ROUTES_FILE")
+        if routes_file:
+            with open(routes_file, "r", encoding="utf-8") as f:
+                self.routes = json.load(f)
+        elif os.getenv("LOG_ROUTES"):
+            self.routes = json.loads(os.environ["LOG_ROUTES"])
+
+
+        self.max_queue_size = int(os.getenv("MAX_QUEUE_SIZE", self.max_queue_size))
+        self.shed_sample_threshold = float(os.getenv("SHED_SAMPLE_THRESHOLD", self.shed_sample_threshold))
+        self.shed_info_sample_rate = float(os.getenv("SHED_INFO_SAMPLE_RATE", self.shed_info_sample_rate))
+        self.max_retries = int(os.getenv("MAX_RETRIES", self.max_retries))
+        self.batch_interval = float(os.getenv("BATCH_INTERVAL", self.batch_interval))
+        self.retry_base_delay = float(os.getenv("RETRY_BASE_DELAY", self.retry_base_delay))
+        self.retry_max_delay = float(os.getenv("RETRY_MAX_DELAY", self.retry_max_delay))
+        self.retry_max_age = float(os.getenv("RETRY_MAX_AGE", self.retry_max_age))
+        self.retry_max_pending = int(os.getenv("RETRY_MAX_PENDING", self.retry_max_pending))
+        self.circuit_failure_threshold = float(os.getenv("CIRCUIT_FAILURE_THRESHOLD", self.circuit_failure_threshold))
+        self.circuit_window_size = int(os.getenv("CIRCUIT_WINDOW_SIZE", self.circuit_window_size))
+        self.circuit_min_requests = int(os.getenv("CIRCUIT_MIN_REQUESTS", self.circuit_min_requests))
+        self.circuit_open_seconds = float(os.getenv("CIRCUIT_OPEN_SECONDS", self.circuit_open_seconds))
+        self.circuit_max_open_seconds = float(os.getenv("CIRCUIT_MAX_OPEN_SECONDS", self.circuit_max_open_seconds))
+
+        self.flush_size_threshold = int(os.getenv("FLUSH_SIZE_THRESHOLD", self.flush_size_threshold))
+        self.flush_max_age = float(os.getenv("FLUSH_MAX_AGE", self.flush_max_age or self.batch_interval))
+        self.flush_critical_delay = float(os.getenv("FLUSH_CRITICAL_DELAY", self.flush_critical_delay))
+
+        #:Carrega novas configurações do ambiente
+        self.rate_limit_window = int(os.getenv("RATE_LIMIT_WINDOW", self.rate_limit_window))
+        self.emergency_cooldown = float(os.getenv("EMERGENCY_COOLDOWN", self.emergency_cooldown))
+        self.rate_limit_mode = os.getenv("RATE_LIMIT_MODE", self.rate_limit_mode)
+        self.max_rate_limit_wait = float(os.getenv("MAX_RATE_LIMIT_WAIT", self.max_rate_limit_wait))
+        self.dedup_window = float(os.getenv("DEDUP_WINDOW", self.dedup_window))
+        self.dedup_max_entries = int(os.getenv("DEDUP_MAX_ENTRIES", self.dedup_max_entries))
+        self.trace_cache_size = int(os.getenv("TRACE_CACHE_SIZE", self.trace_cache_size))
+
+        # Agrupamento por template
+        self.template_grouping = os.getenv("TEMPLATE_GROUPING", str(self.template_grouping)).lower() in ("1", "true", "yes")
+        self.template_similarity = float(os.getenv("TEMPLATE_SIMILARITY", self.template_similarity))
+        self.template_max_clusters = int(os.getenv("TEMPLATE_MAX_CLUSTERS", self.template_max_clusters))
+        self.template_cache_size = int(os.getenv("TEMPLATE_CACHE_SIZE", self.template_cache_size))
+        self.template_samples = int(os.getenv("TEMPLATE_SAMPLES", self.template_samples))
+        self.max_message_length = int(os.getenv("MAX_MESSAGE_LENGTH", self.max_message_length))
+        self.max_stack_trace_length = int(os.getenv("MAX_STACK_TRACE_LENGTH", self.max_stack_trace_length))
+
+        # Redacao: nomes separados por virgula em REDACTION_RULES, regras extras em JSON no REDACTION_CUSTOM_RULES
+        if os.getenv("REDACTION_RULES"):
+            self.redaction_rules = [name.strip() for name in os.environ["REDACTION_RULES"].split(",") if name.strip()]
+        if os.getenv("REDACTION_CUSTOM_RULES"):
+            self.redaction_custom_rules = json.loads(os.environ["REDACTION_CUSTOM_RULES"])
+
+        # Anexo
+        self.attachment_min_chunks = int(os.getenv("ATTACHMENT_MIN_CHUNKS", self.attachment_min_chunks))
+        self.attachment_gzip = os.getenv("ATTACHMENT_GZIP", str(self.attachment_gzip)).lower() in ("1", "true", "yes")
+        self.attachment_memory_limit = int(os.getenv("ATTACHMENT_MEMORY_LIMIT", self.attachment_memory_limit))
+
+        self.callsite_rate = float(os.getenv("CALLSITE_RATE", self.callsite_rate))
+        self.callsite_burst = int(os.getenv("CALLSITE_BURST", self.callsite_burst))
+        self.callsite_max_sites = int(os.getenv("CALLSITE_MAX_SITES", self.callsite_max_sites))
+
+        self.digest_interval = float(os.getenv("DIGEST_INTERVAL", self.digest_interval))
+        self.digest_top_k = int(os.getenv("DIGEST_TOP_K", self.digest_top_k))
+        self.digest_sketch_width = int(os.getenv("DIGEST_SKETCH_WIDTH", self.digest_sketch_width))
+        self.digest_sketch_depth = int(os.getenv("DIGEST_SKETCH_DEPTH", self.digest_sketch_depth))
+
+        self.handoff_max_pending = int(os.getenv("HANDOFF_MAX_PENDING", self.handoff_max_pending))
+        self.shutdown_timeout = float(os.getenv("SHUTDOWN_TIMEOUT", self.shutdown_timeout))
+
+        # Arquivos
+        self.file_sink_mode = os.getenv("FILE_SINK_MODE", self.file_sink_mode)
+        self.file_format = os.getenv("FILE_FORMAT", self.file_format)
+        self.file_flush_interval = float(os.getenv("FILE_FLUSH_INTERVAL", self.file_flush_interval))
+        self.file_batch_size = int(os.getenv("FILE_BATCH_SIZE", self.file_batch_size))
+        self.file_buffer_size = int(os.getenv("FILE_BUFFER_SIZE", self.file_buffer_size))
+        self.file_max_pending = int(os.getenv("FILE_MAX_PENDING", self.file_max_pending))
+        self.file_compress = os.getenv("FILE_COMPRESS", str(self.file_compress)).lower() in ("1", "true", "yes")
+
+        # Metricas
+        self.verbose = os.getenv("LOG_VERBOSE", str(self.verbose)).lower() in ("1", "true", "yes")
+        metrics_port = os.getenv("METRICS_PORT")
+        if metrics_port:
+            self.metrics_port = int(metrics_port)
+        self.metrics_host = os.getenv("METRICS_HOST", self.metrics_host)
+
+        # Modo coletor
+        self.collector_socket = os.getenv("COLLECTOR_SOCKET", self.collector_socket)
+        self.collector_batch_size = int(os.getenv("COLLECTOR_BATCH_SIZE", self.collector_batch_size))
+        self.collector_flush_interval = float(os.getenv("COLLECTOR_FLUSH_INTERVAL", self.collector_flush_interval))
+        self.collector_max_pending = int(os.getenv("COLLECTOR_MAX_PENDING", self.collector_max_pending))
+
+        # Entrega
+        self.max_in_flight_per_webhook = int(os.getenv("MAX_IN_FLIGHT_PER_WEBHOOK", self.max_in_flight_per_webhook))
+        self.sender_queue_size = int(os.getenv("SENDER_QUEUE_SIZE", self.sender_queue_size))
+        self.http_max_connections = int(os.getenv("HTTP_MAX_CONNECTIONS", self.http_max_connections))
+        self.http_max_keepalive = int(os.getenv("HTTP_MAX_KEEPALIVE", self.http_max_keepalive))
+        self.http_keepalive_expiry = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", self.http_keepalive_expiry))
+        self.http2 = os.getenv("HTTP2", str(self.http2)).lower() in ("1", "true", "yes")
+
+        # Spool
+        self.spool_dir = os.getenv("SPOOL_DIR", self.spool_dir)
+        self.spool_segment_size = int(os.getenv("SPOOL_SEGMENT_SIZE", self.spool_segment_size))
+        self.spool_flush_interval = float(os.getenv("SPOOL_FLUSH_INTERVAL", self.spool_flush_interval))
+        self.spool_replay = os.getenv("SPOOL_REPLAY", str(self.spool_replay)).lower() in ("1", "true", "yes")
@@ -0,0 +1,321 @@
+import ast
+import asyncio
+import json
+import os
+import re
+import time
+
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .log_config import LogConfig
+from .discord_handler import AsyncDiscordHandler
+from .disk_spool import DiskSpool, SEGMENT_SUFFIX
+from .retry_scheduler import SENT, RETRY, FAILED, CIRCUIT_OPEN
+
+LEGACY_FILES = [
+    "logs/discord_fallback.log",
+    "logs/discord_overflow.log",
+    "logs/discord_no_loop.log",
+]
+
+# "2024-01-01 10:00:00 | [ERROR] | conteudo" e "2024-01-01 10:00:00 | NO_LOOP [INFO] | mensagem"
+ENTRY_RE = re.compile(r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\S*) \| (?:NO_LOOP )?\[(\w+)\] \| (.*)$', re.DOTALL)
+# "2024-01-01 10:00:00 | OVERFLOW [INFO | {'message': ..., 'level': ...}]"
+OVERFLOW_RE = re.compile(r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\S*) \| OVERFLOW \[(\w+) \| (.*)\]$', re.DOTALL)
+START_RE = re.compile(rb'^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\S* \| ')
+
+@dataclass
+class ReplayEntry:
+    queue_type: str
+    timestamp: str
+    text: str
+    end_offset: int # Offset no arquivo logo depois dessa entrada, usado no checkpoint
+
+class LogReplayer:
+    """
+    Reenvia offline os logs que ficaram nos arquivos de fallback antigos e no spool.
+
+    Le os arquivos em streaming (nunca carrega o arquivo todo), reagrupa as linhas usando o
+    _split_message do handler e envia pelo AsyncDiscordHandler respeitando o budget do
+    IntelligentRateLimiter. Salva um checkpoint por arquivo depois de cada lote enviado pra
+    poder continuar de onde parou.
+    """
+
+    RATE_LIMIT_WAIT_FLOOR = 0.05 # Espera minima num RATE_LIMITED, nunca tenta de novo em loop sem dormir
+
+    def __init__(self, config: LogConfig, checkpoint_path: str = "logs/replay_checkpoint.json",
+                 batch_chars: int = 1900 * 5, progress_every: int = 10):
+        self.config = config
+        self.checkpoint_path = checkpoint_path
+        self.batch_chars = batch_chars
+        self.progress_every = progress_every
+
+        self.checkpoint: Dict[str, int] = {}
+        self.requests = 0
+        self.entries = 0
+
+    def load_checkpoint(self):
+        try:
+            with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+                self.checkpoint = json.load(f)
+        except FileNotFoundError:
+            self.checkpoint = {}
+
+    def save_checkpoint(self):
+        directory = os.path.dirname(self.checkpoint_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.checkpoint, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _start_offset(self, path: str) -> int:
+        offset = self.checkpoint.get(os.path.abspath(path), 0)
+        if offset > os.path.getsize(path):
+            return 0 # Arquivo foi truncado/rotacionado depois do checkpoint
+        return offset
+
+    @staticmethod
+    def _clean_text(content: str) -> str:
+        """
+        Tira a formatacao de payload (blocos de codigo, cabecalhos, @everyone) pra reagrupar so as linhas.
+        """
+
+        lines = []
+        for line in content.replace("```", "").split("\n"):
+            line = line.strip()
+            if not line or line == "@everyone" or (line.startswith("**") and line.endswith("**")):
+                continue
+            lines.append(line)
+        return "\n".join(lines)
+
+    def _parse_legacy(self, raw: bytes, end_offset: int) -> Optional[ReplayEntry]:
+        text = raw.decode("utf-8", errors="replace").rstrip("\n")
+
+        match = OVERFLOW_RE.match(text)
+        if match:
+            timestamp, queue_type, item = match.groups()
+            try:
+                item = ast.literal_eval(item)
+                message = item.get("message", "")
+            except (ValueError, SyntaxError):
+                message = item
+            return ReplayEntry(queue_type, timestamp, self._clean_text(message), end_offset)
+
+        match = ENTRY_RE.match(text)
+        if match:
+            timestamp, tag, content = match.groups()
+            queue_type = "ERROR" if tag in ("ERROR", "CRITICAL") else "INFO"
+            return ReplayEntry(queue_type, timestamp, self._clean_text(content), end_offset)
+
+        return None
+
+    def iter_legacy_file(self, path: str, offset: int = 0) -> Iterator[ReplayEntry]:
+        """
+        Le um arquivo de fallback antigo em streaming. Uma entrada comeca numa linha com timestamp
+        e continua nas linhas seguintes (conteudo com quebra de linha) ate a proxima entrada.
+        """
+
+        with open(path, "rb") as f:
+            f.seek(offset)
+            current: List[bytes] = []
+            position = offset
+
+            for line in f:
+                if START_RE.match(line) and current:
+                    entry = self._parse_legacy(b"".join(current), position)
+                    if entry:
+                        yield entry
+                    current = []
+                current.append(line)
+                position += len(line)
+
+            if current:
+                entry = self._parse_legacy(b"".join(current), position)
+                if entry:
+                    yield entry
+
+    def iter_spool_segment(self, path: str, offset: int = 0) -> Iterator[ReplayEntry]:
+        for entry, end_offset in DiskSpool.iter_segment(path, offset):
+            timestamp = datetime.fromtimestamp(entry.get("timestamp", 0)).strftime("%Y-%m-%d %H:%M:%S")
+            if entry.get("kind") == "record":
+                level = entry.get("level", "INFO")
+                queue_type = "ERROR" if level in ("ERROR", "CRITICAL") else "INFO"
+                text = self._clean_text(entry.get("message", ""))
+            else:
+                queue_type = entry.get("queue_type", "ERROR")
+                payload = entry.get("payload", {})
+                # Payloads empacotados tambem levam linhas e alertas nos embeds
+                parts = [embed.get("description", "") for embed in payload.get("embeds", [])]
+                attachment = payload.get("attachment")
+                if attachment:
+                    # Lote em anexo: o content e so o resumo com as primeiras linhas, as linhas de verdade tao no texto do anexo
+                    parts.append(attachment.get("text", ""))
+                else:
+                    parts.insert(0, payload.get("content", ""))
+                text = self._clean_text("\n".join(parts))
+            yield ReplayEntry(queue_type, timestamp, text, end_offset)
+
+    def iter_entries(self, path: str) -> Iterator[ReplayEntry]:
+        offset = self._start_offset(path)
+        if path.endswith(SEGMENT_SUFFIX):
+            return self.iter_spool_segment(path, offset)
+        return self.iter_legacy_file(path, offset)
+
+    def _build_payloads(self, handler: AsyncDiscordHandler, buffers: Dict[str, List[str]]) -> List[Tuple[str, dict]]:
+        payloads = []
+        for queue_type, lines in buffers.items():
+            if not lines:
+                continue
+
+            chunks = handler._split_message("\n".join(lines))
+            for idx, chunk in enumerate(chunks):
+                header = f"**REENVIO DE LOGS {queue_type} ({idx+1}/{len(chunks)}):**\n```\n"
+                payloads.append((queue_type, {"content": header + chunk + "\n```"}))
+        return payloads
+
+    async def _send_with_retry(self, handler: AsyncDiscordHandler, webhook_url: str, payload: dict) -> bool:
+        """
+        O replay e sequencial, entao espera o backoff aqui mesmo em vez de usar o agendador de retry do handler.
+        O _send_discord_payload ja espera o budget do rate limiter ate MAX_RATE_LIMIT_WAIT. RATE_LIMITED (429 ou
+        janela/bucket local mais longe que isso) dorme o que o limiter pede e tenta de novo, pelo menos
+        RATE_LIMIT_WAIT_FLOOR por vez e ate max(MAX_RATE_LIMIT_WAIT, RATE_LIMIT_WINDOW) somando as esperas do payload.
+        """
+
+        config = handler.config
+        # Uma janela inteira sempre libera a janela local, esperar mais que isso e outra coisa (429 seguidos)
+        max_wait = max(config.max_rate_limit_wait, config.rate_limit_window)
+        waited = 0.0
+
+        attempts = 0
+        while True:
+            outcome = await handler._send_discord_payload(webhook_url, payload)
+            if outcome == SENT:
+                return True
+            if outcome in (FAILED, CIRCUIT_OPEN):
+                return False
+
+            if outcome == RETRY:
+                attempts += 1
+                if attempts >= handler.config.max_retries:
+                    return False
+                await asyncio.sleep(handler.retry_scheduler.backoff(attempts))
+            else:
+                # Sem 429 o cooldown e 0 e o bloqueio e da janela/bucket local: a espera vem do can_send
+                _, wait_seconds = await handler.rate_limiting.can_send(webhook_url)
+                wait_seconds = max(handler.rate_limiting.cooldown_remaining(webhook_url), wait_seconds or 0.0, self.RATE_LIMIT_WAIT_FLOOR)
+                if waited + wait_seconds > max_wait:
+                    print(f"⏳ Rate limit da webhook passou de {max_wait:.0f}s de espera")
+                    return False
+                waited += wait_seconds
+                await asyncio.sleep(wait_seconds)
+
+    async def _send_batch(self, handler: AsyncDiscordHandler, buffers: Dict[str, List[str]], dry_run: bool) -> bool:
+        for queue_type, payload in self._build_payloads(handler, buffers):
+            self.requests += 1
+            if dry_run:
+                continue
+
+            webhook_url = handler._webhook_for(queue_type)
+            if not webhook_url:
+                print(f"⚠️ Webhook de {queue_type} nao configurado, parando replay")
+                return False
+
+            if not await self._send_with_retry(handler, webhook_url, payload):
+                print(f"❌ Falha no envio, replay parado. Rode de novo pra continuar do checkpoint")
+                return False
+
+            if self.requests % self.progress_every == 0:
+                print(f"📤 {self.requests} requests enviadas, {self.entries} entradas")
+
+        for lines in buffers.values():
+            lines.clear()
+        return True
+
+    async def _replay_file(self, handler: AsyncDiscordHandler, path: str, dry_run: bool) -> bool:
+        total_size = os.path.getsize(path)
+        key = os.path.abspath(path)
+        buffers: Dict[str, List[str]] = {"ERROR": [], "INFO": []}
+        buffered_chars = 0
+        last_offset = self._start_offset(path)
+
+        print(f"📂 {path}: {total_size - last_offset} bytes a partir do offset {last_offset}")
+
+        for entry in self.iter_entries(path):
+            self.entries += 1
+            if entry.text:
+                line = f"[{entry.timestamp}] {entry.text}"
+                buffers.setdefault(entry.queue_type, []).append(line)
+                buffered_chars += len(line) + 1
+
+            if buffered_chars >= self.batch_chars:
+                if not await self._send_batch(handler, buffers, dry_run):
+                    return False
+                buffered_chars = 0
+                last_offset = entry.end_offset
+                if not dry_run:
+                    self.checkpoint[key] = last_offset
+                    self.save_checkpoint()
+                    print(f"   {path}: {last_offset * 100 // max(total_size, 1)}%")
+
+        if not await self._send_batch(handler, buffers, dry_run):
+            return False
+
+        if not dry_run:
+            if path.endswith(SEGMENT_SUFFIX):
+                # Segmento do spool entregue nao pode ser reenviado de novo pelo handler
+                DiskSpool.remove_segment(path)
+                self.checkpoint.pop(key, None)
+            else:
+                self.checkpoint[key] = total_size
+            self.save_checkpoint()
+        return True
+
+    async def run(self, paths: List[str], dry_run: bool = False, reset: bool = False) -> bool:
+        if reset:
+            self.checkpoint = {}
+        else:
+            self.load_checkpoint()
+
+        paths = [path for path in paths if os.path.exists(path)]
+        if not paths:
+            print("Nada pra reenviar")
+            return True
+
+        start = time.monotonic()
+        # Quem reenvia o spool aqui e o replayer, o handler nao pode reenviar de novo ao iniciar. Copia pra nao
+        # mexer no config de quem chamou (o replace roda o __post_init__ de novo, SPOOL_REPLAY do env ganharia)
+        config = replace(self.config)
+        config.spool_replay = False
+        handler = AsyncDiscordHandler(config)
+
+        if dry_run:
+            for path in paths:
+                await self._replay_file(handler, path, dry_run=True)
+
+            window_requests = self.config.max_requests_per_window
+            windows = self.requests / max(window_requests, 1)
+            print(f"🔎 Dry run: {self.entries} entradas em {self.requests} requests")
+            print(f"   Com budget de {window_requests} req/{self.config.rate_limit_window}s: ~{windows * self.config.rate_limit_window:.0f}s")
+            return True
+
+        async with handler:
+            for path in paths:
+                if not await self._replay_file(handler, path, dry_run=False):
+                    return False
+
+        elapsed = time.monotonic() - start
+        print(f"✅ Replay completo: {self.entries} entradas em {self.requests} requests ({elapsed:.1f}s)")
+        return True
+
+    @staticmethod
+    def default_paths(config: LogConfig, include_spool: bool = False) -> List[str]:
+        paths = list(LEGACY_FILES)
+        if include_spool:
+            # Segmento travado e de um processo rodando (escrevendo ou reenviando), nao e sobra
+            paths.extend(path for path in DiskSpool(config.spool_dir)._list_segments() if not DiskSpool.is_locked(path))
+        return paths
@@ -0,0 +1,350 @@
+"""
+IMPORTACAO DAS LIBS
+"""
+import os
+import asyncio
+from loguru import logger
+from typing import Optional
+from contextlib import asynccontextmanager
+
+from .discord_handler import AsyncDiscordHandler 
+from .log_config import LogConfig, load_env
+from .collector_client import CollectorClient
+from .discord_record import DiscordRecord
+from .background_engine import BackgroundEngine, RecordHandoff
+from .file_sink import BatchedFileSink, raw_format
+
+"""
+Classe de configuracao onde tudo e iniciado e configurado em eventos padroes de forma asincrona.
+O .env so e lido quando alguem pede uma config (load_env), importar o modulo nao tem efeito colateral.
+"""
+
+"""
+Classe principal na qual e o executor nele tem o discord send, o que cria a fila e envia os processo etc...
+"""
+
+_DISCORD_LEVELS = frozenset(("ERROR", "CRITICAL", "INFO"))
+
+def _discord_format(record) -> str:
+    # Format como funcao pro loguru nao renderizar o traceback no texto, o discord_sink formata so na hora do envio
+    return "{message}\n"
+
+def discord_sink(message):
+    handler = _handler
+
+    if not handler:
+        return
+    
+    record = message.record
+    level = record["level"].name
+
+    if level not in _DISCORD_LEVELS:
+        return
+
+    # Se for um fallback do discord, ele ve pra nao entrar em loop
+    if record["extra"].get("discord_fallback"):
+        return
+
+    # Limite por linha de codigo: um loop logando 50000 vezes da mesma linha so e contado, nao enche a fila
+    limiter = handler.site_limiter
+    if limiter is not None and not limiter.allow(record["name"], record["function"], record["line"], level, record["message"]):
+        return
+
+    try:
+        running_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        running_loop = None
+
+    if running_loop is handler.loop:
+        # Enfileira direto, sem task por registro. O stack trace so e formatado na hora do envio
+        # name e extra vao junto pra tabela de rotas (logger/modulo e tags)
+        client = _collector_client
+        if client:
+            client.submit(str(message), level, record["exception"], record["name"], record["extra"])
+        else:
+            handler.enqueue_nowait(str(message), level, record["exception"], name=record["name"], tags=record["extra"])
+        return
+
+    # Outra thread (worker, executor, app sincrona com a engine em background): passa pro loop do handler
+    handoff = _handoff
+    if handoff is not None and handoff.submit(str(message), level, record["exception"], record["name"], record["extra"]):
+        return
+
+    # Sem loop nenhum recebendo: vai pro spool (so buffer em memoria, a escrita e feita pelo loop do handler)
+    try:
+        exc_info = record["exception"]
+        stack_trace = None
+        if exc_info:
+            stack_trace = DiscordRecord(str(message), level, 0.0, exc_info).stack_trace
+
+        handler.spool.append_record(str(message), level, record["time"].timestamp(), stack_trace, record["name"])
+    except Exception:
+        print(f"🔥 CRÍTICO - Não foi possível salvar log: {str(message)}")
+    
+def create_config_for_environment(environment: str = None) -> LogConfig:
+    load_env()
+
+    if not environment:
+        environment = os.getenv("ENVIRONMENT", "development")
+
+    if environment.lower() == "production":
+        return LogConfig(
+            max_queue_size=5000,
+            max_retries=5,
+            batch_interval=10.0,  # Production: flush mais lento
+            flush_size_threshold=2000,   # Production: lotes grandes, menos requests por minuto
+            flush_critical_delay=0.5,    # Production: junta criticos de uma rajada numa request so
+            max_requests_per_window=30,  # Production: mais conservador
+            emergency_cooldown=600.0     # Production: 10 minutos
+        )   
+    elif environment.lower() == "staging":
+        return LogConfig(
+            max_queue_size=2000,
+            max_retries=3,
+            batch_interval=5.0,
+            flush_size_threshold=1000,
+            flush_critical_delay=0.25,
+            max_requests_per_window=50,
+            emergency_cooldown=300.0
+        )
+    else:  # development
+        return LogConfig(
+            max_queue_size=1000,
+            max_retries=3,
+            batch_interval=3.0,  # Development: flush mais rápido para testes
+            flush_size_threshold=200,
+            flush_critical_delay=0.0,    # Development: critico sai na hora
+            max_requests_per_window=100,
+            emergency_cooldown=60.0
+            )
+
+_handler: Optional[AsyncDiscordHandler] = None
+_handler_task: Optional[asyncio.Task] = None
+_collector_client: Optional[CollectorClient] = None
+_handoff: Optional[RecordHandoff] = None
+_engine: Optional[BackgroundEngine] = None
+_logger_configured = False
+_manager_active = False 
+_APP_FORMAT = "{time:YYYY-MM-DD HH:mm:ss} | {level} | {name}:{function}:{line} | {message}"
+_ERROR_FORMAT = "{time:YYYY-MM-DD HH:mm:ss} | {level} | {name}:{function}:{line} | {message} | {extra}"
+_FILE_SINK_MODES = ("classic", "batched")
+_FILE_FORMATS = ("text", "json")
+
+def _configure_loguru_only(config: Optional[LogConfig] = None):
+    # Configura somente o loguro.abs
+
+    global _logger_configured
+
+    if _logger_configured:
+        return
+
+    logger.remove()
+
+    mode = config.file_sink_mode if config else "classic"
+    if mode not in _FILE_SINK_MODES:
+        raise ValueError(f"Modo de sink de arquivo invalido: {mode} (use {', '.join(_FILE_SINK_MODES)})")
+
+    if mode == "batched":
+        if config.file_format not in _FILE_FORMATS:
+            raise ValueError(f"Formato de arquivo invalido: {config.file_format} (use {', '.join(_FILE_FORMATS)})")
+
+        # Thread de escrita propria: o logger.debug so faz append num deque e a linha e montada la (o enqueue do loguru nao precisa mais)
+        for directory, level, with_extra, retention in (("logs/app", "DEBUG", False, 7), ("logs/error", "ERROR", True, 30)):
+            sink = BatchedFileSink(
+                directory,
+                config.file_format == "json",
+                with_extra,
+                retention,
+                config.file_compress,
+                config.file_flush_interval,
+                config.file_batch_size,
+                config.file_buffer_size,
+                config.file_max_pending
+            )
+            logger.add(sink, level=level, format=raw_format, colorize=False)
+    else:
+        logger.add(
+            "logs/app/{time:YYYY-MM-DD}.log",
+            rotation="1 day",
+            retention="7 days",
+            level="DEBUG",
+            format=_APP_FORMAT
+        )
+
+        logger.add(
+            "logs/error/{time:YYYY-MM-DD}.log",
+            rotation="1 day",
+            retention="30 days",
+            level="ERROR",
+            format=_ERROR_FORMAT,
+            enqueue=True
+        )
+
+    # Um sink so: level INFO ja inclui ERROR/CRITICAL (antes eram dois e todo erro entrava duas vezes)
+    logger.add(discord_sink, level="INFO", format=_discord_format)
+
+    _logger_configured = True
+
+@asynccontextmanager
+async def logger_manager(config: Optional[LogConfig] =None):
+    global _handler, _handler_task, _manager_active, _collector_client, _handoff
+
+    if _manager_active:
+        print("⚠️  Logger manager já ativo - retornando logger existente")
+        yield logger
+        return
+
+    _manager_active = True
+
+    if not config:
+        config = create_config_for_environment()
+
+    if not config.error_webhook:
+        print("⚠️  AVISO: WEBHOOK DE ERRO não configurado no .env")
+    if not config.info_webhook:
+        print("⚠️  AVISO: WEBHOOK DE INFO não configurado no .env")
+
+
+
+
+    #Configura o loguro
+    _configure_loguru_only(config)
+
+    async with AsyncDiscordHandler(config) as handler:
+        # Modo coletor: o handler local continua existindo como fallback se o socket sumir
+        if config.collector_socket:
+            _collector_client = CollectorClient(
+                config.collector_socket,
+                handler,
+                config.collector_batch_size,
+                config.collector_flush_interval,
+                config.collector_max_pending
+            )
+            await _collector_client.start()
+
+        # Registros de threads sem loop entram pelo mesmo caminho do loop (coletor ou handler)
+        handoff = RecordHandoff(
+            _collector_client.submit_record if _collector_client else handler.enqueue_record,
+            config.handoff_max_pending,
+            handler.metrics
+        )
+        await handoff.start()
+
+        _handler = handler
+        _handoff = handoff
+        try:
+            print("🚀 Sistema de logs iniciado com sucesso")
+            yield logger
+        finally:
+            print("🛑 Parando sistema de logs...")            
+            _handoff = None
+            await handoff.stop()
+            if _collector_client:
+                await _collector_client.stop()
+                _collector_client = None
+            _handler = None
+            _manager_active = None
+
+def start_background_logging(config: Optional[LogConfig] = None):
+    """
+    Versao sincrona do logger_manager pra apps sem asyncio (Flask, Celery, scripts): o handler roda
+    numa thread propria com seu loop e qualquer thread pode logar. Para com stop_background_logging()
+    ou sozinho no atexit.
+    """
+
+    global _handler, _manager_active, _handoff, _engine
+
+    if _manager_active:
+        print("⚠️  Logger manager já ativo - retornando logger existente")
+        return logger
+
+    if not config:
+        config = create_config_for_environment()
+
+    if not config.error_webhook:
+        print("⚠️  AVISO: WEBHOOK DE ERRO não configurado no .env")
+    if not config.info_webhook:
+        print("⚠️  AVISO: WEBHOOK DE INFO não configurado no .env")
+
+    _configure_loguru_only(config)
+
+    engine = BackgroundEngine(config).start()
+    _engine = engine
+    _handler = engine.handler
+    _handoff = engine.handoff
+    _manager_active = True
+
+    print("🚀 Sistema de logs iniciado em background")
+    return logger
+
+def stop_background_logging(timeout: Optional[float] = None) -> bool:
+    """
+    Entrega o que ta pendente e para a engine do start_background_logging.
+    Retorna False se nao terminou dentro do timeout (padrao: config.shutdown_timeout).
+    """
+
+    global _handler, _manager_active, _handoff, _engine
+
+    engine = _engine
+    if engine is None:
+        return True
+
+    print("🛑 Parando sistema de logs...")
+    _handoff = None
+    finished = engine.shutdown(timeout)
+    _engine = None
+    _handler = None
+    _manager_active = False
+    return finished
+
+def metrics_snapshot() -> dict:
+    """
+    Metricas do handler ativo (contadores, gauges e histogramas), vazio se o logger_manager nao ta rodando.
+    """
+
+    handler = _handler
+    return handler.metrics.snapshot() if handler else {}
+
+def circuit_states() -> dict:
+    """
+    Estado do circuit breaker de cada webhook do handler ativo (closed, open, half_open), pelo id da webhook.
+    """
+
+    handler = _handler
+    return handler.circuit_states() if handler else {}
+
+__all__ = ["logger", "logger_manager", "start_background_logging", "stop_background_logging",
+           "create_config_for_environment", "LogConfig", "metrics_snapshot", "circuit_states"]
+
+def main(argv: Optional[list] = None) -> int:
+    """
+    Linha de comando: python -m logger replay [arquivos...] [--dry-run] [--spool] [--reset]
+    """
+    import argparse
+
+    from .log_replayer import LogReplayer
+
+    parser = argparse.ArgumentParser(prog="python -m logger")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    replay = commands.add_parser("replay", help="Reenvia logs de fallback/spool respeitando o rate limit")
+    replay.add_argument("paths", nargs="*", help="Arquivos pra reenviar (padrao: logs/discord_*.log)")
+    replay.add_argument("--spool", action="store_true", help="Inclui os segmentos do spool em disco")
+    replay.add_argument("--dry-run", action="store_true", help="So conta quantas requests o replay vai precisar")
+    replay.add_argument("--reset", action="store_true", help="Ignora o checkpoint e comeca do inicio")
+    replay.add_argument("--checkpoint", default="logs/replay_checkpoint.json", help="Arquivo de checkpoint")
+    replay.add_argument("--env", default=None, help="Ambiente (production, staging, development)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "replay":
+        config = create_config_for_environment(args.env)
+        paths = args.paths or LogReplayer.default_paths(config, args.spool)
+        replayer = LogReplayer(config, args.checkpoint)
+        ok = asyncio.run(replayer.run(paths, dry_run=args.dry_run, reset=args.reset))
+        return 0 if ok else 1
+
+    return 1
+
+if __name__ == "__main__":
+    raise SystemExit(main())
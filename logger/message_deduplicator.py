@@ -0,0 +1,112 @@
+import hashlib
+import asyncio
+import time
+
+from collections import OrderedDict
+from typing import Iterable, List, TypeVar
+
+T = TypeVar("T")
+
+class MessageDeduplicator:
+    """
+    Um sistema de Deduplicacao de mensagens utilizando se de hash como base.
+
+    Evita de enviar mensagens duplicadas nas logs no discord dentro de uma janela de tempo.
+    funciona criando um hash unico para cada combinacao de mensagem (message + level)
+
+    Os hashes ficam num OrderedDict em ordem de insercao, como a janela e fixa essa tambem e a
+    ordem de expiracao, entao a limpeza so remove do inicio ate achar um item valido (O(1) amortizado).
+    """
+
+    def __init__(self, window_seconds: float = 30.0, max_entries: int = 10000, verbose: bool = False):
+        # Janela de tempo para considerar uma mensagem duplicada
+        # max_entries: limite duro de hashes guardados, os mais antigos saem primeiro
+        # verbose: imprime cada duplicada detectada (o handler conta elas nas metricas)
+
+        self.window_seconds = window_seconds
+        self.max_entries = max_entries
+        self.verbose = verbose
+        self.seen_messages: "OrderedDict[bytes, float]" = OrderedDict()
+        self._lock = asyncio.Lock()
+
+
+    def _hash_message(self, message: str, level: str) -> bytes:
+        """
+        Cria um hash unico para cada mensagem, combinando level assim ja evita de "info db" ser igual a "error db"
+        """
+
+        content = f"{level}:{message}"
+        return hashlib.md5(content.encode()).digest()
+
+    def _expire(self, now: float):
+        """
+        Remove do inicio os hashes que sairam da janela, para no primeiro que ainda ta valido.
+        """
+
+        cutoff = now - self.window_seconds
+        seen = self.seen_messages
+        while seen:
+            message_hash, timestamp = next(iter(seen.items()))
+            if timestamp > cutoff:
+                break
+            seen.popitem(last=False)
+
+    def _check(self, message_hash: bytes, now: float) -> bool:
+        """
+        Verifica e registra um hash, nao faz limpeza nem lock (quem chama cuida disso).
+        """
+
+        if message_hash in self.seen_messages:
+            return True
+
+        self.seen_messages[message_hash] = now
+        if len(self.seen_messages) > self.max_entries:
+            self.seen_messages.popitem(last=False)
+        return False
+
+    async def is_duplicate(self, message: str, level: str) -> bool:
+        """
+        Verifica usando a funcao _hash_message se ela ja foi duplicada e se estamos dentro da janela de tempo.
+        """
+
+        async with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+
+            if self._check(self._hash_message(message, level), now):
+                if self.verbose:
+                    print(f"🔄 Mensagem duplicada detectada: {level}")
+                return True
+            return False
+
+    async def filter_duplicates(self, items: Iterable[T]) -> List[T]:
+        """
+        Versao em lote do is_duplicate, recebe os itens drenados da fila (com .message e .level)
+        e retorna so os que nao sao duplicados, pegando o lock e limpando a janela uma vez so.
+        """
+
+        async with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+
+            unique = []
+            for item in items:
+                message_hash = self._hash_message(item.message, item.level)
+                if not self._check(message_hash, now):
+                    unique.append(item)
+            return unique
+
+if __name__ == "__main__":
+    async def teste():
+        deduper = MessageDeduplicator(window_seconds=5, verbose=True)
+
+        print(await deduper.is_duplicate("teste", "info"))
+        print(await deduper.is_duplicate("teste", "info"))
+        print(await deduper.is_duplicate("teste", "error"))
+        print(await deduper.is_duplicate("outro teste", "info"))
+
+        await asyncio.sleep(6)
+
+        print(await deduper.is_duplicate("teste", "info"))
+
+    asyncio.run(teste())
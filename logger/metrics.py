@@ -0,0 +1,214 @@
+import asyncio
+import bisect
+import time
+
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# Limites dos buckets de histograma em segundos, do enqueue ate latencia de request
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+class Counter:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+class Gauge:
+    """
+    Valor que sobe e desce. Com fn o valor e lido na hora do snapshot (ex: tamanho de fila), sem custo no caminho quente.
+    """
+
+    __slots__ = ("value", "fn")
+
+    def __init__(self, fn: Optional[Callable[[], float]] = None):
+        self.value = 0
+        self.fn = fn
+
+    def set(self, value: float):
+        self.value = value
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+    def get(self) -> float:
+        return self.fn() if self.fn else self.value
+
+class Histogram:
+    """
+    Histograma com buckets fixos (cumulativos so na exportacao), observe e O(log buckets).
+    """
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1) # Ultimo = acima do maior bucket (+Inf)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Quantil aproximado: limite superior do bucket onde o quantil cai.
+        """
+
+        if not self.count:
+            return None
+
+        target = q * self.count
+        seen = 0
+        for idx, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return self.buckets[idx] if idx < len(self.buckets) else float("inf")
+        return float("inf")
+
+class MetricsRegistry:
+    """
+    Registro de metricas do handler: contadores, gauges, histogramas e timers por etapa.
+
+    As metricas sao identificadas por nome + labels e criadas na primeira vez que sao pedidas,
+    quem ta no caminho quente deve guardar a referencia em vez de pedir de novo a cada registro.
+    Le tudo pelo snapshot() ou no formato texto do Prometheus (render_prometheus / start_server).
+    """
+
+    def __init__(self, prefix: str = "logsentinel"):
+        self.prefix = prefix
+        self._metrics: Dict[str, Dict[LabelKey, object]] = {}
+        self._meta: Dict[str, Tuple[str, str]] = {} # nome -> (tipo, descricao)
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    def _get(self, kind: str, name: str, help_text: str, labels: Dict[str, str], factory: Callable[[], object]):
+        name = f"{self.prefix}_{name}"
+        family = self._metrics.get(name)
+        if family is None:
+            family = self._metrics[name] = {}
+            self._meta[name] = (kind, help_text)
+        elif self._meta[name][0] != kind:
+            raise ValueError(f"Metrica {name} ja registrada como {self._meta[name][0]}")
+
+        key = tuple(sorted((label, str(value)) for label, value in labels.items()))
+        metric = family.get(key)
+        if metric is None:
+            metric = family[key] = factory()
+        return metric
+
+    def counter(self, name: str, help_text: str = "", **labels) -> Counter:
+        return self._get("counter", name, help_text, labels, Counter)
+
+    def gauge(self, name: str, help_text: str = "", fn: Optional[Callable[[], float]] = None, **labels) -> Gauge:
+        gauge = self._get("gauge", name, help_text, labels, Gauge)
+        if fn is not None:
+            gauge.fn = fn
+        return gauge
+
+    def histogram(self, name: str, help_text: str = "", buckets: Tuple[float, ...] = DEFAULT_BUCKETS, **labels) -> Histogram:
+        return self._get("histogram", name, help_text, labels, lambda: Histogram(buckets))
+
+    @contextmanager
+    def timer(self, name: str, **labels) -> Iterator[None]:
+        """
+        Mede o bloco e observa a duracao no histograma name (em segundos).
+        """
+
+        histogram = self.histogram(name, "Duracao em segundos", **labels)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            histogram.observe(time.perf_counter() - start)
+
+    @staticmethod
+    def _label_text(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = list(key)
+        if extra:
+            pairs.append(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{label}="{value}"' for label, value in pairs) + "}"
+
+    def snapshot(self) -> Dict[str, object]:
+        """
+        Foto de todas as metricas: contadores/gauges viram numero, histogramas viram count/sum/p50/p99.
+        """
+
+        result: Dict[str, object] = {}
+        for name, family in self._metrics.items():
+            kind = self._meta[name][0]
+            for key, metric in family.items():
+                full_name = name + self._label_text(key)
+                if kind == "counter":
+                    result[full_name] = metric.value
+                elif kind == "gauge":
+                    result[full_name] = metric.get()
+                else:
+                    result[full_name] = {
+                        "count": metric.count,
+                        "sum": metric.sum,
+                        "p50": metric.quantile(0.5),
+                        "p99": metric.quantile(0.99),
+                    }
+        return result
+
+    def render_prometheus(self) -> str:
+        lines: List[str] = []
+        for name, family in self._metrics.items():
+            kind, help_text = self._meta[name]
+            if help_text:
+                lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+            for key, metric in family.items():
+                if kind == "counter":
+                    lines.append(f"{name}{self._label_text(key)} {metric.value}")
+                elif kind == "gauge":
+                    lines.append(f"{name}{self._label_text(key)} {metric.get()}")
+                else:
+                    cumulative = 0
+                    for bound, count in zip(metric.buckets, metric.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{self._label_text(key, ('le', str(bound)))} {cumulative}")
+                    lines.append(f"{name}_bucket{self._label_text(key, ('le', '+Inf'))} {metric.count}")
+                    lines.append(f"{name}_sum{self._label_text(key)} {metric.sum}")
+                    lines.append(f"{name}_count{self._label_text(key)} {metric.count}")
+        return "\n".join(lines) + "\n"
+
+    async def _handle_scrape(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            # So precisa ler ate o fim dos headers, qualquer caminho devolve as metricas
+            await reader.readuntil(b"\r\n\r\n")
+            body = self.render_prometheus().encode("utf-8")
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: text/plain; version=0.0.4\r\n"
+                b"Content-Length: " + str(len(body)).encode() + b"\r\n"
+                b"Connection: close\r\n\r\n" + body
+            )
+            await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def start_server(self, host: str = "127.0.0.1", port: int = 9464):
+        """
+        Sobe um endpoint HTTP local com as metricas no formato do Prometheus.
+        """
+
+        self._server = await asyncio.start_server(self._handle_scrape, host, port)
+
+    async def stop_server(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
@@ -0,0 +1,107 @@
+import gzip
+import io
+import json
+import tempfile
+
+from typing import IO, Iterable, Optional
+
+# Chave do payload que carrega o anexo (o resto do dict vai no payload_json do multipart)
+ATTACHMENT_KEY = "_attachment"
+
+class PayloadAttachment:
+    """
+    Arquivo .log (ou .log.gz) anexado num payload, pra lote grande sair numa request so.
+
+    As linhas sao escritas direto num SpooledTemporaryFile (memoria ate memory_limit, disco depois)
+    e o httpx le o arquivo em pedacos na hora do multipart, o corpo inteiro nunca fica numa string.
+    """
+
+    def __init__(self, filename: str, compress: bool = False, memory_limit: int = 1024 * 1024):
+        """
+            filename: nome do arquivo sem extensao, ex: "erro-20240101-120000"
+            compress: grava gzip (.log.gz) em vez de texto puro
+            memory_limit: bytes em memoria antes do arquivo temporario ir pro disco
+        """
+
+        self.compress = compress
+        self.filename = f"{filename}.log.gz" if compress else f"{filename}.log"
+        self.content_type = "application/gzip" if compress else "text/plain"
+
+        self.file: IO[bytes] = tempfile.SpooledTemporaryFile(max_size=memory_limit)
+        self.lines = 0
+        self.raw_size = 0 # Bytes do texto antes da compressao
+
+    def write_lines(self, lines: Iterable[str]):
+        target = gzip.GzipFile(fileobj=self.file, mode="wb") if self.compress else self.file
+        try:
+            for line in lines:
+                data = (line + "\n").encode("utf-8")
+                target.write(data)
+                self.lines += 1
+                self.raw_size += len(data)
+        finally:
+            if target is not self.file:
+                target.close() # Fecha so o gzip (escreve o trailer), o arquivo continua aberto
+
+    @property
+    def size(self) -> int:
+        """
+        Bytes que vao na request.
+        """
+
+        position = self.file.tell()
+        size = self.file.seek(0, io.SEEK_END)
+        self.file.seek(position)
+        return size
+
+    def request_kwargs(self, payload: dict) -> dict:
+        """
+        Argumentos do httpx.post pra mandar o payload (sem a chave do anexo) como multipart.
+        Volta o arquivo pro inicio, entao pode ser chamado de novo em cada tentativa.
+        """
+
+        self.file.seek(0)
+        payload_json = {key: value for key, value in payload.items() if key != ATTACHMENT_KEY}
+        return {
+            "data": {"payload_json": json.dumps(payload_json)},
+            "files": {"files[0]": (self.filename, self.file, self.content_type)},
+        }
+
+    def read_text(self) -> str:
+        self.file.seek(0)
+        data = self.file.read()
+        if self.compress:
+            data = gzip.decompress(data)
+        return data.decode("utf-8")
+
+    def close(self):
+        self.file.close()
+
+    def to_spool(self) -> dict:
+        """
+        Versao JSON pro spool (caminho de falha, ai sim o texto vai inteiro pra memoria).
+        """
+
+        return {"filename": self.filename, "compress": self.compress, "text": self.read_text()}
+
+    @classmethod
+    def from_spool(cls, data: dict, memory_limit: int = 1024 * 1024) -> "PayloadAttachment":
+        filename = data["filename"]
+        for suffix in (".log.gz", ".log"):
+            if filename.endswith(suffix):
+                filename = filename[:-len(suffix)]
+                break
+
+        attachment = cls(filename, data.get("compress", False), memory_limit)
+        attachment.write_lines(data["text"].splitlines())
+        return attachment
+
+def release(payload: dict) -> Optional[PayloadAttachment]:
+    """
+    Tira o anexo do payload e fecha o arquivo (depois da entrega ou do spool).
+    """
+
+    attachment = payload.pop(ATTACHMENT_KEY, None)
+    if attachment is not None:
+        attachment.close()
+    return attachment
@@ -0,0 +1,163 @@
+from typing import List, Optional, Tuple
+
+class PayloadPacker:
+    """
+    Empacota alertas criticos e linhas agrupadas no menor numero possivel de requests pro discord.
+
+    Cada request de webhook aceita ate 2000 caracteres de content e ate 10 embeds somando 6000
+    caracteres (cada description ate 4096). Os alertas criticos viram embeds empacotados por
+    first-fit decreasing, e as linhas preenchem o espaco que sobrar (content e embeds) antes de abrir
+    uma request nova. As strings sao montadas com join, custo linear no tamanho do lote.
+    """
+
+    CONTENT_LIMIT = 2000
+    MAX_EMBEDS = 10
+    EMBED_TOTAL_LIMIT = 6000
+    EMBED_DESCRIPTION_LIMIT = 4096
+    LINE_LIMIT = 1900
+
+    CRITICAL_COLOR = 0xE74C3C
+    LINES_COLOR = 0x95A5A6
+
+    CODE_OPEN = "```\n"
+    CODE_CLOSE = "\n```"
+    # Cabecalho mais longo possivel das continuacoes, o "(i/n)" so e conhecido depois de empacotar
+    CONTINUATION_RESERVE = "**CONTINUAÇÃO (999/999)**"
+
+    def critical_embed(self, message: str, stack_trace: Optional[str] = None, seen: int = 1, total: int = 0) -> dict:
+        """
+        Monta o embed de um alerta critico (mensagem + stack trace opcional).
+            seen: quantas vezes o mesmo crash (fingerprint) apareceu nesse lote
+            total: quantas vezes desde o inicio, contando esse lote (0 = sem fingerprint)
+        """
+
+        parts = [self.CODE_OPEN, message, self.CODE_CLOSE]
+        if stack_trace:
+            parts.extend(["\n**Stack Trace**\n", self.CODE_OPEN, stack_trace, self.CODE_CLOSE])
+
+        if total > seen:
+            count = f"visto {seen} vezes, {total} no total" if seen > 1 else f"{total} vezes no total"
+            title = f"ERRO CRÍTICO REPETIDO ({count})"
+        elif seen > 1:
+            title = f"NOVO ERRO CRÍTICO (visto {seen} vezes)"
+        else:
+            title = "NOVO ERRO CRÍTICO"
+
+        description = "".join(parts)[:self.EMBED_DESCRIPTION_LIMIT]
+        return {"title": title, "description": description, "color": self.CRITICAL_COLOR}
+
+    @staticmethod
+    def embed_size(embed: dict) -> int:
+        return len(embed.get("title", "")) + len(embed.get("description", ""))
+
+    def _pack_embeds(self, embeds: List[dict]) -> List[Tuple[List[dict], int]]:
+        """
+        First-fit decreasing: maiores primeiro, cada um na primeira request onde cabe.
+        Dentro de cada request a ordem original e mantida.
+        """
+
+        order = sorted(range(len(embeds)), key=lambda idx: self.embed_size(embeds[idx]), reverse=True)
+        bins: List[Tuple[List[int], int]] = []
+
+        for idx in order:
+            size = self.embed_size(embeds[idx])
+            for bin_idx, (members, used) in enumerate(bins):
+                if len(members) < self.MAX_EMBEDS and used + size <= self.EMBED_TOTAL_LIMIT:
+                    members.append(idx)
+                    bins[bin_idx] = (members, used + size)
+                    break
+            else:
+                bins.append(([idx], size))
+
+        return [([embeds[idx] for idx in sorted(members)], used) for members, used in bins]
+
+    def _split_lines(self, lines: List[str]) -> List[str]:
+        """
+        Corta linhas maiores que LINE_LIMIT em pedacos, assim qualquer pedaco cabe num container vazio.
+        """
+
+        pieces = []
+        for line in lines:
+            while len(line) > self.LINE_LIMIT:
+                pieces.append(line[:self.LINE_LIMIT])
+                line = line[self.LINE_LIMIT:]
+            pieces.append(line)
+        return pieces
+
+    @staticmethod
+    def _take_lines(lines: List[str], pos: int, budget: int) -> int:
+        """
+        Retorna ate qual posicao as linhas a partir de pos cabem em budget caracteres (com os \\n).
+        """
+
+        used = 0
+        end = pos
+        while end < len(lines):
+            cost = len(lines[end]) + (1 if end > pos else 0)
+            if used + cost > budget:
+                break
+            used += cost
+            end += 1
+        return end
+
+    def pack(self, critical_embeds: List[dict], lines: List[str], header: str) -> List[dict]:
+        """
+        Empacota tudo em payloads de webhook.
+
+            critical_embeds: embeds dos alertas criticos (critical_embed)
+            lines: linhas agrupadas ja formatadas
+            header: cabecalho da primeira parte das linhas, ex: "**LOGS DE ERRO:**"
+        """
+
+        drafts = []
+        for embeds, used in self._pack_embeds(critical_embeds):
+            label = "ERRO CRÍTICO" if len(embeds) == 1 else f"{len(embeds)} ERROS CRÍTICOS"
+            drafts.append({"prefix": f"@everyone\n**{label}**\n", "embeds": embeds, "used": used, "lines": None})
+
+        header_reserve = max(len(header), len(self.CONTINUATION_RESERVE)) + 1 + len(self.CODE_OPEN) + len(self.CODE_CLOSE)
+        lines = self._split_lines(lines)
+        pos = 0
+        idx = 0
+        while pos < len(lines):
+            if idx == len(drafts):
+                drafts.append({"prefix": "", "embeds": [], "used": 0, "lines": None})
+            draft = drafts[idx]
+            idx += 1
+
+            # Primeiro o content
+            budget = self.CONTENT_LIMIT - len(draft["prefix"]) - header_reserve
+            end = self._take_lines(lines, pos, budget)
+            if end > pos:
+                draft["lines"] = lines[pos:end]
+                pos = end
+
+            # Depois os embeds que sobraram
+            while pos < len(lines) and len(draft["embeds"]) < self.MAX_EMBEDS:
+                budget = min(self.EMBED_DESCRIPTION_LIMIT, self.EMBED_TOTAL_LIMIT - draft["used"])
+                budget -= len(self.CODE_OPEN) + len(self.CODE_CLOSE)
+                end = self._take_lines(lines, pos, budget)
+                if end == pos:
+                    break
+
+                description = "".join([self.CODE_OPEN, "\n".join(lines[pos:end]), self.CODE_CLOSE])
+                draft["embeds"].append({"description": description, "color": self.LINES_COLOR})
+                draft["used"] += len(description)
+                pos = end
+
+        # Agora da pra numerar as continuacoes
+        total_parts = sum(1 for draft in drafts if draft["lines"] is not None)
+        part = 0
+        payloads = []
+        for draft in drafts:
+            content = [draft["prefix"]]
+            if draft["lines"] is not None:
+                part += 1
+                title = header if part == 1 else f"**CONTINUAÇÃO ({part}/{total_parts})**"
+                content.extend([title, "\n", self.CODE_OPEN, "\n".join(draft["lines"]), self.CODE_CLOSE])
+
+            payload = {"content": "".join(content).rstrip("\n")}
+            if draft["embeds"]:
+                payload["embeds"] = draft["embeds"]
+            payloads.append(payload)
+
+        return payloads
@@ -0,0 +1,106 @@
+from collections import deque
+from typing import Deque, Dict, List
+
+from .discord_record import DiscordRecord
+
+# Quanto maior, mais importante. Level desconhecido conta como INFO
+LEVEL_PRIORITY = {"INFO": 0, "ERROR": 1, "CRITICAL": 2}
+
+class PriorityBuffer:
+    """
+    Fila limitada com descarte por prioridade, substitui o asyncio.Queue das filas do handler.
+
+    Cada level tem seu deque e o total nunca passa de maxsize. Com a fila cheia quem sai e o mais
+    antigo do level menos importante que o novo (INFO antes de ERROR, ERROR antes de CRITICAL), se so
+    tem coisa igual ou mais importante o novo e descartado (os primeiros alertas de uma rajada
+    costumam ser a causa). Acima de sample_threshold da capacidade os INFO passam a ser amostrados.
+    Todo descarte e O(1) e so incrementa um contador por level, enviado depois como resumo.
+    """
+
+    def __init__(self, maxsize: int, sample_threshold: float = 0.8, info_sample_rate: float = 0.1):
+        """
+            maxsize: maximo de itens somando todos os levels
+            sample_threshold: fracao da capacidade a partir da qual os INFO sao amostrados
+            info_sample_rate: fracao dos INFO aceitos durante a amostragem (0.1 = 1 a cada 10)
+        """
+
+        self.maxsize = maxsize
+        self.sample_limit = int(maxsize * sample_threshold)
+        self.sample_every = max(1, round(1 / info_sample_rate)) if info_sample_rate > 0 else 0
+
+        self._levels: List[Deque[DiscordRecord]] = [deque() for _ in range(len(LEVEL_PRIORITY))]
+        self._size = 0
+        self._sample_counter = 0
+
+        self.dropped: Dict[str, int] = {}
+
+    def qsize(self) -> int:
+        return self._size
+
+    def empty(self) -> bool:
+        return self._size == 0
+
+    def _drop(self, level: str):
+        self.dropped[level] = self.dropped.get(level, 0) + 1
+
+    def put(self, item: DiscordRecord) -> bool:
+        """
+        Coloca o item na fila, retorna False se ele mesmo foi descartado.
+        """
+
+        priority = LEVEL_PRIORITY.get(item.level, 0)
+
+        # Sob pressao os INFO sao amostrados antes de chegar no limite
+        if priority == 0 and self._size >= self.sample_limit:
+            self._sample_counter += 1
+            if not self.sample_every or self._sample_counter % self.sample_every:
+                self._drop(item.level)
+                return False
+
+        if self._size >= self.maxsize:
+            for victim_priority in range(priority):
+                victims = self._levels[victim_priority]
+                if victims:
+                    self._drop(victims.popleft().level)
+                    self._size -= 1
+                    break
+            else:
+                self._drop(item.level)
+                return False
+
+        self._levels[priority].append(item)
+        self._size += 1
+        return True
+
+    def top_priority(self) -> int:
+        """
+        Prioridade do level mais importante que ta na fila (-1 vazia).
+        """
+
+        for priority in range(len(self._levels) - 1, -1, -1):
+            if self._levels[priority]:
+                return priority
+        return -1
+
+    def drain(self) -> List[DiscordRecord]:
+        """
+        Tira tudo da fila, do level mais importante pro menos importante (cada level em ordem de chegada).
+        """
+
+        items: List[DiscordRecord] = []
+        for level_items in reversed(self._levels):
+            items.extend(level_items)
+            level_items.clear()
+
+        self._size = 0
+        self._sample_counter = 0
+        return items
+
+    def take_dropped(self) -> Dict[str, int]:
+        """
+        Retorna os contadores de descarte desde a ultima chamada e zera eles.
+        """
+
+        dropped = self.dropped
+        self.dropped = {}
+        return dropped
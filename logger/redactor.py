@@ -0,0 +1,213 @@
+import re
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+_DIGITS = b"0123456789"
+_GROUP_REF_RE = re.compile(r"\\(\d+)")
+
+def _luhn_valid(digits: str) -> bool:
+    total = 0
+    for index, char in enumerate(reversed(digits)):
+        value = ord(char) - 48
+        if index % 2:
+            value *= 2
+            if value > 9:
+                value -= 9
+        total += value
+    return total % 10 == 0
+
+def _redact_card(text: str) -> str:
+    # Sequencia de 13-19 digitos so e trocada se passar no Luhn, senao e id/timestamp e fica como ta
+    digits = "".join(char for char in text if char.isdigit())
+    return "<CARD>" if _luhn_valid(digits) else text
+
+def _has_digits(count: int) -> Callable[[str], bool]:
+    # translate nos bytes tira os digitos em C, bem mais barato que contar digito por digito
+    def precheck(text: str) -> bool:
+        data = text.encode("utf-8", "ignore")
+        return len(data) - len(data.translate(None, _DIGITS)) >= count
+    return precheck
+
+class RedactionRule:
+    """
+    Uma regra de redacao: regex, o que entra no lugar e o pre-filtro que decide se vale rodar a regex.
+
+    literals sao pedacos em minusculo que toda ocorrencia tem (ex: "bearer", "@"), se nenhum aparece na
+    mensagem a regra nem entra no scanner. precheck e um teste barato pra regra sem literal (ex: quantidade
+    de digitos). Sem nenhum dos dois a regra roda sempre. A replacement pode usar \\1, \\2... dos grupos da
+    propria regra ou ser uma funcao que recebe o texto encontrado.
+    """
+
+    __slots__ = ("name", "pattern", "replacement", "literals", "precheck", "ignore_case", "groups")
+
+    def __init__(self, name: str, pattern: str, replacement: Union[str, Callable[[str], str]] = "***",
+                 literals: Sequence[str] = (), precheck: Optional[Callable[[str], bool]] = None, ignore_case: bool = False):
+        self.name = name
+        self.pattern = pattern
+        self.replacement = replacement
+        self.literals = tuple(literal.lower() for literal in literals)
+        self.precheck = precheck
+        self.ignore_case = ignore_case
+        self.groups = re.compile(pattern).groups # Valida a regex ja na configuracao
+
+    @classmethod
+    def from_dict(cls, spec: Dict[str, Any]) -> "RedactionRule":
+        return cls(
+            spec["name"],
+            spec["pattern"],
+            spec.get("replacement", "***"),
+            spec.get("literals") or (),
+            None,
+            spec.get("ignore_case", False)
+        )
+
+# Regras padrao. A ordem importa quando duas comecam no mesmo ponto, as mais especificas vem antes
+DEFAULT_RULES: List[RedactionRule] = [
+    RedactionRule(
+        "discord_webhook",
+        r"(https?://(?:\w+\.)?discord(?:app)?\.com/api/webhooks/\d+/)[\w-]+",
+        r"\1***",
+        ("discord",)
+    ),
+    RedactionRule(
+        "discord_token",
+        r"\b[MNO][\w-]{23,27}\.[\w-]{6}\.[\w-]{27,40}\b",
+        "<DISCORD_TOKEN>",
+        precheck=lambda text: text.count(".") >= 2
+    ),
+    RedactionRule("jwt", r"\beyJ[\w-]{5,}\.[\w-]{5,}\.[\w-]+", "<JWT>", ("eyj",)),
+    RedactionRule("aws_access_key", r"\b(?:AKIA|ASIA)[0-9A-Z]{16}\b", "<AWS_KEY>", ("akia", "asia")),
+    RedactionRule(
+        "aws_secret_key",
+        r"(aws_secret_access_key|aws_secret_key)[\s=:\"']+[A-Za-z0-9/+=]{20,}",
+        r"\1=***",
+        ("aws_secret",),
+        ignore_case=True
+    ),
+    RedactionRule("bearer", r"\bbearer\s+[\w\-.~+/]+=*", "Bearer ***", ("bearer",), ignore_case=True),
+    RedactionRule("email", r"\b[\w.%+-]+@[\w-]+(?:\.[\w-]+)*\.[A-Za-z]{2,}\b", "<EMAIL>", ("@",)),
+    RedactionRule("card", r"\b(?:\d[ -]?){12,18}\d\b", _redact_card, precheck=_has_digits(13)),
+    RedactionRule(
+        "credentials",
+        r"(login|user|token|password|key|secret|senha)[\s=:]+(?:bearer\s+)?[^\s&]+",
+        r"\1=***",
+        ("login", "user", "token", "password", "key", "secret", "senha"),
+        ignore_case=True
+    ),
+]
+
+def build_rules(names: Optional[Iterable[str]] = None, custom: Optional[Iterable[Dict[str, Any]]] = None) -> List[RedactionRule]:
+    """
+    Regras padrao escolhidas pelo nome (None = todas) mais as customizadas (dicts do LogConfig).
+    """
+
+    rules = DEFAULT_RULES
+    if names is not None:
+        by_name = {rule.name: rule for rule in DEFAULT_RULES}
+        rules = []
+        for name in names:
+            if name not in by_name:
+                raise ValueError(f"Regra de redacao invalida: {name} (use {', '.join(by_name)})")
+            rules.append(by_name[name])
+
+    return list(rules) + [RedactionRule.from_dict(spec) for spec in custom or ()]
+
+class Redactor:
+    """
+    Redacao de segredos numa passada so.
+
+    As regras sao juntadas numa unica regex (uma alternativa com grupo nomeado por regra), entao o texto
+    e varrido uma vez qualquer que seja a quantidade de regras. Antes disso o pre-filtro de literais
+    ve quais regras podem aparecer na mensagem: mensagem limpa nao passa por regex nenhuma, e quando
+    so algumas regras passam o scanner so com elas e compilado uma vez e guardado pela combinacao.
+    """
+
+    def __init__(self, rules: Optional[Sequence[RedactionRule]] = None):
+        self.rules = list(DEFAULT_RULES if rules is None else rules)
+
+        # Pre-filtro achatado: cada literal uma vez com a mascara das regras que ele libera
+        self._always = 0 # Mascara das regras sem pre-filtro
+        literals: Dict[str, int] = {}
+        self._prechecks: List[Tuple[int, Callable[[str], bool]]] = []
+        for index, rule in enumerate(self.rules):
+            bit = 1 << index
+            for literal in rule.literals:
+                literals[literal] = literals.get(literal, 0) | bit
+            if rule.precheck is not None:
+                self._prechecks.append((bit, rule.precheck))
+            elif not rule.literals:
+                self._always |= bit
+        self._literals = list(literals.items())
+
+        self._scanners: Dict[int, Tuple[re.Pattern, Callable]] = {}
+
+        self.skipped = 0 # Mensagens que o pre-filtro liberou sem regex
+        self.scanned = 0
+
+    def _active(self, text: str) -> int:
+        """
+        Mascara das regras que podem aparecer no texto.
+        """
+
+        mask = self._always
+        if self._literals:
+            lowered = text.lower()
+            for literal, bits in self._literals:
+                if literal in lowered:
+                    mask |= bits
+        for bit, precheck in self._prechecks:
+            if not mask & bit and precheck(text):
+                mask |= bit
+        return mask
+
+    def _scanner(self, mask: int) -> Tuple[re.Pattern, Callable]:
+        scanner = self._scanners.get(mask)
+        if scanner is not None:
+            return scanner
+
+        parts = []
+        replacements: Dict[str, Union[str, Callable[[str], str]]] = {}
+        group = 1 # Numero do proximo grupo na regex combinada
+        for index, rule in enumerate(self.rules):
+            if not mask & (1 << index):
+                continue
+
+            name = f"r{index}"
+            flags = "(?i:" if rule.ignore_case else "(?:"
+            parts.append(f"(?P<{name}>{flags}{rule.pattern}))")
+
+            replacement = rule.replacement
+            if isinstance(replacement, str):
+                # \1 da regra vira o grupo correspondente na regex combinada
+                offset = group
+                replacement = _GROUP_REF_RE.sub(lambda ref: f"\\g<{int(ref.group(1)) + offset}>", replacement)
+            replacements[name] = replacement
+            group += 1 + rule.groups
+
+        def replace(match: re.Match) -> str:
+            name = match.lastgroup
+            replacement = replacements[name]
+            if isinstance(replacement, str):
+                return match.expand(replacement)
+            return replacement(match.group(name))
+
+        scanner = (re.compile("|".join(parts)), replace)
+        self._scanners[mask] = scanner
+        return scanner
+
+    def redact(self, text: str, max_length: Optional[int] = None) -> str:
+        """
+        Troca os segredos encontrados e corta em max_length (depois da redacao, o corte nunca deixa meio segredo pra tras).
+        """
+
+        mask = self._active(text)
+        if mask:
+            pattern, replace = self._scanner(mask)
+            text = pattern.sub(replace, text)
+            self.scanned += 1
+        else:
+            self.skipped += 1
+
+        if max_length is not None and len(text) > max_length:
+            text = text[:max_length]
+        return text
@@ -0,0 +1,156 @@
+import asyncio
+import heapq
+import itertools
+import random
+import time
+
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+# Resultado de um envio (_send_discord_payload)
+SENT = "sent"
+RETRY = "retry" # Falha passageira: timeout, erro de conexao, 5xx
+RATE_LIMITED = "rate_limited" # 429 ou budget do rate limiter esgotado, tenta de novo quando o cooldown acabar
+FAILED = "failed" # Nao adianta tentar de novo (4xx)
+CIRCUIT_OPEN = "circuit_open" # Circuit breaker da webhook aberto, nem chegou a enviar
+
+class RetryEntry:
+    """
+    Payload esperando uma nova tentativa.
+    """
+    __slots__ = ("webhook_url", "payload", "queue_type", "created_at", "attempts", "first_failed_at")
+
+    def __init__(self, webhook_url: str, payload: dict, queue_type: str, created_at: Optional[float], now: float):
+        """
+            created_at: timestamp do registro mais antigo do payload (metrica de latencia), pode ser None
+            attempts: falhas passageiras ate agora, 429 nao conta (ele e limitado pela idade maxima)
+            first_failed_at: time.monotonic() da primeira falha, base da idade maxima
+        """
+        self.webhook_url = webhook_url
+        self.payload = payload
+        self.queue_type = queue_type
+        self.created_at = created_at
+        self.attempts = 0
+        self.first_failed_at = now
+
+class RetryScheduler:
+    """
+    Agenda novas tentativas de payloads que falharam sem segurar quem ta enviando.
+
+    Um heap de timers ordenado pela hora da proxima tentativa e uma task que dorme ate o primeiro
+    vencer (ou ate alguem agendar um mais cedo), igual o agendador de flush do handler.
+    Falha passageira espera backoff exponencial com jitter, 429 espera o cooldown do rate limiter e
+    circuito aberto (por erro passageiro) espera o probe do circuit breaker, os dois sem gastar tentativa.
+    Passou de max_attempts ou de max_age o payload nao e agendado (quem chama manda pro spool).
+    """
+
+    def __init__(self, resubmit: Callable[[RetryEntry], Awaitable[None]], max_attempts: int = 3, base_delay: float = 2.0,
+                 max_delay: float = 60.0, max_age: float = 300.0, max_pending: int = 1000):
+        """
+            resubmit: chamada com a entrada quando a hora dela chega (devolve pro worker da webhook)
+            max_attempts: tentativas no total, contando a primeira
+            base_delay / max_delay: backoff de base_delay * 2^(falhas-1), no maximo max_delay
+            max_age: segundos desde a primeira falha que um payload pode ficar tentando
+            max_pending: quantos payloads podem esperar no heap
+        """
+
+        self.resubmit = resubmit
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_age = max_age
+        self.max_pending = max_pending
+
+        self._heap: List[Tuple[float, int, RetryEntry]] = []
+        self._sequence = itertools.count() # Desempate no heap, mantem a ordem de chegada
+        self._wakeup = asyncio.Event()
+
+        self.running = False
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._heap)
+
+    def backoff(self, attempts: int) -> float:
+        """
+        Espera antes da tentativa seguinte a `attempts` falhas, com jitter entre metade e o valor cheio
+        (payloads que falharam juntos nao voltam todos no mesmo instante).
+        """
+
+        delay = min(self.max_delay, self.base_delay * (2 ** max(0, attempts - 1)))
+        return random.uniform(delay / 2, delay)
+
+    def schedule(self, entry: RetryEntry, outcome: str, not_before: float = 0.0) -> bool:
+        """
+        Agenda a proxima tentativa da entrada. Retorna False se ela nao deve mais ser tentada
+        (parado, FAILED, tentativas ou idade esgotadas, heap cheio).
+            not_before: segundos minimos ate a proxima tentativa (cooldown restante da webhook ou ate o probe do circuito)
+        """
+
+        if not self.running or outcome not in (RETRY, RATE_LIMITED, CIRCUIT_OPEN):
+            return False
+
+        now = time.monotonic()
+        if outcome == RETRY:
+            entry.attempts += 1
+            if entry.attempts >= self.max_attempts:
+                return False
+            delay = max(not_before, self.backoff(entry.attempts))
+        else:
+            # Rate limit / circuito aberto: volta logo depois do cooldown ou do probe, espalhado um pouco pra nao bater todo mundo junto
+            delay = not_before + random.uniform(0, min(1.0, self.base_delay))
+
+        if now + delay - entry.first_failed_at > self.max_age:
+            return False
+        if len(self._heap) >= self.max_pending:
+            return False
+
+        due = now + delay
+        wake = not self._heap or due < self._heap[0][0]
+        heapq.heappush(self._heap, (due, next(self._sequence), entry))
+        if wake:
+            self._wakeup.set()
+        return True
+
+    def start(self):
+        self.running = True
+        self.task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while self.running:
+            try:
+                now = time.monotonic()
+                while self._heap and self._heap[0][0] <= now:
+                    _, _, entry = heapq.heappop(self._heap)
+                    await self.resubmit(entry)
+
+                timeout = self._heap[0][0] - now if self._heap else None
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+
+            except asyncio.CancelledError:
+                break
+            except Exception as er:
+                print(f"❌ Erro no agendador de retry: {er}")
+                await asyncio.sleep(1)
+
+    async def stop(self) -> List[RetryEntry]:
+        """
+        Para o agendador e devolve o que ainda tava esperando (quem chama manda pro spool).
+        """
+
+        self.running = False
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+        entries = [entry for _, _, entry in sorted(self._heap)]
+        self._heap.clear()
+        return entries
@@ -0,0 +1,172 @@
+import re
+import time
+
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+# Partes variaveis mais comuns, trocadas por um marcador antes de agrupar. A ordem importa:
+# UUID e IP antes de hex/numero, senao viram varios <NUM> separados
+MASK_RE = re.compile(r"""
+    (?P<UUID>\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b)
+    |(?P<IP>\b\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?\b)
+    |(?P<HEX>\b0x[0-9a-fA-F]+\b|\b(?=[0-9a-fA-F]*\d)(?=[0-9a-fA-F]*[a-fA-F])[0-9a-fA-F]{8,}\b)
+    |(?P<PATH>(?:[A-Za-z]:)?(?:/[\w.\-]+){2,}/?)
+    |(?P<NUM>(?<![A-Za-z_])[-+]?\d+(?:\.\d+)?)
+""", re.VERBOSE)
+
+WILDCARD = "<*>"
+
+class TemplateCluster:
+    """
+    Um template: tokens fixos e <*> onde as mensagens do grupo variam.
+    """
+
+    __slots__ = ("id", "key", "tokens", "last_seen")
+
+    def __init__(self, cluster_id: int, key: tuple, tokens: List[str], last_seen: float):
+        self.id = cluster_id
+        self.key = key
+        self.tokens = tokens
+        self.last_seen = last_seen
+
+    @property
+    def template(self) -> str:
+        return " ".join(self.tokens)
+
+class TemplateMiner:
+    """
+    Agrupamento de mensagens por template no estilo do Drain.
+
+    Numeros, UUIDs, hex, IPs e caminhos sao mascarados, e as mensagens com o mesmo level, a mesma
+    quantidade de tokens e o mesmo primeiro token sao comparadas token a token com os templates
+    conhecidos: se a fracao de tokens iguais passa de similarity entram no template (os tokens
+    diferentes viram <*>), senao abrem um template novo.
+
+    A mensagem ja mascarada fica num cache LRU apontando pro template, entao mensagens repetidas
+    nao passam pela busca. Os templates ficam vivos enquanto aparecerem dentro de window_seconds
+    (mesma janela da deduplicacao) e sao limitados a max_clusters, os menos usados saem primeiro.
+    """
+
+    def __init__(self, window_seconds: float = 30.0, similarity: float = 0.7,
+                 max_clusters: int = 1000, cache_size: int = 10000):
+        self.window_seconds = window_seconds
+        self.similarity = similarity
+        self.max_clusters = max_clusters
+        self.cache_size = cache_size
+
+        self.clusters: "OrderedDict[int, TemplateCluster]" = OrderedDict() # Ordem de uso, o primeiro e o mais antigo
+        self._tree: Dict[tuple, List[TemplateCluster]] = {}
+        self._cache: "OrderedDict[Tuple[str, str], int]" = OrderedDict()
+        self._next_id = 0
+
+    @staticmethod
+    def mask(message: str) -> Tuple[str, List[str]]:
+        """
+        Troca as partes variaveis por marcadores (<NUM>, <IP>...), retorna o texto mascarado e os valores trocados.
+        """
+
+        values: List[str] = []
+
+        def replace(match: re.Match) -> str:
+            values.append(match.group())
+            return f"<{match.lastgroup}>"
+
+        return MASK_RE.sub(replace, message), values
+
+    def _remove(self, cluster: TemplateCluster):
+        del self.clusters[cluster.id]
+        bucket = self._tree.get(cluster.key)
+        if bucket:
+            bucket.remove(cluster)
+            if not bucket:
+                del self._tree[cluster.key]
+
+    def expire(self, now: Optional[float] = None):
+        """
+        Remove os templates que nao apareceram dentro da janela, do mais antigo pro mais novo.
+        """
+
+        if now is None:
+            now = time.monotonic()
+
+        cutoff = now - self.window_seconds
+        while self.clusters:
+            cluster = next(iter(self.clusters.values()))
+            if cluster.last_seen > cutoff:
+                break
+            self._remove(cluster)
+
+    def _search(self, key: tuple, tokens: List[str]) -> Optional[TemplateCluster]:
+        best = None
+        best_score = self.similarity
+        for cluster in self._tree.get(key, ()):
+            same = sum(1 for a, b in zip(cluster.tokens, tokens) if a == b)
+            score = same / len(tokens)
+            if score >= best_score:
+                best = cluster
+                best_score = score
+        return best
+
+    def add(self, message: str, level: str = "", now: Optional[float] = None) -> Tuple[TemplateCluster, List[str]]:
+        """
+        Coloca a mensagem no template dela (criando ou generalizando se preciso).
+        Retorna o template e os valores variaveis da mensagem (mascarados + tokens nos <*>).
+        """
+
+        if now is None:
+            now = time.monotonic()
+
+        masked, values = self.mask(message)
+        tokens = masked.split()
+        if not tokens:
+            tokens = [masked]
+
+        cache_key = (level, masked)
+        cluster_id = self._cache.get(cache_key)
+        cluster = self.clusters.get(cluster_id) if cluster_id is not None else None
+
+        if cluster is not None:
+            self._cache.move_to_end(cache_key)
+        else:
+            first = tokens[0] if not tokens[0].startswith("<") else WILDCARD
+            key = (level, len(tokens), first)
+            cluster = self._search(key, tokens)
+
+            if cluster is None:
+                cluster = TemplateCluster(self._next_id, key, list(tokens), now)
+                self._next_id += 1
+                self.clusters[cluster.id] = cluster
+                self._tree.setdefault(key, []).append(cluster)
+                if len(self.clusters) > self.max_clusters:
+                    self._remove(next(iter(self.clusters.values())))
+            else:
+                cluster.tokens = [a if a == b else WILDCARD for a, b in zip(cluster.tokens, tokens)]
+
+            self._cache[cache_key] = cluster.id
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        cluster.last_seen = now
+        self.clusters.move_to_end(cluster.id)
+
+        # Tokens que o template generalizou tambem sao valores dessa mensagem
+        for template_token, token in zip(cluster.tokens, tokens):
+            if template_token == WILDCARD and not token.startswith("<"):
+                values.append(token)
+
+        return cluster, values
+
+if __name__ == "__main__":
+    miner = TemplateMiner()
+
+    for message in [
+        "timeout for user 123 after 5012ms",
+        "timeout for user 456 after 4988ms",
+        "conexao recusada por 10.0.0.12:5432",
+        "conexao recusada por 10.0.0.13:5432",
+        "job 550e8400-e29b-41d4-a716-446655440000 falhou em /srv/app/jobs/run.py",
+        "cache miss para chave sessao_abc",
+        "cache miss para chave sessao_def",
+    ]:
+        cluster, values = miner.add(message, "ERROR")
+        print(f"{cluster.id}: {cluster.template} {values}")
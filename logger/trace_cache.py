@@ -0,0 +1,123 @@
+import hashlib
+import re
+import traceback
+
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+# "  File "/srv/app/worker.py", line 42, in run"
+FRAME_RE = re.compile(r'File "([^"]+)", line (\d+), in (\S+)')
+EXCEPTION_TYPE_RE = re.compile(r'^([A-Za-z_][\w.]*)')
+
+def _short_path(path: str) -> str:
+    """
+    So os dois ultimos pedacos do caminho, o mesmo codigo em venvs/maquinas diferentes da o mesmo fingerprint.
+    """
+
+    parts = path.replace("\\", "/").rsplit("/", 2)
+    return "/".join(parts[-2:])
+
+def _digest(parts) -> str:
+    return hashlib.blake2b("\n".join(parts).encode("utf-8", "replace"), digest_size=8).hexdigest()
+
+def fingerprint_exception(exception: Any) -> str:
+    """
+    Fingerprint de uma exception (tupla type, value, traceback do loguru): tipo + frames normalizados
+    (arquivo, funcao, linha). So anda pelos frames, nao le codigo fonte nem formata nada.
+    """
+
+    exc_type, _, exc_traceback = exception
+    parts = [getattr(exc_type, "__name__", None) or "Exception"]
+    for frame, lineno in traceback.walk_tb(exc_traceback):
+        code = frame.f_code
+        parts.append(f"{_short_path(code.co_filename)}:{code.co_name}:{lineno}")
+    return _digest(parts)
+
+def fingerprint_text(stack_trace: str) -> Optional[str]:
+    """
+    Mesmo fingerprint a partir do stack trace ja formatado (spool, coletor), None se nao achar nenhum frame.
+    O tipo e a primeira linha sem indentacao que nao e o "Traceback (most recent call last):".
+    """
+
+    frames = FRAME_RE.findall(stack_trace)
+    if not frames:
+        return None
+
+    exc_type = ""
+    for line in stack_trace.splitlines():
+        if line and not line[0].isspace() and not line.startswith("Traceback"):
+            match = EXCEPTION_TYPE_RE.match(line)
+            if match:
+                exc_type = match.group(1).rsplit(".", 1)[-1]
+                break
+
+    parts = [exc_type] + [f"{_short_path(path)}:{function}:{lineno}" for path, lineno, function in frames]
+    return _digest(parts)
+
+def split_exception_line(stack_trace: str) -> Tuple[Optional[str], str]:
+    """
+    Separa a linha "Tipo: mensagem" (a primeira sem indentacao que nao e o "Traceback ...", no topo no formato
+    do DiscordRecord e no fim no do python) do resto do stack trace. (None, stack_trace) se nao achar.
+    """
+
+    lines = stack_trace.splitlines()
+    for index, line in enumerate(lines):
+        if line and not line[0].isspace() and not line.startswith("Traceback") and EXCEPTION_TYPE_RE.match(line):
+            return line, "\n".join(lines[:index] + lines[index + 1:])
+    return None, stack_trace
+
+class TraceCache:
+    """
+    LRU limitado de stack traces ja formatados e sanitizados, pelo fingerprint da exception.
+
+    Guarda so os frames: a linha "Tipo: mensagem" muda entre ocorrencias do mesmo crash (KeyError('user_7'),
+    KeyError('user_42')) e e montada de novo pra cada registro.
+
+    A mesma exception levantada 10000 vezes num loop e formatada uma vez so; cada entrada guarda
+    tambem quantas vezes aquele crash apareceu desde o inicio (o "visto N vezes" do discord).
+    """
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, list]" = OrderedDict() # fingerprint -> [trace, total]
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, fingerprint: str) -> Optional[str]:
+        entry = self._entries.get(fingerprint)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(fingerprint)
+        return entry[0]
+
+    def put(self, fingerprint: str, trace: str):
+        entry = self._entries.get(fingerprint)
+        if entry is not None:
+            entry[0] = trace
+            self._entries.move_to_end(fingerprint)
+            return
+
+        self._entries[fingerprint] = [trace, 0]
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def seen(self, fingerprint: str, count: int = 1) -> int:
+        """
+        Soma count aparicoes do crash e retorna o total desde o inicio (0 se o fingerprint nao ta no cache).
+        """
+
+        entry = self._entries.get(fingerprint)
+        if entry is None:
+            return 0
+        entry[1] += count
+        return entry[1]
+
+    def stats(self) -> Tuple[int, int, int]:
+        return self.hits, self.misses, len(self._entries)
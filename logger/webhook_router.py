@@ -0,0 +1,177 @@
+import bisect
+import hashlib
+
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .discord_record import DiscordRecord
+
+STRATEGIES = ("hash", "least_loaded")
+
+class HashRing:
+    """
+    Hash consistente: cada webhook ocupa varios pontos no anel, uma chave vai pro primeiro ponto
+    depois do hash dela. Adicionar ou tirar uma webhook so muda ~1/n das chaves de lugar.
+    """
+
+    def __init__(self, nodes: Sequence[str], replicas: int = 100):
+        points = []
+        for node in nodes:
+            for replica in range(replicas):
+                points.append((self._hash(f"{node}#{replica}"), node))
+        points.sort()
+
+        self._hashes = [point for point, _ in points]
+        self._nodes = [node for _, node in points]
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], "big")
+
+    def lookup(self, key: str) -> str:
+        idx = bisect.bisect(self._hashes, self._hash(key)) % len(self._hashes)
+        return self._nodes[idx]
+
+class Route:
+    """
+    Uma rota da tabela: condicoes (levels, prefixos de logger, tags do extra) e as webhooks que recebem.
+
+    Condicao vazia aceita tudo. Tags sao comparadas com o extra do loguru, valor "*" so exige que a tag exista.
+    """
+
+    __slots__ = ("name", "levels", "loggers", "tags", "webhooks", "strategy", "ring")
+
+    def __init__(self, name: str, webhooks: Sequence[str], levels: Optional[Sequence[str]] = None,
+                 loggers: Optional[Sequence[str]] = None, tags: Optional[Dict[str, Any]] = None, strategy: str = "least_loaded"):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Estrategia de rota invalida: {strategy} (use {', '.join(STRATEGIES)})")
+
+        self.name = name
+        self.webhooks = [webhook for webhook in webhooks if webhook]
+        self.levels = frozenset(level.upper() for level in levels) if levels else None
+        self.loggers = tuple(loggers) if loggers else None
+        self.tags = dict(tags) if tags else None
+        self.strategy = strategy
+        self.ring = HashRing(self.webhooks) if strategy == "hash" and len(self.webhooks) > 1 else None
+
+    @classmethod
+    def from_dict(cls, spec: Dict[str, Any]) -> "Route":
+        webhooks = spec.get("webhooks") or []
+        if isinstance(webhooks, str):
+            webhooks = _split_webhooks(webhooks)
+
+        return cls(
+            spec["name"],
+            webhooks,
+            spec.get("levels"),
+            spec.get("loggers"),
+            spec.get("tags"),
+            spec.get("strategy", "least_loaded")
+        )
+
+    def matches(self, level: str, name: Optional[str], tags: Optional[Dict[str, Any]]) -> bool:
+        if self.levels is not None and level not in self.levels:
+            return False
+
+        if self.loggers is not None:
+            if not name:
+                return False
+            if not any(name == prefix or name.startswith(prefix + ".") for prefix in self.loggers):
+                return False
+
+        if self.tags is not None:
+            if not tags:
+                return False
+            for tag, expected in self.tags.items():
+                if tag not in tags or (expected != "*" and tags[tag] != expected):
+                    return False
+
+        return True
+
+def _split_webhooks(value: Optional[str]) -> List[str]:
+    """
+    "url1,url2" -> [url1, url2], assim ERROR_HOOK/INFO_HOOK ja aceitam varias webhooks do mesmo canal.
+    """
+
+    if not value:
+        return []
+    return [webhook.strip() for webhook in value.split(",") if webhook.strip()]
+
+class WebhookRouter:
+    """
+    Tabela de rotas: decide em qual fila (rota) cada registro entra e em qual webhook cada payload sai.
+
+    As rotas configuradas sao testadas em ordem, a primeira que bate leva o registro. Depois delas
+    sempre existem as rotas padrao ERROR (ERROR/CRITICAL) e INFO, montadas do ERROR_HOOK/INFO_HOOK.
+
+    Uma rota com varias webhooks (do mesmo canal) divide a carga:
+        - "hash": hash consistente pelo nome do logger, cada subsistema cai sempre na mesma webhook
+        - "least_loaded": cada payload vai pra webhook com mais budget livre no rate limiter
+    """
+
+    def __init__(self, routes: Optional[List[Dict[str, Any]]], error_webhook: Optional[str], info_webhook: Optional[str],
+                 cache_size: int = 4096):
+        self.routes: List[Route] = [Route.from_dict(spec) for spec in routes or []]
+        self.routes.append(Route("ERROR", _split_webhooks(error_webhook), levels=["ERROR", "CRITICAL"]))
+        self.routes.append(Route("INFO", _split_webhooks(info_webhook)))
+
+        self.by_name: Dict[str, Route] = {}
+        for route in self.routes:
+            if route.name in self.by_name:
+                raise ValueError(f"Rota duplicada: {route.name}")
+            self.by_name[route.name] = route
+
+        # Sem rota por tag o resultado so depende de (level, logger), da pra guardar
+        self._uses_tags = any(route.tags for route in self.routes)
+        self._cache: Dict[Tuple[str, Optional[str]], Route] = {}
+        self.cache_size = cache_size
+
+    def route_for(self, record: DiscordRecord) -> Route:
+        level = record.level
+        name = record.name
+
+        if not self._uses_tags:
+            key = (level, name)
+            route = self._cache.get(key)
+            if route is not None:
+                return route
+
+        route = self._match(level, name, record.tags)
+
+        if not self._uses_tags:
+            if len(self._cache) >= self.cache_size:
+                self._cache.clear()
+            self._cache[key] = route
+        return route
+
+    def _match(self, level: str, name: Optional[str], tags: Optional[Dict[str, Any]]) -> Route:
+        for route in self.routes:
+            if route.matches(level, name, tags):
+                return route
+        return self.by_name["INFO"]
+
+    @staticmethod
+    def least_loaded(route: Route, load: Callable[[str], float]) -> Optional[str]:
+        """
+        Webhook da rota com o menor load (quem chama decide o que e carga).
+        """
+
+        if not route.webhooks:
+            return None
+        if len(route.webhooks) == 1:
+            return route.webhooks[0]
+        return min(route.webhooks, key=load)
+
+    def partition(self, route: Route, records: List[DiscordRecord]) -> List[Tuple[Optional[str], List[DiscordRecord]]]:
+        """
+        Separa o lote por webhook quando a rota usa hash, nas outras estrategias a webhook e escolhida
+        por payload (None). Sempre retorna pelo menos uma parte.
+        """
+
+        if route.ring is None:
+            return [(route.webhooks[0] if len(route.webhooks) == 1 else None, records)]
+
+        shards: Dict[str, List[DiscordRecord]] = {}
+        for record in records:
+            webhook = route.ring.lookup(record.name or record.level)
+            shards.setdefault(webhook, []).append(record)
+        return list(shards.items()) or [(route.webhooks[0], [])]
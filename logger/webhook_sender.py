@@ -0,0 +1,116 @@
+import asyncio
+
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from .retry_scheduler import SENT, RetryEntry
+
+QueueItem = Tuple[dict, str, Optional[float], Optional[RetryEntry]]
+RetryCallback = Callable[[str, dict, str, Optional[float], Optional[RetryEntry], str], Awaitable[bool]]
+
+class WebhookSender:
+    """
+    Worker de entrega de uma webhook.
+
+    Cada webhook tem sua propria fila de payloads e ate max_in_flight envios ao mesmo tempo,
+    assim uma webhook lenta (ou presa em rate limit) nao segura as outras. Cada envio e uma tentativa
+    so, o que falha vai pro on_retry (agendador de retry) e o worker ja pega o proximo payload.
+    """
+
+    def __init__(self, webhook_url: str, send: Callable[[str, dict], Awaitable[str]],
+                 on_failure: Callable[[dict, str], Awaitable[None]], max_in_flight: int = 2, max_queue: int = 1000,
+                 on_delivered: Optional[Callable[[str, Optional[float]], None]] = None,
+                 on_retry: Optional[RetryCallback] = None):
+        """
+            send: funcao que envia um payload e retorna o resultado (SENT, RETRY, RATE_LIMITED ou FAILED)
+            on_failure: chamada com (payload, queue_type) quando o payload desiste (fallback pro spool)
+            max_in_flight: quantos envios simultaneos nessa webhook
+            max_queue: quantos payloads podem esperar na fila dessa webhook
+            on_delivered: chamada com (queue_type, created_at) depois de cada entrega (metricas)
+            on_retry: chamada com (webhook, payload, queue_type, created_at, retry, resultado) quando o envio falha,
+                retorna se agendou uma nova tentativa (False = on_failure)
+        """
+
+        self.webhook_url = webhook_url
+        self.send = send
+        self.on_failure = on_failure
+        self.on_delivered = on_delivered
+        self.on_retry = on_retry
+        self.max_in_flight = max_in_flight
+
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.workers: List[asyncio.Task] = []
+
+        self.sent = 0
+        self.failed = 0
+        self.in_flight = 0 # Envios acontecendo agora
+
+    def start(self):
+        self.workers = [asyncio.create_task(self._worker()) for _ in range(self.max_in_flight)]
+
+    def submit(self, payload: dict, queue_type: str, created_at: Optional[float] = None, retry: Optional[RetryEntry] = None) -> bool:
+        """
+        Coloca o payload na fila da webhook, retorna False se a fila ta cheia (quem chama faz o fallback).
+            retry: estado das tentativas anteriores quando o payload volta do agendador de retry
+        """
+
+        try:
+            self.queue.put_nowait((payload, queue_type, created_at, retry))
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    @property
+    def pending(self) -> int:
+        return self.queue.qsize()
+
+    async def _worker(self):
+        while True:
+            payload, queue_type, created_at, retry = await self.queue.get()
+            self.in_flight += 1
+            try:
+                outcome = await self.send(self.webhook_url, payload)
+                if outcome == SENT:
+                    self.sent += 1
+                    if self.on_delivered:
+                        self.on_delivered(queue_type, created_at)
+                else:
+                    self.failed += 1
+                    scheduled = self.on_retry and await self.on_retry(self.webhook_url, payload, queue_type, created_at, retry, outcome)
+                    if not scheduled:
+                        await self.on_failure(payload, queue_type)
+            except asyncio.CancelledError:
+                # Parado no meio do envio (prazo do shutdown): o payload vai pro spool em vez de sumir
+                await self.on_failure(payload, queue_type)
+                raise
+            except Exception as er:
+                print(f"❌ Erro no envio da webhook: {er}")
+                await self.on_failure(payload, queue_type)
+            finally:
+                self.in_flight -= 1
+                self.queue.task_done()
+
+    async def join(self):
+        """
+        Espera a fila dessa webhook esvaziar.
+        """
+        await self.queue.join()
+
+    def drain_pending(self) -> List[QueueItem]:
+        """
+        Tira da fila o que ainda nao foi enviado.
+        """
+
+        items = []
+        while not self.queue.empty():
+            items.append(self.queue.get_nowait())
+            self.queue.task_done()
+        return items
+
+    async def stop(self):
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+        for payload, queue_type, _, _ in self.drain_pending():
+            await self.on_failure(payload, queue_type)
@@ -0,0 +1,29 @@
+import threading
+
+from logger.callsite_limiter import CallSiteLimiter
+
+def test_contagem_nao_perde_registros_entre_threads():
+    noted = []
+    limiter = CallSiteLimiter(rate=0.001, burst=10, on_suppressed=noted.append)
+    allowed = []
+
+    def run():
+        count = 0
+        for _ in range(20000):
+            if limiter.allow("app.worker", "run", 42, "ERROR"):
+                count += 1
+        allowed.append(count)
+
+    threads = [threading.Thread(target=run) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sum(allowed) == 10
+    assert limiter.suppressed_total == 8 * 20000 - 10
+    assert len(noted) == 1
+
+    site = noted[0]
+    assert limiter.take(site) == limiter.suppressed_total
+    assert limiter.take(site) == 0
@@ -0,0 +1,99 @@
+import time
+
+from logger.circuit_breaker import CircuitBreaker, CLOSED, HALF_OPEN, OPEN
+
+OPEN_SECONDS = 0.02
+
+def _breaker(**kwargs) -> CircuitBreaker:
+    options = {"failure_threshold": 0.5, "window_size": 4, "min_requests": 4, "open_seconds": OPEN_SECONDS}
+    options.update(kwargs)
+    return CircuitBreaker(**options)
+
+def _wait_probe(breaker: CircuitBreaker):
+    time.sleep(breaker.probe_in() + 0.005)
+
+def test_fechado_abre_quando_a_taxa_de_falha_passa_do_limite():
+    breaker = _breaker()
+    breaker.record_success()
+    breaker.record_success()
+    breaker.record_failure(500)
+    assert breaker.state == CLOSED # Menos que min_requests na janela
+
+    breaker.record_failure(None, "timeout")
+    assert breaker.state == OPEN # 2 de 4 = 0.5
+    assert not breaker.permanent
+    assert breaker.rejecting()
+    assert not breaker.allow()
+    assert 0 < breaker.probe_in() <= OPEN_SECONDS
+
+def test_janela_esquece_as_falhas_antigas():
+    breaker = _breaker()
+    breaker.record_failure(500)
+    for _ in range(4):
+        breaker.record_success()
+    breaker.record_failure(500)
+    assert breaker.state == CLOSED # A primeira falha ja saiu da janela, 1 de 4
+    assert breaker.snapshot()["failure_rate"] == 0.25
+
+def test_meio_aberto_deixa_passar_um_probe_e_fecha_se_der_certo():
+    breaker = _breaker(min_requests=1, failure_threshold=1.0)
+    breaker.record_failure(503)
+    assert breaker.state == OPEN
+
+    _wait_probe(breaker)
+    assert not breaker.rejecting()
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow() # So um probe por vez
+    assert breaker.rejecting()
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+    assert breaker.probe_in() == 0.0
+
+def test_probe_que_falha_abre_de_novo_com_backoff_maior():
+    breaker = _breaker(min_requests=1, failure_threshold=1.0)
+    breaker.record_failure(503)
+    first_wait = breaker.probe_in()
+
+    _wait_probe(breaker)
+    assert breaker.allow()
+    breaker.record_failure(503)
+    assert breaker.state == OPEN
+    assert breaker.probe_in() > first_wait
+    assert breaker.probe_in() <= 2 * OPEN_SECONDS
+
+def test_429_libera_o_probe_sem_mudar_o_estado():
+    breaker = _breaker(min_requests=1, failure_threshold=1.0)
+    breaker.record_failure(503)
+    _wait_probe(breaker)
+    assert breaker.allow()
+
+    breaker.record_neutral()
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+
+def test_401_403_404_abrem_na_hora_como_permanente():
+    for status in (401, 403, 404):
+        breaker = _breaker()
+        breaker.record_failure(status, f"HTTP {status}")
+        assert breaker.state == OPEN
+        assert breaker.permanent
+        assert breaker.last_status == status
+        assert breaker.snapshot()["last_error"] == f"HTTP {status}"
+
+    breaker = _breaker()
+    breaker.record_failure(500)
+    assert breaker.state == CLOSED
+    assert not breaker.permanent
+
+def test_sucesso_depois_do_probe_tira_o_permanente():
+    breaker = _breaker()
+    breaker.record_failure(404)
+    _wait_probe(breaker)
+
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert not breaker.permanent
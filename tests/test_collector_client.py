@@ -0,0 +1,63 @@
+import asyncio
+
+from logger.collector_client import CollectorClient
+from logger.discord_record import DiscordRecord
+
+class _Fallback:
+    def __init__(self):
+        self.records = []
+
+    def enqueue_record(self, record: DiscordRecord):
+        self.records.append(record)
+
+class _StuckWriter:
+    """Socket com o buffer cheio: o drain nunca termina."""
+
+    def __init__(self):
+        self.frames = []
+        self.closed = False
+
+    def write(self, frame: bytes):
+        self.frames.append(frame)
+
+    async def drain(self):
+        await asyncio.Event().wait()
+
+    def is_closing(self) -> bool:
+        return self.closed
+
+    def close(self):
+        self.closed = True
+
+class _Reader:
+    def at_eof(self) -> bool:
+        return False
+
+def test_lote_cancelado_no_drain_volta_pro_deque():
+    async def run():
+        fallback = _Fallback()
+        client = CollectorClient("/tmp/inexistente.sock", fallback, batch_size=2)
+        client._wakeup = asyncio.Event()
+        client._reader, client._writer = _Reader(), _StuckWriter()
+        client.connected = True
+
+        for i in range(3):
+            client.submit(f"registro {i}", "ERROR")
+
+        task = asyncio.create_task(client._ship())
+        await asyncio.sleep(0.05) # Parado no drain do primeiro lote
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+        pending = [record.message for record in client._pending]
+        client._disconnect() # Como no stop(): o que sobrou vai pro handler local
+        return pending, [record.message for record in fallback.records], client.sent
+
+    pending, fallback, sent = asyncio.run(run())
+
+    assert pending == ["registro 0", "registro 1", "registro 2"]
+    assert fallback == pending
+    assert sent == 0
@@ -0,0 +1,74 @@
+import asyncio
+import os
+
+from fake_discord import FakeDiscordServer
+
+from logger.discord_handler import AsyncDiscordHandler
+from logger.disk_spool import DiskSpool, DEAD_LETTER_DIR
+from logger.log_config import LogConfig
+
+def _config(tmp_path, server: FakeDiscordServer) -> LogConfig:
+    config = LogConfig(error_webhook=server.url("error"), info_webhook=server.url("info"))
+    config.spool_dir = str(tmp_path / "spool")
+    return config
+
+async def _idle(handler: AsyncDiscordHandler, timeout: float = 5.0):
+    loop = asyncio.get_running_loop()
+    until = loop.time() + timeout
+    while loop.time() < until:
+        if all(not sender.pending and not sender.in_flight for sender in handler.senders.values()):
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("senders nao esvaziaram")
+
+def _entries(directory: str):
+    spool = DiskSpool(directory)
+    return [entry for path in spool._list_segments() for entry in DiskSpool.load_segment(path)]
+
+def _run(tmp_path, status: int):
+    async def run():
+        server = FakeDiscordServer(limit=50)
+        server.status_for["error"] = status
+        await server.start()
+        try:
+            config = _config(tmp_path, server)
+
+            async with AsyncDiscordHandler(config) as handler:
+                for i in range(3):
+                    await handler._dispatch(config.error_webhook, {"content": f"payload {i}"}, "ERROR")
+                    await _idle(handler)
+            first_run = server.requests
+
+            # Segunda inicializacao: nada do que foi recusado pode voltar pro discord
+            async with AsyncDiscordHandler(config) as handler:
+                await asyncio.sleep(0.2)
+                await _idle(handler)
+            return first_run, server.requests
+        finally:
+            await server.stop()
+
+    return asyncio.run(run())
+
+def test_payload_recusado_com_400_nao_e_reenviado(tmp_path):
+    first_run, total = _run(tmp_path, 400)
+
+    assert first_run == 3 # 400 nao abre o circuito, cada payload tenta uma vez
+    assert total == first_run
+
+    spool_dir = str(tmp_path / "spool")
+    assert not _entries(spool_dir)
+    dead = _entries(os.path.join(spool_dir, DEAD_LETTER_DIR))
+    assert [entry["payload"]["content"] for entry in dead] == ["payload 0", "payload 1", "payload 2"]
+    assert {entry["reason"] for entry in dead} == {"failed"}
+
+def test_webhook_apagada_vai_pro_dead_letter_sem_abrir_o_circuito_de_novo(tmp_path):
+    first_run, total = _run(tmp_path, 404)
+
+    assert first_run == 1 # 404 abre o circuito, os outros nem saem
+    assert total == first_run
+
+    dead = _entries(os.path.join(str(tmp_path / "spool"), DEAD_LETTER_DIR))
+    assert len(dead) == 3
+    assert dead[0]["reason"] == "failed"
+    assert all(entry["reason"].startswith("circuit_open") for entry in dead[1:])
+    assert not _entries(str(tmp_path / "spool"))
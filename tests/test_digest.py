@@ -0,0 +1,29 @@
+import asyncio
+
+from logger.discord_handler import AsyncDiscordHandler
+from logger.discord_record import DiscordRecord
+from logger.log_config import LogConfig
+
+def test_resumo_conta_suprimidos_descartados_e_rota_sem_webhook():
+    async def run():
+        # Sem webhook nenhuma e com a fila pequena: o resumo tem que ver os registros mesmo assim
+        config = LogConfig(error_webhook=None, info_webhook=None, digest_interval=3600.0,
+                           callsite_rate=1.0, callsite_burst=5, max_queue_size=10)
+        handler = AsyncDiscordHandler(config)
+        handler.loop = asyncio.get_running_loop()
+
+        for i in range(50000):
+            message = f"falhou pedido {i}"
+            if handler.site_limiter.allow("app.worker", "run", 42, "ERROR", message):
+                handler.enqueue_record(DiscordRecord(message, "ERROR", 0.0, name="app.worker"))
+        for i in range(100):
+            handler.enqueue_record(DiscordRecord(f"ok {i}", "INFO", 0.0, name="app.http"))
+
+        for queue_type in list(handler.queues):
+            await handler._flush_queue(queue_type)
+        return handler.digest
+
+    digest = asyncio.run(run())
+    assert digest.levels["ERROR"].top(1) == [("app.worker | falhou pedido <NUM>", 50000)]
+    assert digest.levels["INFO"].top(1) == [("app.http | ok <NUM>", 100)]
+    assert digest.total == 50100
@@ -0,0 +1,44 @@
+import importlib
+import os
+import subprocess
+import sys
+import types
+
+from unittest import mock
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+HEAVY_MODULES = ("httpx", "tenacity", "dotenv", "loguru")
+
+def _loaded_after(statement: str):
+    # Processo novo: o sys.modules daqui ja tem tudo que os outros testes importaram
+    code = f"import sys\n{statement}\nprint(','.join(sorted(sys.modules)))"
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT, env.get("PYTHONPATH")]))
+    completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True)
+    return set(completed.stdout.strip().split(","))
+
+def test_import_nao_carrega_dependencias_pesadas():
+    for statement in ("import logger", "from logger import LogConfig"):
+        modules = _loaded_after(statement)
+        heavy = [name for name in HEAVY_MODULES if name in modules]
+        assert not heavy, f"{statement!r} carregou {heavy}"
+
+def test_submodulo_e_nome_exportado_nao_se_misturam():
+    module = importlib.import_module("logger.log_config")
+    assert isinstance(module, types.ModuleType)
+
+    from logger import LogConfig
+    assert isinstance(LogConfig, type)
+    assert module.LogConfig is LogConfig
+
+    import logger.background_engine as engine_module
+    assert isinstance(engine_module, types.ModuleType)
+
+def test_mock_patch_pelo_caminho_do_submodulo():
+    from logger.log_config import LogConfig
+
+    env = {"ERROR_HOOK": "https://example.invalid/error"}
+    with mock.patch("logger.log_config.os.getenv", side_effect=lambda name, default=None: env.get(name, default)):
+        config = LogConfig()
+    assert config.error_webhook == env["ERROR_HOOK"]
@@ -0,0 +1,45 @@
+import asyncio
+
+from logger.intelligent_rate_limiter import IntelligentRateLimiter
+
+WEBHOOK = "https://discord.com/api/webhooks/1/token"
+
+async def _send(limiter: IntelligentRateLimiter, sent: list):
+    if await limiter.wait_until_allowed(WEBHOOK, max_wait=0.0):
+        await asyncio.sleep(0.01) # POST no ar: o outro worker tenta enquanto esse nao registrou
+        sent.append(1)
+        await limiter.record_request(WEBHOOK)
+
+def _concurrent_sends(mode: str, workers: int, headers: dict = None) -> int:
+    async def run():
+        limiter = IntelligentRateLimiter(max_requests=5, window_seconds=60, mode=mode)
+        if headers:
+            await limiter.update_from_headers(WEBHOOK, headers)
+        sent = []
+        await asyncio.gather(*(_send(limiter, sent) for _ in range(workers)))
+        return len(sent), limiter
+
+    return asyncio.run(run())
+
+def test_window_com_envios_em_paralelo_nao_passa_do_limite():
+    sent, limiter = _concurrent_sends("window", 12)
+    assert sent == 5
+    assert len(limiter.request_history[WEBHOOK]) == 5 # record_request nao conta de novo
+
+def test_bucket_com_envios_em_paralelo_respeita_o_remaining_do_servidor():
+    headers = {"X-RateLimit-Limit": "5", "X-RateLimit-Remaining": "2", "X-RateLimit-Reset-After": "2.0"}
+    sent, _ = _concurrent_sends("bucket", 6, headers)
+    assert sent == 2
+
+def test_can_send_sem_reserve_nao_ocupa_slot():
+    async def run():
+        limiter = IntelligentRateLimiter(max_requests=1, window_seconds=60, mode="window")
+        for _ in range(3):
+            assert (await limiter.can_send(WEBHOOK)) == (True, None)
+        assert await limiter.wait_until_allowed(WEBHOOK, max_wait=0.0)
+        allowed, wait_seconds = await limiter.can_send(WEBHOOK)
+        return allowed, wait_seconds
+
+    allowed, wait_seconds = asyncio.run(run())
+    assert not allowed
+    assert wait_seconds > 0
@@ -0,0 +1,113 @@
+import asyncio
+import os
+import time
+
+from fake_discord import FakeDiscordServer
+
+from logger.discord_handler import AsyncDiscordHandler
+from logger.disk_spool import DiskSpool
+from logger.log_config import LogConfig
+from logger.log_replayer import LogReplayer
+from logger.payload_attachment import PayloadAttachment
+
+LINES = [f"[2024-01-01 10:00:00] worker {i} falhou no lote" for i in range(200)]
+
+def _spool_attachment_payload(directory: str, compress: bool = False) -> str:
+    attachment = PayloadAttachment("error-20240101-100000", compress)
+    attachment.write_lines(LINES)
+    payload = {
+        "content": f"📎 {len(LINES)} linha(s) em anexo\n```\n{LINES[0]}\n```",
+        "attachment": attachment.to_spool(),
+    }
+    attachment.close()
+
+    spool = DiskSpool(directory)
+    spool.open()
+    spool.append_payload("ERROR", payload, time.time())
+    spool.close()
+    return spool._list_segments()[0]
+
+def _config(tmp_path, server: FakeDiscordServer) -> LogConfig:
+    config = LogConfig(error_webhook=server.url("error"), info_webhook=server.url("info"))
+    config.spool_dir = str(tmp_path / "handler_spool")
+    return config
+
+def test_iter_spool_segment_yields_attachment_lines(tmp_path):
+    path = _spool_attachment_payload(str(tmp_path / "spool"), compress=True)
+
+    entries = list(LogReplayer(LogConfig()).iter_spool_segment(path))
+
+    assert len(entries) == 1
+    assert entries[0].queue_type == "ERROR"
+    assert entries[0].text.splitlines() == LINES
+
+def test_replay_delivers_every_attachment_line(tmp_path):
+    path = _spool_attachment_payload(str(tmp_path / "spool"))
+
+    async def replay():
+        server = FakeDiscordServer(limit=50)
+        await server.start()
+        try:
+            replayer = LogReplayer(_config(tmp_path, server), str(tmp_path / "checkpoint.json"))
+            assert await replayer.run([path])
+            return [payload.get("content", "") for _, _, payload in server.received]
+        finally:
+            await server.stop()
+
+    delivered = "\n".join(asyncio.run(replay()))
+
+    for line in LINES:
+        assert line in delivered
+    assert not os.path.exists(path) # Segmento entregue e apagado
+
+def test_rate_limit_local_dorme_o_que_o_limiter_pede(tmp_path):
+    async def send_two():
+        server = FakeDiscordServer(limit=50)
+        await server.start()
+        try:
+            config = _config(tmp_path, server)
+            # Janela local de 1 request por segundo e nada de espera dentro do envio: o segundo volta RATE_LIMITED sem 429
+            config.rate_limit_mode = "window"
+            config.max_requests_per_window = 1
+            config.rate_limit_window = 1
+            config.max_rate_limit_wait = 0.0
+
+            replayer = LogReplayer(config, str(tmp_path / "checkpoint.json"))
+            handler = AsyncDiscordHandler(config)
+            calls = []
+            send = handler._send_discord_payload
+
+            async def counting_send(webhook_url, payload):
+                outcome = await send(webhook_url, payload)
+                calls.append(outcome)
+                return outcome
+
+            handler._send_discord_payload = counting_send
+            async with handler:
+                started = time.monotonic()
+                for i in range(2):
+                    assert await replayer._send_with_retry(handler, config.error_webhook, {"content": f"linha {i}"})
+                return calls, time.monotonic() - started, server.accepted
+        finally:
+            await server.stop()
+
+    calls, elapsed, accepted = asyncio.run(send_two())
+
+    assert accepted == 2
+    assert len(calls) <= 4 # Antes dava milhares de chamadas em loop durante o segundo de espera
+    assert 0.5 <= elapsed < 3.0
+
+def test_run_nao_altera_o_config_de_quem_chamou(tmp_path):
+    path = _spool_attachment_payload(str(tmp_path / "spool"))
+
+    async def replay():
+        server = FakeDiscordServer(limit=50)
+        await server.start()
+        try:
+            config = _config(tmp_path, server)
+            assert await LogReplayer(config, str(tmp_path / "checkpoint.json")).run([path])
+            return config
+        finally:
+            await server.stop()
+
+    assert asyncio.run(replay()).spool_replay is True
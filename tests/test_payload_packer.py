@@ -0,0 +1,104 @@
+from logger.payload_packer import PayloadPacker
+
+HEADER = "**LOGS DE ERRO:**"
+
+def _check_limits(payloads):
+    for payload in payloads:
+        assert len(payload["content"]) <= PayloadPacker.CONTENT_LIMIT
+        embeds = payload.get("embeds", [])
+        assert len(embeds) <= PayloadPacker.MAX_EMBEDS
+        assert sum(PayloadPacker.embed_size(embed) for embed in embeds) <= PayloadPacker.EMBED_TOTAL_LIMIT
+        assert all(len(embed["description"]) <= PayloadPacker.EMBED_DESCRIPTION_LIMIT for embed in embeds)
+
+def _content_budget(packer: PayloadPacker) -> int:
+    # Mesmo calculo do pack: o que sobra dos 2000 depois do cabecalho e do bloco de codigo
+    reserve = max(len(HEADER), len(packer.CONTINUATION_RESERVE)) + 1 + len(packer.CODE_OPEN) + len(packer.CODE_CLOSE)
+    return packer.CONTENT_LIMIT - reserve
+
+def _lines_of(payload) -> str:
+    # Linhas que foram no content e nos embeds de linhas (os criticos ficam de fora)
+    parts = []
+    if PayloadPacker.CODE_OPEN in payload["content"]:
+        parts.append(payload["content"].split(PayloadPacker.CODE_OPEN, 1)[1][:-len(PayloadPacker.CODE_CLOSE)])
+    for embed in payload.get("embeds", []):
+        if embed.get("color") == PayloadPacker.LINES_COLOR:
+            parts.append(embed["description"][len(PayloadPacker.CODE_OPEN):-len(PayloadPacker.CODE_CLOSE)])
+    return "\n".join(parts)
+
+def test_content_no_limite_exato_fica_numa_request_so_de_content():
+    packer = PayloadPacker()
+    # Duas linhas (cada uma abaixo do LINE_LIMIT) que com o \n somam exatamente o espaco do content
+    budget = _content_budget(packer)
+    first = "x" * (budget // 2)
+    second = "y" * (budget - len(first) - 1)
+
+    payloads = packer.pack([], [first, second], HEADER)
+    _check_limits(payloads)
+    assert len(payloads) == 1
+    assert "embeds" not in payloads[0]
+
+    # Um caractere a mais nao cabe no content: a segunda linha vai pra um embed da mesma request
+    payloads = packer.pack([], [first, second + "y"], HEADER)
+    _check_limits(payloads)
+    assert len(payloads) == 1
+    assert len(payloads[0]["embeds"]) == 1
+    assert _lines_of(payloads[0]) == f"{first}\n{second}y"
+
+def test_content_completo_chega_a_2000_sem_passar():
+    packer = PayloadPacker()
+    header = "H" * len(packer.CONTINUATION_RESERVE)
+    reserve = len(header) + 1 + len(packer.CODE_OPEN) + len(packer.CODE_CLOSE)
+    budget = packer.CONTENT_LIMIT - reserve
+    lines = ["x" * (budget // 2), "y" * (budget - budget // 2 - 1)]
+
+    payloads = packer.pack([], lines, header)
+    assert len(payloads[0]["content"]) == packer.CONTENT_LIMIT
+    _check_limits(payloads)
+
+def test_dez_embeds_numa_request_onze_em_duas():
+    packer = PayloadPacker()
+    embeds = [packer.critical_embed(f"falha {i}") for i in range(11)]
+
+    payloads = packer.pack(embeds[:10], [], HEADER)
+    assert [len(payload["embeds"]) for payload in payloads] == [10]
+
+    payloads = packer.pack(embeds, [], HEADER)
+    _check_limits(payloads)
+    assert sorted(len(payload["embeds"]) for payload in payloads) == [1, 10]
+
+def test_total_de_6000_caracteres_nos_embeds():
+    packer = PayloadPacker()
+    exact = [{"title": "", "description": "a" * 3000}, {"title": "", "description": "b" * 3000}]
+    assert len(packer.pack(exact, [], HEADER)) == 1
+
+    over = [{"title": "", "description": "a" * 3000}, {"title": "", "description": "b" * 3001}]
+    payloads = packer.pack(over, [], HEADER)
+    _check_limits(payloads)
+    assert len(payloads) == 2
+
+def test_linhas_nao_passam_dos_6000_somados_com_os_criticos():
+    packer = PayloadPacker()
+    critical = [packer.critical_embed("c" * 3000)]
+    lines = [f"linha {i} " + "z" * 80 for i in range(200)]
+
+    payloads = packer.pack(critical, lines, HEADER)
+    _check_limits(payloads)
+    assert "\n".join(_lines_of(payload) for payload in payloads) == "\n".join(lines)
+
+def test_mensagem_unica_grande_e_dividida_sem_perder_nada():
+    packer = PayloadPacker()
+    line = "".join(chr(ord("a") + i % 26) for i in range(20000))
+
+    payloads = packer.pack([], [line], HEADER)
+    _check_limits(payloads)
+    assert len(payloads) > 1
+    assert payloads[0]["content"].startswith(HEADER)
+    assert payloads[1]["content"].startswith(f"**CONTINUAÇÃO (2/{len(payloads)})**")
+    assert "".join(_lines_of(payload).replace("\n", "") for payload in payloads) == line
+
+def test_stack_trace_enorme_e_cortado_na_description():
+    packer = PayloadPacker()
+    embed = packer.critical_embed("falhou", "t" * 10000)
+
+    assert len(embed["description"]) == packer.EMBED_DESCRIPTION_LIMIT
+    _check_limits(packer.pack([embed], [], HEADER))
@@ -0,0 +1,86 @@
+from logger.discord_handler import AsyncDiscordHandler
+from logger.discord_record import DiscordRecord
+from logger.log_config import LogConfig
+from logger.priority_buffer import PriorityBuffer
+
+def _record(level: str, message: str = "") -> DiscordRecord:
+    return DiscordRecord(message or level.lower(), level, 0.0)
+
+def _buffer(maxsize: int) -> PriorityBuffer:
+    # Sem amostragem de INFO, so o descarte por prioridade
+    return PriorityBuffer(maxsize, sample_threshold=1.0)
+
+def test_info_sai_antes_do_error():
+    buffer = _buffer(4)
+    for item in ("INFO", "INFO", "ERROR", "ERROR"):
+        assert buffer.put(_record(item))
+
+    assert buffer.put(_record("ERROR"))
+    assert buffer.put(_record("ERROR"))
+    assert buffer.dropped == {"INFO": 2}
+    assert [record.level for record in buffer.drain()] == ["ERROR"] * 4
+
+def test_error_nao_derruba_error_o_novo_e_que_sai():
+    buffer = _buffer(2)
+    buffer.put(_record("ERROR", "primeiro"))
+    buffer.put(_record("ERROR", "segundo"))
+
+    assert not buffer.put(_record("ERROR", "terceiro"))
+    assert buffer.dropped == {"ERROR": 1}
+    assert [record.message for record in buffer.drain()] == ["primeiro", "segundo"]
+
+def test_critical_nunca_e_descartado_enquanto_tem_level_menor():
+    buffer = _buffer(5)
+    for item in ("INFO", "INFO", "ERROR", "ERROR", "CRITICAL"):
+        buffer.put(_record(item))
+
+    for i in range(4):
+        assert buffer.put(_record("CRITICAL", f"critico {i}"))
+        assert "CRITICAL" not in buffer.dropped
+    assert buffer.dropped == {"INFO": 2, "ERROR": 2}
+
+    # So sobrou CRITICAL: agora o novo e que e descartado, os primeiros da rajada ficam
+    assert not buffer.put(_record("CRITICAL", "critico 4"))
+    assert buffer.dropped == {"INFO": 2, "ERROR": 2, "CRITICAL": 1}
+    assert buffer.qsize() == 5
+
+def test_drain_comeca_pelo_mais_importante_e_take_dropped_zera():
+    buffer = _buffer(3)
+    for item in ("INFO", "ERROR", "CRITICAL", "CRITICAL"):
+        buffer.put(_record(item))
+
+    assert [record.level for record in buffer.drain()] == ["CRITICAL", "CRITICAL", "ERROR"]
+    assert buffer.empty()
+    assert buffer.take_dropped() == {"INFO": 1}
+    assert buffer.take_dropped() == {}
+
+def test_info_amostrado_acima_do_limite():
+    buffer = PriorityBuffer(100, sample_threshold=0.1, info_sample_rate=0.25)
+    accepted = sum(buffer.put(_record("INFO")) for _ in range(50))
+
+    # 10 entram direto, dos outros 40 so 1 a cada 4
+    assert accepted == 10 + 10
+    assert buffer.dropped == {"INFO": 30}
+
+def test_resumo_dos_descartes_no_topo_do_payload():
+    config = LogConfig(error_webhook="https://example.invalid/error", info_webhook=None)
+    config.max_queue_size = 3
+    config.shed_sample_threshold = 1.0
+    handler = AsyncDiscordHandler(config)
+
+    for i in range(3):
+        handler.enqueue_record(_record("ERROR", f"erro {i}"))
+    handler.enqueue_record(_record("CRITICAL", "critico 0"))
+    handler.enqueue_record(_record("CRITICAL", "critico 1"))
+    handler.enqueue_record(_record("ERROR", "erro 3"))
+
+    queue = handler.queues["ERROR"]
+    records = queue.drain()
+    dropped = queue.take_dropped()
+    assert dropped == {"ERROR": 3}
+    assert [record.message for record in records] == ["critico 0", "critico 1", "erro 2"]
+
+    payloads = handler._build_payloads("ERROR", records, dropped)
+    content = "\n".join(payload["content"] for payload in payloads)
+    assert "⚠️ 3 mensagem(ns) descartada(s) por sobrecarga (ERROR: 3)" in content
+    assert content.count("descartada(s)") == 1
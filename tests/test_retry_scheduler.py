@@ -0,0 +1,128 @@
+import asyncio
+import time
+
+from fake_discord import FakeDiscordServer
+
+from logger.discord_handler import AsyncDiscordHandler
+from logger.disk_spool import DiskSpool
+from logger.log_config import LogConfig
+from logger.retry_scheduler import CIRCUIT_OPEN, FAILED, RATE_LIMITED, RETRY, RetryEntry, RetryScheduler
+
+async def _noop(entry: RetryEntry):
+    pass
+
+def _entry(content: str = "x", failed_ago: float = 0.0) -> RetryEntry:
+    return RetryEntry("https://example.invalid/error", {"content": content}, "ERROR", None, time.monotonic() - failed_ago)
+
+def _with_scheduler(check, **kwargs):
+    async def run():
+        scheduler = RetryScheduler(_noop, **kwargs)
+        scheduler.start()
+        try:
+            return await check(scheduler)
+        finally:
+            await scheduler.stop()
+    return asyncio.run(run())
+
+def test_desiste_depois_de_max_attempts():
+    async def check(scheduler: RetryScheduler):
+        entry = _entry()
+        assert scheduler.schedule(entry, RETRY)
+        assert scheduler.schedule(entry, RETRY)
+        assert not scheduler.schedule(entry, RETRY)
+        assert entry.attempts == 3
+
+        # 429 e circuito aberto nao gastam tentativa
+        other = _entry()
+        for outcome in (RATE_LIMITED, CIRCUIT_OPEN, RATE_LIMITED):
+            assert scheduler.schedule(other, outcome)
+        assert other.attempts == 0
+
+        assert not scheduler.schedule(_entry(), FAILED)
+
+    _with_scheduler(check, max_attempts=3, base_delay=10.0)
+
+def test_max_age_conta_desde_a_primeira_falha():
+    async def check(scheduler: RetryScheduler):
+        assert scheduler.schedule(_entry(failed_ago=3.0), RATE_LIMITED, not_before=1.0)
+        assert not scheduler.schedule(_entry(failed_ago=3.0), RATE_LIMITED, not_before=2.5)
+        assert not scheduler.schedule(_entry(failed_ago=6.0), CIRCUIT_OPEN)
+        assert scheduler.pending == 1
+
+    _with_scheduler(check, max_age=5.0, base_delay=0.1)
+
+def test_max_pending_recusa_quando_o_heap_ta_cheio():
+    async def check(scheduler: RetryScheduler):
+        assert scheduler.schedule(_entry("a"), RATE_LIMITED, not_before=10.0)
+        assert scheduler.schedule(_entry("b"), RATE_LIMITED, not_before=5.0)
+        assert not scheduler.schedule(_entry("c"), RATE_LIMITED)
+        assert scheduler.pending == 2
+
+        # stop devolve o que tava esperando, na ordem da proxima tentativa
+        entries = await scheduler.stop()
+        assert [entry.payload["content"] for entry in entries] == ["b", "a"]
+        assert not scheduler.schedule(_entry("d"), RATE_LIMITED) # Parado
+
+    _with_scheduler(check, max_pending=2, base_delay=0.1)
+
+def test_devolve_a_entrada_quando_a_hora_chega():
+    resubmitted = []
+
+    async def run():
+        async def resubmit(entry: RetryEntry):
+            resubmitted.append(entry.payload["content"])
+
+        scheduler = RetryScheduler(resubmit, base_delay=0.01)
+        scheduler.start()
+        scheduler.schedule(_entry("depois"), RATE_LIMITED, not_before=0.1)
+        scheduler.schedule(_entry("antes"), RATE_LIMITED, not_before=0.0)
+        await asyncio.sleep(0.3)
+        await scheduler.stop()
+
+    asyncio.run(run())
+    assert resubmitted == ["antes", "depois"]
+
+def _spool_entries(tmp_path):
+    spool = DiskSpool(str(tmp_path / "spool"))
+    return [entry for path in spool._list_segments() for entry in DiskSpool.load_segment(path)]
+
+def _evict(tmp_path, payloads: int, **overrides):
+    async def run():
+        server = FakeDiscordServer(limit=50)
+        server.status_for["error"] = 500
+        await server.start()
+        try:
+            config = LogConfig(error_webhook=server.url("error"), info_webhook=server.url("info"))
+            config.spool_dir = str(tmp_path / "spool")
+            for name, value in overrides.items():
+                setattr(config, name, value)
+
+            async with AsyncDiscordHandler(config) as handler:
+                for i in range(payloads):
+                    await handler._dispatch(config.error_webhook, {"content": f"payload {i}"}, "ERROR")
+                    await asyncio.sleep(0.1)
+                counts = (handler.retry_scheduler.pending, handler._m_retry_exhausted.value, handler._m_fallback.value)
+            return counts, server.requests
+        finally:
+            await server.stop()
+
+    return asyncio.run(run())
+
+def test_retry_max_pending_manda_o_excedente_pro_spool(tmp_path):
+    (pending, exhausted, fallback), requests = _evict(tmp_path, 3, retry_max_pending=1, retry_base_delay=30.0)
+
+    assert requests == 3
+    assert pending == 1
+    assert exhausted == 2
+    assert fallback == 2
+    # No shutdown o que tava esperando tambem vai pro spool, nada se perde
+    assert sorted(entry["payload"]["content"] for entry in _spool_entries(tmp_path)) == ["payload 0", "payload 1", "payload 2"]
+
+def test_retry_max_age_manda_pro_spool_sem_esperar(tmp_path):
+    (pending, exhausted, fallback), requests = _evict(tmp_path, 1, retry_max_age=0.1, retry_base_delay=1.0)
+
+    assert requests == 1
+    assert pending == 0
+    assert exhausted == 1
+    assert fallback == 1
+    assert [entry["payload"]["content"] for entry in _spool_entries(tmp_path)] == ["payload 0"]
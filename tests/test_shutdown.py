@@ -0,0 +1,53 @@
+import asyncio
+
+from fake_discord import FakeDiscordServer
+
+from logger.discord_handler import AsyncDiscordHandler
+from logger.disk_spool import DiskSpool
+from logger.log_config import LogConfig
+
+TOTAL = 20
+
+def _stop_with(tmp_path, latency: float, deadline: float):
+    async def run():
+        server = FakeDiscordServer(limit=1000, latency=latency)
+        await server.start()
+        try:
+            config = LogConfig(error_webhook=server.url("error"), info_webhook=server.url("info"))
+            config.spool_dir = str(tmp_path / "spool")
+
+            async with AsyncDiscordHandler(config) as handler:
+                for i in range(TOTAL):
+                    await handler._dispatch(config.error_webhook, {"content": f"payload {i}"}, "ERROR")
+                report = await handler.stop(deadline)
+                again = await handler.stop(deadline)
+            return report, again
+        finally:
+            await server.stop()
+
+    report, again = asyncio.run(run())
+    spool = DiskSpool(str(tmp_path / "spool"))
+    spooled = [entry for path in spool._list_segments() for entry in DiskSpool.load_segment(path)]
+    return report, again, spooled
+
+def test_webhook_lenta_para_no_prazo_e_o_resto_vai_pro_spool(tmp_path):
+    deadline = 2.0
+    report, again, spooled = _stop_with(tmp_path, latency=0.5, deadline=deadline)
+
+    assert report["elapsed"] <= deadline
+    assert report["deadline_hit"]
+    assert 0 < report["delivered"] < TOTAL
+    assert report["delivered"] + report["spilled"] == TOTAL
+    assert len(spooled) == report["spilled"]
+    assert again is report # Idempotente: a segunda chamada nao faz nada, devolve o mesmo relatorio
+
+def test_webhook_rapida_entrega_tudo_sem_spool(tmp_path):
+    report, _, spooled = _stop_with(tmp_path, latency=0.0, deadline=5.0)
+
+    assert not report["deadline_hit"]
+    assert report["delivered"] == TOTAL
+    assert report["spilled"] == 0
+    assert not spooled
+
+def test_prazo_padrao_abaixo_do_grace_period_do_kubernetes():
+    assert LogConfig().shutdown_timeout == 8.0 < 10.0
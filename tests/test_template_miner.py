@@ -0,0 +1,28 @@
+from logger.discord_handler import AsyncDiscordHandler
+from logger.log_config import LogConfig
+from logger.template_miner import TemplateMiner
+
+def _same_template(miner: TemplateMiner, first: str, second: str) -> bool:
+    return miner.add(first, "INFO", 0.0)[0] is miner.add(second, "INFO", 0.0)[0]
+
+def test_valores_mascarados_caem_no_mesmo_template():
+    miner = TemplateMiner()
+    assert _same_template(miner, "timeout for user 123 after 5012ms", "timeout for user 456 after 4988ms")
+
+def test_metade_dos_tokens_iguais_nao_junta_no_padrao():
+    miner = TemplateMiner()
+    assert miner.similarity == 0.7
+    assert not _same_template(miner, "user alice logged in", "user bob logged out")
+
+def test_limite_da_similaridade():
+    # 3 de 4 tokens iguais = 0.75: junta com similarity ate 0.75, separa acima
+    assert _same_template(TemplateMiner(similarity=0.75), "user alice logged in", "user alice logged out")
+    assert not _same_template(TemplateMiner(similarity=0.76), "user alice logged in", "user alice logged out")
+
+def test_agrupamento_desligado_por_padrao():
+    config = LogConfig(error_webhook=None, info_webhook=None)
+    assert not config.template_grouping
+
+    handler = AsyncDiscordHandler(config)
+    lines = handler._group_lines([("INFO", 0.0, f"timeout for user {i} after 50ms") for i in range(3)])
+    assert len(lines) == 3
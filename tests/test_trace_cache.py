@@ -0,0 +1,57 @@
+import sys
+
+from logger.discord_handler import AsyncDiscordHandler
+from logger.discord_record import DiscordRecord
+from logger.log_config import LogConfig
+
+def _crash(user: str):
+    try:
+        {}[user]
+    except KeyError:
+        return sys.exc_info()
+
+def _render(handler: AsyncDiscordHandler, record: DiscordRecord) -> str:
+    return handler._render_trace(record, record.fingerprint)
+
+def test_trace_do_cache_usa_a_mensagem_da_ocorrencia_atual():
+    handler = AsyncDiscordHandler(LogConfig(error_webhook=None, info_webhook=None))
+
+    first = DiscordRecord("falhou", "CRITICAL", 0.0, _crash("user_7"))
+    second = DiscordRecord("falhou", "CRITICAL", 0.0, _crash("user_42"))
+    assert first.fingerprint == second.fingerprint
+
+    first_trace = _render(handler, first)
+    second_trace = _render(handler, second)
+    assert handler.trace_cache.hits == 1
+
+    assert first_trace.startswith("KeyError: 'user_7'\n")
+    assert second_trace.startswith("KeyError: 'user_42'\n")
+    assert "user_7" not in second_trace
+    assert first_trace.split("\n", 1)[1] == second_trace.split("\n", 1)[1]
+
+def test_trace_em_texto_no_formato_do_python():
+    handler = AsyncDiscordHandler(LogConfig(error_webhook=None, info_webhook=None))
+    frames = '  File "/srv/app/worker.py", line 42, in run\n    users[user]\n'
+
+    for user in ("user_7", "user_42"):
+        record = DiscordRecord("falhou", "CRITICAL", 0.0, stack_trace=f"Traceback (most recent call last):\n{frames}KeyError: '{user}'")
+        assert _render(handler, record).startswith(f"KeyError: '{user}'\n")
+    assert handler.trace_cache.hits == 1
+
+def test_crash_repetido_no_lote_mantem_as_mensagens_diferentes():
+    handler = AsyncDiscordHandler(LogConfig(error_webhook=None, info_webhook=None))
+    limit = AsyncDiscordHandler.CRASH_MESSAGES
+
+    records = [DiscordRecord(f"pedido {i} falhou", "CRITICAL", 0.0, _crash("user_7")) for i in range(300)]
+    records += [DiscordRecord("pedido 0 falhou", "CRITICAL", 0.0, _crash("user_7"))] # Repetida nao conta como outra
+
+    payloads = handler._build_payloads("ERROR", records, None)
+    embeds = [embed for payload in payloads for embed in payload.get("embeds", [])]
+    assert len(embeds) == 1
+
+    description = embeds[0]["description"]
+    for i in range(limit):
+        assert f"pedido {i} falhou" in description
+    assert f"pedido {limit} falhou" not in description
+    assert f"(+{300 - limit} registro(s) com outras mensagens)" in description
+    assert "visto 301 vezes" in embeds[0]["title"]
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from logger.discord_handler import AsyncDiscordHandler
+from logger.discord_record import DiscordRecord
+from logger.log_config import LogConfig
+from logger.webhook_router import HashRing, Route, WebhookRouter
+
+NODES = [f"https://example.invalid/hook{i}" for i in range(4)]
+KEYS = [f"app.servico{i}" for i in range(2000)]
+
+def _placement(ring: HashRing):
+    return {key: ring.lookup(key) for key in KEYS}
+
+def test_anel_e_deterministico():
+    assert _placement(HashRing(NODES)) == _placement(HashRing(list(reversed(NODES))))
+
+def test_adicionar_webhook_so_move_chaves_pra_ela():
+    before = _placement(HashRing(NODES))
+    new_node = "https://example.invalid/hook4"
+    after = _placement(HashRing(NODES + [new_node]))
+
+    moved = [key for key in KEYS if before[key] != after[key]]
+    assert all(after[key] == new_node for key in moved)
+    assert 0.1 < len(moved) / len(KEYS) < 0.3 # ~1/5
+
+def test_remover_webhook_so_move_as_chaves_dela():
+    before = _placement(HashRing(NODES))
+    removed = NODES[1]
+    after = _placement(HashRing([node for node in NODES if node != removed]))
+
+    moved = {key for key in KEYS if before[key] != after[key]}
+    assert moved == {key for key in KEYS if before[key] == removed}
+
+def test_partition_mantem_cada_logger_na_mesma_webhook():
+    router = WebhookRouter([{"name": "api", "webhooks": NODES, "loggers": ["api"], "strategy": "hash"}], None, None)
+    route = router.by_name["api"]
+    records = [DiscordRecord(f"msg {i}", "ERROR", 0.0, name=f"api.modulo{i % 7}") for i in range(70)]
+
+    shards = router.partition(route, records)
+    assert sum(len(part) for _, part in shards) == len(records)
+    for webhook, part in shards:
+        assert {route.ring.lookup(record.name) for record in part} == {webhook}
+    assert router.partition(route, records) == shards
+
+def test_least_loaded_escolhe_a_menor_carga():
+    route = Route("api", NODES)
+    load = {NODES[0]: 5, NODES[1]: -3, NODES[2]: 0, NODES[3]: -1}
+
+    assert WebhookRouter.least_loaded(route, load.__getitem__) == NODES[1]
+    assert WebhookRouter.least_loaded(Route("uma", NODES[:1]), lambda webhook: 1 / 0) == NODES[0]
+    assert WebhookRouter.least_loaded(Route("nenhuma", []), load.__getitem__) is None
+
+def test_least_loaded_do_handler_evita_circuito_aberto_e_webhook_com_menos_budget():
+    config = LogConfig(error_webhook=",".join(NODES[:3]), info_webhook=None)
+    handler = AsyncDiscordHandler(config)
+
+    # Sem carga nenhuma empata, sai a primeira
+    assert handler._webhook_for("ERROR") == NODES[0]
+
+    handler._breaker_for(NODES[0]).record_failure(404)
+    assert handler._webhook_for("ERROR") == NODES[1]
+
+    # Budget que o discord devolveu nos headers de cada webhook
+    async def budget(webhook_url: str, remaining: int):
+        await handler.rate_limiting.update_from_headers(webhook_url, {"X-RateLimit-Remaining": str(remaining), "X-RateLimit-Reset-After": "30"})
+
+    asyncio.run(budget(NODES[1], 2))
+    asyncio.run(budget(NODES[2], 4))
+    assert handler._webhook_for("ERROR") == NODES[2]
+
+    # Com todas abertas ainda escolhe alguma, o payload vai pro agendador esperar o probe
+    for webhook in NODES[1:3]:
+        handler._breaker_for(webhook).record_failure(404)
+    assert handler._webhook_for("ERROR") in NODES[:3]
+
+def test_rota_com_estrategia_invalida_ou_duplicada():
+    with pytest.raises(ValueError):
+        Route("api", NODES, strategy="round_robin")
+    with pytest.raises(ValueError):
+        WebhookRouter([{"name": "ERROR", "webhooks": NODES[:1]}], None, None)